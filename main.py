@@ -9,31 +9,84 @@
 import sys
 import os
 import re
-from datetime import datetime
+from datetime import datetime, date, timedelta, time as time_of_day
 from copy import deepcopy
 from queue import Queue
 import io
+import sqlite3
+import threading
+import time
+import random
+import html
+import json
+import mmap
+import struct
+import hashlib
+import hmac
+import zipfile
+import argparse
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from functools import lru_cache
+from collections import OrderedDict
+from bisect import bisect_right
+from contextlib import contextmanager
 
 # Third-party imports for data processing and document manipulation
+import numpy as np
 import pandas as pd
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
 from io import BytesIO
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import difflib
 
+# File locks for sharing the scraper rate limit between processes
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# lxml parses just the claims section of patent pages; BeautifulSoup is used without it
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+except Exception:
+    lxml_html = None
+    etree = None
+
 # Feb10: for Excel date handling via displayed formats
 try:
     from openpyxl import load_workbook
     from openpyxl.utils.datetime import from_excel
+    from openpyxl.cell.rich_text import CellRichText, TextBlock
+    from openpyxl.styles.colors import COLOR_INDEX
+    from openpyxl.reader.excel import ExcelReader
+    from openpyxl.utils.cell import coordinate_to_tuple
+    from openpyxl.xml.constants import SHARED_STRINGS, SHEET_MAIN_NS
+    from openpyxl import __version__ as OPENPYXL_VERSION
 except Exception:
     load_workbook = None
     from_excel = None
+    CellRichText = None
+    TextBlock = None
+    COLOR_INDEX = ()
+    ExcelReader = None
+    OPENPYXL_VERSION = None
 
 # Python-docx imports for Word document processing
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor, Cm
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK
 from docx.text.paragraph import Paragraph
 from docx.table import Table
@@ -50,21 +103,2294 @@ from PyQt6.QtWidgets import (
     QMessageBox, QComboBox
 )
 
+# =========================================================
+# Google Patents page cache
+# =========================================================
+# Every scraping helper (abstract, claim text, claim numbers) reads the same
+# https://patents.google.com/patent/{n}/en page. Pages are kept in a small SQLite
+# file under the user's home directory so a page is downloaded at most once per
+# TTL, across claims, reports and application restarts.
+GOOGLE_PATENTS_URL = "https://patents.google.com/patent/{}/en"
+APP_VERSION = "1.4"
+PAROLA_CACHE_DIR = os.environ.get("PAROLA_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".parola_report_generator")
+PATENT_PAGE_CACHE_TTL = float(os.environ.get("PAROLA_PATENT_CACHE_TTL", 7 * 24 * 3600))  # seconds
+PATENT_PAGE_CACHE_MAX_BYTES = int(os.environ.get("PAROLA_PATENT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+class PatentPageCache:
+    """
+    Persistent cache of downloaded patent pages backed by a SQLite file.
+
+    Entries expire after `ttl` seconds. Expired entries are kept, together with their
+    ETag/Last-Modified validators, so they can be revalidated with a conditional request.
+    When the stored bodies exceed `max_bytes`, the least recently used entries are evicted.
+    Hit/miss counters and the number of bytes served from disk are kept for the lifetime
+    of the process. Each thread keeps one connection to the file, closed by close() or
+    when the thread exits.
+    """
+
+    def __init__(self, path, ttl=PATENT_PAGE_CACHE_TTL, max_bytes=PATENT_PAGE_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS pages ("
+                    " url TEXT PRIMARY KEY,"
+                    " body BLOB NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " fetched_at REAL NOT NULL,"
+                    " last_access REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages(last_access)")
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(pages)")]
+                for column in ("etag", "last_modified"):
+                    if column not in columns:
+                        conn.execute(f"ALTER TABLE pages ADD COLUMN {column} TEXT")
+        except Exception as e:
+            print(f"⚠ Note: patent page cache disabled ({e})")
+            self.enabled = False
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection; the next lookup opens a new one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+    def get(self, url, count_miss=True):
+        """Return the cached body for url if present and not expired, else None."""
+        row = None
+        if self.enabled:
+            try:
+                now = time.time()
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT body, size FROM pages WHERE url = ? AND fetched_at >= ?",
+                        (url, now - self.ttl)
+                    ).fetchone()
+                    if row is not None:
+                        conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (now, url))
+            except Exception as e:
+                print(f"⚠ Note: patent page cache read failed ({e})")
+                row = None
+        with self._lock:
+            if row is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self.hits += 1
+            self.bytes_saved += row[1]
+        return bytes(row[0])
+
+    def get_stale(self, url):
+        """Return (body, etag, last_modified) for url even if expired, or None. Not counted in the stats."""
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT body, etag, last_modified FROM pages WHERE url = ?", (url,)
+                ).fetchone()
+        except Exception as e:
+            print(f"⚠ Note: patent page cache read failed ({e})")
+            return None
+        if row is None:
+            return None
+        return bytes(row[0]), row[1], row[2]
+
+    def refresh(self, url):
+        """Mark an expired entry as fresh again after the server answered 304 Not Modified."""
+        if not self.enabled:
+            return
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                row = conn.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+                conn.execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+        except Exception as e:
+            print(f"⚠ Note: patent page cache write failed ({e})")
+            return
+        if row is not None:
+            with self._lock:
+                self.revalidated += 1
+                self.bytes_saved += row[0]
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Store body for url and evict least recently used pages above the size cap."""
+        if not self.enabled or body is None:
+            return
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, body, size, fetched_at, last_access, etag, last_modified)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, sqlite3.Binary(body), len(body), now, now, etag, last_modified)
+                )
+                self._evict(conn)
+        except Exception as e:
+            print(f"⚠ Note: patent page cache write failed ({e})")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for url, size in conn.execute("SELECT url, size FROM pages ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((url,))
+            total -= size
+        conn.executemany("DELETE FROM pages WHERE url = ?", doomed)
+
+    def invalidate(self, url=None):
+        """Drop one cached page, or every page when url is None. Returns the number of pages dropped."""
+        if not self.enabled:
+            return 0
+        try:
+            with self._connect() as conn:
+                if url is None:
+                    return conn.execute("DELETE FROM pages").rowcount
+                return conn.execute("DELETE FROM pages WHERE url = ?", (url,)).rowcount
+        except Exception as e:
+            print(f"⚠ Note: patent page cache invalidate failed ({e})")
+            return 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+PATENT_PAGE_CACHE = PatentPageCache(os.path.join(PAROLA_CACHE_DIR, "patent_pages.sqlite3"))
+
+
+# =========================================================
+# Google Patents HTTP client
+# =========================================================
+SCRAPER_TIMEOUT = float(os.environ.get("PAROLA_SCRAPER_TIMEOUT", 10))  # seconds per attempt
+SCRAPER_MAX_RETRIES = int(os.environ.get("PAROLA_SCRAPER_MAX_RETRIES", 3))
+SCRAPER_POOL_SIZE = int(os.environ.get("PAROLA_SCRAPER_POOL_SIZE", 4))
+SCRAPER_BACKOFF_BASE = 0.5  # seconds, doubled per retry
+SCRAPER_BACKOFF_MAX = 8.0
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+SCRAPER_RATE = float(os.environ.get("PAROLA_SCRAPER_RATE", 2.0))  # requests per second, 0 = unlimited
+SCRAPER_BURST = float(os.environ.get("PAROLA_SCRAPER_BURST", 4))
+# Share the rate limit between processes through a lock file in the cache folder
+SCRAPER_RATE_SHARED = os.environ.get("PAROLA_SCRAPER_RATE_SHARED", "").lower() in ("1", "true", "yes")
+SCRAPER_BREAKER_THRESHOLD = int(os.environ.get("PAROLA_SCRAPER_BREAKER_THRESHOLD", 3))
+SCRAPER_NETWORK_BUDGET = float(os.environ.get("PAROLA_SCRAPER_NETWORK_BUDGET", 60))  # seconds per report
+
+
+class ScraperCircuitBreaker:
+    """
+    Per-report guard around the patent scraper.
+
+    Trips after `threshold` consecutive failed fetches (connection errors, timeouts or
+    retryable HTTP statuses), or once `budget` seconds have been spent waiting on the
+    network. While tripped, no further requests are sent and callers fall back to the
+    Excel fragments for the rest of the run.
+    """
+
+    def __init__(self, threshold=SCRAPER_BREAKER_THRESHOLD, budget=SCRAPER_NETWORK_BUDGET):
+        self.threshold = threshold
+        self.budget = budget
+        self.failures = 0
+        self.spent = 0.0
+        self.reason = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            return self.reason is None
+
+    def remaining(self):
+        with self._lock:
+            return max(0.0, self.budget - self.spent)
+
+    def spend(self, seconds):
+        with self._lock:
+            self.spent += seconds
+            if self.reason is None and self.spent >= self.budget:
+                self.reason = f"network budget of {self.budget:g}s exhausted"
+
+    def record(self, success):
+        with self._lock:
+            if success:
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.reason is None and self.failures >= self.threshold:
+                self.reason = f"{self.failures} consecutive failures"
+
+
+@contextmanager
+def _locked_file(path):
+    """Open path for read/write under an exclusive inter-process lock (flock or msvcrt)."""
+    open(path, "ab").close()
+    f = open(path, "r+b")
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        yield f
+    finally:
+        try:
+            f.flush()
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            f.close()
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket in front of every scraper request: `rate` requests per second on
+    average, up to `burst` back to back. With `state_path` the bucket lives in a
+    locked file, so every process using the same path shares one budget.
+    A 429 answer can pause the whole bucket via penalize().
+    """
+
+    def __init__(self, rate, burst=1, state_path=None):
+        self.rate = rate
+        self.burst = max(1.0, float(burst))
+        self.state_path = state_path
+        self.waited = 0.0
+        self._state = (self.burst, time.time(), 0.0)  # tokens, last refill, paused until
+        self._lock = threading.Lock()
+
+    def _read_state(self, f):
+        try:
+            data = json.loads(f.read() or b"null")
+            return data["tokens"], data["stamp"], data["paused_until"]
+        except (ValueError, TypeError, KeyError):
+            return self.burst, time.time(), 0.0
+
+    def _write_state(self, f, state):
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(dict(zip(("tokens", "stamp", "paused_until"), state))).encode("ascii"))
+
+    def _update(self, change):
+        """Apply change(state, now) -> (state, result) to the local or shared bucket."""
+        with self._lock:
+            now = time.time()
+            if self.state_path is None:
+                self._state, result = change(self._state, now)
+                return result
+            with _locked_file(self.state_path) as f:
+                state, result = change(self._read_state(f), now)
+                self._write_state(f, state)
+                return result
+
+    def _take(self, state, now):
+        tokens, stamp, paused_until = state
+        tokens = min(self.burst, tokens + max(0.0, now - stamp) * self.rate)
+        if now < paused_until:
+            return state, paused_until - now
+        if tokens >= 1:
+            return (tokens - 1, now, paused_until), 0.0
+        return (tokens, now, paused_until), (1 - tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent; returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            delay = self._update(self._take)
+            if delay <= 0:
+                self.waited += waited
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, seconds):
+        """Hold every request sharing this bucket for `seconds`, e.g. after a 429."""
+        def pause(state, now):
+            tokens, stamp, paused_until = state
+            paused_until = max(paused_until, now + seconds)
+            # Refill starts once the pause is over, so traffic resumes gradually
+            return (0.0, paused_until, paused_until), None
+        self._update(pause)
+
+
+class PatentScraperClient:
+    """
+    Shared HTTP client for patent pages.
+
+    Holds one keep-alive requests.Session with a bounded connection pool, retries
+    429/5xx responses and connection errors with jittered exponential backoff, and
+    revalidates expired cache entries with If-None-Match / If-Modified-Since so an
+    unchanged page costs a 304 instead of a full download.
+    """
+
+    def __init__(self, cache, pool_size=SCRAPER_POOL_SIZE, max_retries=SCRAPER_MAX_RETRIES, timeout=SCRAPER_TIMEOUT,
+                 rate_limiter=None):
+        self.cache = cache
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.requests = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.total_latency = 0.0
+        # TokenBucketLimiter consulted before every request (None = unthrottled)
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        # One lock per URL so concurrent callers wait for a single download instead of racing
+        self._url_locks = {}
+
+    def _url_lock(self, url):
+        with self._lock:
+            lock = self._url_locks.get(url)
+            if lock is None:
+                lock = self._url_locks[url] = threading.Lock()
+            return lock
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.strip().isdigit():
+            return min(SCRAPER_BACKOFF_MAX, float(retry_after))
+        return random.uniform(0, min(SCRAPER_BACKOFF_MAX, SCRAPER_BACKOFF_BASE * (2 ** attempt)))
+
+    def get(self, url, headers=None, log=None, breaker=None):
+        """
+        GET url with retries. Returns the final response or raises the last connection error.
+        With a breaker, each attempt's timeout and backoff are capped by the remaining budget.
+        """
+        attempt = 0
+        while True:
+            timeout = self.timeout
+            if breaker is not None:
+                if not breaker.allow():
+                    raise RuntimeError(f"patent scraper circuit open ({breaker.reason})")
+                timeout = min(timeout, breaker.remaining())
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire()
+                if breaker is not None and waited:
+                    breaker.spend(waited)
+            start = time.perf_counter()
+            error = None
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.requests += 1
+                self.total_latency += elapsed
+            if breaker is not None:
+                breaker.spend(elapsed)
+            status = response.status_code if response is not None else type(error).__name__
+            if log:
+                log(f"GET {url} -> {status} in {elapsed * 1000:.0f} ms (attempt {attempt + 1})")
+            retryable = error is not None or response.status_code in RETRYABLE_STATUS_CODES
+            if not retryable or attempt >= self.max_retries or (breaker is not None and not breaker.allow()):
+                if breaker is not None:
+                    breaker.record(not retryable)
+                if error is not None:
+                    raise error
+                return response
+            delay = self._backoff(attempt, response)
+            if breaker is not None:
+                delay = min(delay, breaker.remaining())
+            if response is not None and response.status_code == 429 and self.rate_limiter is not None:
+                # Throttled: slow every job down, the limiter will hold this retry too
+                self.rate_limiter.penalize(delay)
+            else:
+                if breaker is not None:
+                    breaker.spend(delay)
+                time.sleep(delay)
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+
+    def fetch(self, url, log=None, breaker=None, count_miss=True):
+        """
+        Return (status_code, content) for url, using the page cache when fresh and a
+        conditional request when a stale copy is available. When breaker is open the
+        stale copy is served if there is one; otherwise RuntimeError is raised.
+        """
+        with self._url_lock(url):
+            cached = self.cache.get(url, count_miss=count_miss)
+            if cached is not None:
+                return 200, cached
+            stale = self.cache.get_stale(url)
+            if breaker is not None and not breaker.allow():
+                if stale is not None:
+                    return 200, stale[0]
+                raise RuntimeError(f"patent scraper circuit open ({breaker.reason})")
+            headers = {}
+            if stale is not None:
+                if stale[1]:
+                    headers["If-None-Match"] = stale[1]
+                if stale[2]:
+                    headers["If-Modified-Since"] = stale[2]
+            response = self.get(url, headers=headers or None, log=log, breaker=breaker)
+            if response.status_code == 304 and stale is not None:
+                self.cache.refresh(url)
+                with self._lock:
+                    self.not_modified += 1
+                return 200, stale[0]
+            if response.status_code == 200:
+                self.cache.put(
+                    url, response.content,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified")
+                )
+            return response.status_code, response.content
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "not_modified": self.not_modified,
+                "latency": self.total_latency,
+            }
+
+
+PATENT_SCRAPER = PatentScraperClient(PATENT_PAGE_CACHE, rate_limiter=TokenBucketLimiter(
+    SCRAPER_RATE, SCRAPER_BURST,
+    os.path.join(PAROLA_CACHE_DIR, "scraper_rate.json") if SCRAPER_RATE_SHARED else None
+))
+
+# =========================================================
+# Parsed patent pages
+# =========================================================
+_CLAIM_NUMBER_LINE_RE = re.compile(r"^(\d+)\.")
+_US_NUMBER_IN_CLAIM_RE = re.compile(r"\bUS(\d{7,})\b")
+
+
+class PatentDocument:
+    """
+    Parsed content of one Google Patents page, built once per publication number.
+
+    Attributes:
+        publication_number: Publication number the page was requested for
+        status_code: HTTP status of the page request (200 when parsed)
+        abstract: Text of the DC.description meta tag, or None when absent
+        claims: Ordered dict of claim number (str) -> claim text with US numbers
+                comma-formatted, or None when the page has no claims section
+    """
+
+    def __init__(self, publication_number, status_code=200, abstract=None, claims=None):
+        self.publication_number = publication_number
+        self.status_code = status_code
+        self.abstract = abstract
+        self.claims = claims
+
+    @property
+    def claim_count(self):
+        return len(self.claims) if self.claims else 0
+
+    def claim_numbers(self):
+        return list(self.claims) if self.claims else []
+
+    def claim_text(self, claim_num):
+        if not self.claims:
+            return None
+        return self.claims.get(str(claim_num).strip())
+
+
+def format_claim_patent_numbers(text):
+    """Group the digits of US patent numbers cited in claim text ("US1234567" -> "1,234,567")."""
+    if not isinstance(text, str):
+        return text
+    return _US_NUMBER_IN_CLAIM_RE.sub(lambda m: "{:,}".format(int(m.group(1))), text)
+
+
+def split_claims_text(claims_text):
+    """
+    Split the text of a claims section into {claim number: text}.
+    A claim starts at the first line beginning with "<n>." and runs until a line
+    starting with a different claim number, matching the per-claim scan it replaces.
+    """
+    claim_lines = {}
+    current = None
+    for line in claims_text.strip().split("\n"):
+        stripped = line.strip()
+        match = _CLAIM_NUMBER_LINE_RE.match(stripped)
+        if match and match.group(1) != current:
+            current = match.group(1) if match.group(1) not in claim_lines else None
+            if current is not None:
+                claim_lines[current] = []
+        if current is not None:
+            claim_lines[current].append(format_claim_patent_numbers(stripped))
+    return {num: ("\n".join(lines) + "\n").strip() for num, lines in claim_lines.items()}
+
+
+# Targeted extraction: only the abstract meta tag and the claims section are needed from
+# a page that is mostly description text, so both are located with byte scans and only
+# the claims slice is handed to a parser.
+_META_TAG_RE = re.compile(rb"""<meta\b(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE)
+_TAG_ATTR_RE = re.compile(rb"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+_CLAIMS_SECTION_RE = re.compile(
+    rb"""<section\s(?:[^>"']|"[^"]*"|'[^']*')*?(?<=\s)itemprop\s*=\s*(?:"claims"|'claims'|claims(?=[\s/>]))""",
+    re.IGNORECASE
+)
+_SECTION_TOKEN_RE = re.compile(rb"<!--.*?-->|<(/?)section\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.IGNORECASE | re.DOTALL)
+# Markup inside the claims slice whose text html.parser treats specially
+_CLAIMS_UNSUPPORTED_RE = re.compile(rb"<script\b|<style\b|<textarea\b|<pre\b|<!\[CDATA\[|&(?!#?\w+;)", re.IGNORECASE)
+_RAW_TEXT_SPANS = ((b"<!--", b"-->"), (b"<script", b"</script"), (b"<style", b"</style"))
+
+
+def _inside_raw_text(content, pos):
+    """True when pos falls inside a comment, script or style block that a parser would not read as tags."""
+    for start_marker, end_marker in _RAW_TEXT_SPANS:
+        start = content.rfind(start_marker, 0, pos)
+        if start != -1 and content.find(end_marker, start, pos) == -1:
+            return True
+    return False
+
+
+def _tag_attributes(tag):
+    """Attributes of a start tag as {lowercased name: unescaped value}; the last duplicate wins."""
+    attrs = {}
+    name_end = re.match(rb"<\w+", tag).end()
+    for match in _TAG_ATTR_RE.finditer(tag, name_end, len(tag) - 1):
+        value = next((v for v in match.group(2, 3, 4) if v is not None), b"")
+        attrs[match.group(1).decode("utf-8").lower()] = html.unescape(value.decode("utf-8"))
+    return attrs
+
+
+def _claims_section_slice(content):
+    """
+    Return the bytes of the first <section itemprop="claims"> element, None when the page
+    has none, or False when it cannot be located reliably by scanning.
+    """
+    for opening in _CLAIMS_SECTION_RE.finditer(content):
+        if _inside_raw_text(content, opening.start()):
+            continue
+        depth = 0
+        for token in _SECTION_TOKEN_RE.finditer(content, opening.start()):
+            if token.group().startswith(b"<!--"):
+                continue
+            depth += -1 if token.group(1) else 1
+            if depth == 0:
+                return content[opening.start():token.end()]
+        return False
+    return None
+
+
+def _element_strings(element):
+    """Text nodes of an lxml subtree in document order, skipping comments like BeautifulSoup does."""
+    if isinstance(element.tag, str) and element.text:
+        yield element.text
+    for child in element:
+        yield from _element_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _claims_section_text(section):
+    """Equivalent of BeautifulSoup(section, "html.parser").get_text(separator="\\n")."""
+    strings = []
+    for string in _element_strings(lxml_html.fragment_fromstring(section.decode("utf-8"))):
+        # html.parser collapses whitespace-only strings to a single newline or space
+        if not string.strip(" \t\n\r\f"):
+            string = "\n" if "\n" in string else " "
+        strings.append(string)
+    return "\n".join(strings)
+
+
+def extract_patent_document(publication_number, content):
+    """
+    Build a PatentDocument from the abstract meta tag and the claims section of a page
+    without parsing the rest of it. Returns None when lxml is missing or the page has
+    markup this scan does not reproduce exactly; callers then parse the whole page.
+    """
+    if lxml_html is None or not isinstance(content, bytes):
+        return None
+    try:
+        abstract = None
+        for tag in _META_TAG_RE.finditer(content):
+            if b"DC.description" not in tag.group() or _inside_raw_text(content, tag.start()):
+                continue
+            attrs = _tag_attributes(tag.group())
+            if attrs.get("name") == "DC.description":
+                abstract = attrs.get("content", "Abstract not found.")
+                break
+        claims = None
+        section = _claims_section_slice(content)
+        if section is False or (section is not None and _CLAIMS_UNSUPPORTED_RE.search(section)):
+            return None
+        if section is not None:
+            claims = split_claims_text(_claims_section_text(section))
+        return PatentDocument(publication_number, 200, abstract, claims)
+    except (UnicodeDecodeError, ValueError, etree.ParserError):
+        return None
+
+
+def parse_patent_document_soup(publication_number, content):
+    """Parse a Google Patents page into a PatentDocument with a full BeautifulSoup tree."""
+    soup = BeautifulSoup(content, "html.parser")
+    abstract_tag = soup.find("meta", {"name": "DC.description"})
+    abstract = abstract_tag.get("content", "Abstract not found.") if abstract_tag else None
+    claims_div = soup.find("section", itemprop="claims")
+    claims = split_claims_text(claims_div.get_text(separator="\n")) if claims_div else None
+    return PatentDocument(publication_number, 200, abstract, claims)
+
+
+def parse_patent_document(publication_number, content):
+    """Parse a Google Patents page into a PatentDocument, using the targeted scan when possible."""
+    document = extract_patent_document(publication_number, content)
+    if document is None:
+        document = parse_patent_document_soup(publication_number, content)
+    return document
+
+
+PATENT_DOCUMENT_MEMO_MAX_ENTRIES = 512
+
+
+class PatentDocumentMemo:
+    """
+    In-memory memo of parsed patent pages, shared by every report generated in this process.
+    The `max_entries` most recently used documents are kept, each for at most `ttl` seconds
+    (the page cache lifetime), so a long-running session picks up refreshed pages.
+    """
+
+    def __init__(self, max_entries=PATENT_DOCUMENT_MEMO_MAX_ENTRIES, ttl=PATENT_PAGE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """The PatentDocument stored under key, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, document = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return document
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def put(self, key, document):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_PATENT_DOCUMENTS = PatentDocumentMemo()
+# Background workers that fetch patent pages while the workbook is still being read
+_PATENT_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="patent-prefetch")
+
+
+# =========================================================
+# Patent text sources
+# =========================================================
+# Sources tried in order for each publication number. "offline" is skipped unless
+# PAROLA_OFFLINE_CORPUS names at least one directory, .jsonl or .sqlite archive, and
+# "uspto" unless PAROLA_USPTO_INDEX points at an index of USPTO bulk files.
+PAROLA_PATENT_SOURCES = os.environ.get("PAROLA_PATENT_SOURCES", "offline,uspto,cache,network")
+PAROLA_OFFLINE_CORPUS = os.environ.get("PAROLA_OFFLINE_CORPUS", "")
+
+_PUBLICATION_NUMBER_JUNK_RE = re.compile(r"[\s,./-]")
+_KIND_CODE_RE = re.compile(r"(?<=\d)[A-Z]\d?$")
+
+
+def normalize_publication_number(publication_number):
+    """Canonical key for a publication number: "us 10,123,456 b2" -> "US10123456B2"."""
+    return _PUBLICATION_NUMBER_JUNK_RE.sub("", str(publication_number)).upper()
+
+
+def _document_from_record(publication_number, record):
+    """
+    Build a PatentDocument from an archive record. A record holds either a saved page
+    under "html", or pre-extracted "abstract" and "claims", where claims is a
+    {number: text} mapping or the raw text of the claims section.
+    """
+    page = record.get("html")
+    if page:
+        return parse_patent_document(publication_number, page.encode("utf-8") if isinstance(page, str) else page)
+    claims = record.get("claims")
+    if isinstance(claims, str):
+        claims = split_claims_text(claims)
+    elif claims is not None:
+        claims = {str(num).strip(): format_claim_patent_numbers(text) for num, text in claims.items()}
+    return PatentDocument(publication_number, 200, record.get("abstract"), claims)
+
+
+class OfflinePatentSource:
+    """
+    Patent text from a local corpus, for machines without internet access.
+
+    `path` is a directory of saved pages (<number>.html) or records (<number>.json), a
+    JSON-lines file with one record per line, or a SQLite file with a `patents` table
+    (publication_number, html, abstract, claims). The corpus is indexed once by
+    normalized publication number, with and without the kind code, so a lookup is a
+    dict hit plus reading a single file, line or row.
+    """
+    name = "offline"
+
+    def __init__(self, path):
+        self.path = path
+        self._index = {}
+        self._lock = threading.Lock()
+        if os.path.isdir(path):
+            self._read = self._read_file
+            for entry in os.scandir(path):
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() in (".html", ".htm", ".json") and entry.is_file():
+                    self._add(stem, entry.path)
+        elif path.lower().endswith(".jsonl"):
+            self._read = self._read_jsonl_line
+            self._file = open(path, "rb")
+            offset = 0
+            for line in self._file:
+                if line.strip():
+                    self._add(json.loads(line).get("publication_number", ""), offset)
+                offset += len(line)
+        else:
+            self._read = self._read_sqlite_row
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._columns = [row[1] for row in self._conn.execute("PRAGMA table_info(patents)")]
+            for rowid, number in self._conn.execute("SELECT rowid, publication_number FROM patents"):
+                self._add(number, rowid)
+
+    def _add(self, publication_number, location):
+        key = normalize_publication_number(publication_number)
+        if not key:
+            return
+        self._index.setdefault(key, location)
+        self._index.setdefault(_KIND_CODE_RE.sub("", key), location)
+
+    def __len__(self):
+        return len(self._index)
+
+    def _read_file(self, location):
+        with open(location, "rb") as f:
+            data = f.read()
+        if location.lower().endswith(".json"):
+            return json.loads(data)
+        return {"html": data}
+
+    def _read_jsonl_line(self, location):
+        with self._lock:
+            self._file.seek(location)
+            return json.loads(self._file.readline())
+
+    def _read_sqlite_row(self, location):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._columns)} FROM patents WHERE rowid = ?", (location,)
+            ).fetchone()
+        record = dict(zip(self._columns, row))
+        if isinstance(record.get("claims"), str) and record["claims"].lstrip().startswith("{"):
+            record["claims"] = json.loads(record["claims"])
+        return record
+
+    def get(self, publication_number, log=None, breaker=None):
+        key = normalize_publication_number(publication_number)
+        location = self._index.get(key)
+        if location is None:
+            location = self._index.get(_KIND_CODE_RE.sub("", key))
+        if location is None:
+            return None
+        return _document_from_record(publication_number, self._read(location))
+
+
+class CachedPatentSource:
+    """Pages already in the on-disk page cache and not yet expired."""
+    name = "cache"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def get(self, publication_number, log=None, breaker=None):
+        content = self.cache.get(GOOGLE_PATENTS_URL.format(publication_number))
+        if content is None:
+            return None
+        return parse_patent_document(publication_number, content)
+
+
+class NetworkPatentSource:
+    """
+    Pages downloaded from Google Patents through the shared client. Non-200 answers
+    are returned as a PatentDocument carrying the status code; network errors raise.
+    """
+    name = "network"
+
+    def __init__(self, client, after_cache=False):
+        self.client = client
+        # The cache source already counted the miss for this lookup
+        self.after_cache = after_cache
+
+    def get(self, publication_number, log=None, breaker=None):
+        status_code, content = self.client.fetch(
+            GOOGLE_PATENTS_URL.format(publication_number), log=log, breaker=breaker,
+            count_miss=not self.after_cache
+        )
+        if status_code != 200:
+            return PatentDocument(publication_number, status_code)
+        return parse_patent_document(publication_number, content)
+
+
+# =========================================================
+# USPTO bulk full-text archives
+# =========================================================
+# SQLite index built by `python main.py index-uspto`; the "uspto" source is skipped without it
+PAROLA_USPTO_INDEX = os.environ.get("PAROLA_USPTO_INDEX", "")
+
+USPTO_INDEX_CHUNK = 1024 * 1024  # bytes read per step while streaming a weekly file
+_USPTO_RECORD_START = b"<?xml"
+_USPTO_PUBLICATION_RE = re.compile(
+    rb"<publication-reference\b.*?<country>\s*(\w+)\s*</country>\s*<doc-number>\s*(\w+)\s*</doc-number>"
+    rb"\s*<kind>\s*(\w+)\s*</kind>",
+    re.DOTALL
+)
+_USPTO_DOC_NUMBER_RE = re.compile(r"([A-Z]*)0*(\d+)")
+_XML_PREDEFINED_ENTITIES = ("amp", "lt", "gt", "quot", "apos")
+_NAMED_ENTITY_RE = re.compile(r"&(\w+);")
+
+
+def uspto_publication_number(country, doc_number, kind):
+    """Google Patents style number for a bulk record: ("US", "09876543", "B2") -> "US9876543B2"."""
+    match = _USPTO_DOC_NUMBER_RE.fullmatch(doc_number.upper())
+    if match:
+        doc_number = match.group(1) + match.group(2)
+    return normalize_publication_number(f"{country}{doc_number}{kind}")
+
+
+def _uspto_member_records(stream):
+    """
+    Yield (publication_number, offset, length) for every <?xml ...> record in a weekly
+    full-text file, reading it in chunks so only one record is ever held in memory.
+    """
+    buffer = b""
+    buffer_offset = 0
+    while True:
+        chunk = stream.read(USPTO_INDEX_CHUNK)
+        buffer += chunk
+        start = buffer.find(_USPTO_RECORD_START)
+        while start != -1:
+            end = buffer.find(_USPTO_RECORD_START, start + len(_USPTO_RECORD_START))
+            if end == -1 and chunk:
+                break
+            record_end = end if end != -1 else len(buffer)
+            match = _USPTO_PUBLICATION_RE.search(buffer, start, record_end)
+            if match:
+                number = uspto_publication_number(*(g.decode("ascii") for g in match.groups()))
+                yield number, buffer_offset + start, record_end - start
+            start = end
+        if not chunk:
+            return
+        keep_from = start if start != -1 else max(0, len(buffer) - len(_USPTO_RECORD_START))
+        buffer_offset += keep_from
+        buffer = buffer[keep_from:]
+
+
+def index_uspto_archives(index_path, paths, log=print):
+    """
+    Add USPTO grant/application full-text files (weekly .zip archives or extracted .xml
+    files) to the SQLite index at index_path. Archives already indexed with the same
+    size and modification time are skipped. Returns the number of records added.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+    added = 0
+    with sqlite3.connect(index_path) as conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " publication_number TEXT PRIMARY KEY, base_number TEXT NOT NULL,"
+            " archive TEXT NOT NULL, member TEXT NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS records_base ON records(base_number)")
+        conn.execute("CREATE TABLE IF NOT EXISTS archives (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, records INTEGER)")
+        for path in paths:
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            known = conn.execute("SELECT size, mtime FROM archives WHERE path = ?", (path,)).fetchone()
+            if known == (stat.st_size, stat.st_mtime):
+                log(f"Already indexed: {path}")
+                continue
+            conn.execute("DELETE FROM records WHERE archive = ?", (path,))
+            count = 0
+            if zipfile.is_zipfile(path):
+                with zipfile.ZipFile(path) as archive:
+                    members = [m for m in archive.namelist() if m.lower().endswith(".xml")]
+                    for member in members:
+                        with archive.open(member) as stream:
+                            count += _index_uspto_stream(conn, path, member, stream)
+            else:
+                with open(path, "rb") as stream:
+                    count += _index_uspto_stream(conn, path, "", stream)
+            conn.execute("INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?)", (path, stat.st_size, stat.st_mtime, count))
+            conn.commit()
+            log(f"Indexed {count} records from {path}")
+            added += count
+    return added
+
+
+def _index_uspto_stream(conn, archive, member, stream):
+    rows = (
+        (number, _KIND_CODE_RE.sub("", number), archive, member, offset, length)
+        for number, offset, length in _uspto_member_records(stream)
+    )
+    before = conn.total_changes
+    conn.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return conn.total_changes - before
+
+
+def _xml_text(element):
+    return " ".join("".join(element.itertext()).split())
+
+
+def _uspto_claim_lines(element, out):
+    """Flatten a <claim>, putting every nested <claim-text> on its own line."""
+    boundary = element.tag == "claim-text"
+    if boundary:
+        out.append("\n")
+    if element.text:
+        out.append(element.text)
+    for child in element:
+        _uspto_claim_lines(child, out)
+        if child.tail:
+            out.append(child.tail)
+    if boundary:
+        out.append("\n")
+
+
+def _numeric_entity(match):
+    """Rewrite an HTML named entity as numeric character references; unknown ones are dropped."""
+    if match.group(1) in _XML_PREDEFINED_ENTITIES:
+        return match.group()
+    text = html.unescape(match.group())
+    if text == match.group():
+        return ""
+    return "".join(f"&#{ord(c)};" for c in text)
+
+
+def parse_uspto_record(publication_number, record):
+    """Read the abstract and claims of one <us-patent-grant>/<us-patent-application> record."""
+    try:
+        return _parse_uspto_record(publication_number, record)
+    except ElementTree.ParseError:
+        # Older records use HTML entities that are only declared in the external DTD
+        text = _NAMED_ENTITY_RE.sub(_numeric_entity, record.decode("utf-8"))
+        return _parse_uspto_record(publication_number, text.encode("utf-8"))
+
+
+def _parse_uspto_record(publication_number, record):
+    abstract = None
+    claim_lines = None
+    for _, element in ElementTree.iterparse(io.BytesIO(record), events=("end",)):
+        if element.tag == "abstract" and abstract is None:
+            abstract = _xml_text(element)
+        elif element.tag == "claims" and claim_lines is None:
+            claim_lines = []
+            for claim in element.iter("claim"):
+                out = []
+                _uspto_claim_lines(claim, out)
+                claim_lines.extend(" ".join(line.split()) for line in "".join(out).split("\n"))
+            claim_lines = [line for line in claim_lines if line]
+        elif element.tag in ("description", "drawings", "us-sequence-list-doc"):
+            # Not needed; free them as soon as they are complete
+            element.clear()
+        if abstract is not None and claim_lines is not None:
+            break
+    claims = split_claims_text("\n".join(claim_lines)) if claim_lines is not None else None
+    return PatentDocument(publication_number, 200, abstract, claims)
+
+
+class UsptoBulkSource:
+    """
+    Abstracts and claims from indexed USPTO bulk full-text files.
+
+    The index maps each publication number to (archive, member, byte offset, length).
+    Extracted .xml files and ZIP members stored without compression are memory-mapped,
+    so a lookup slices out one record and parses only that. Deflated members cannot be
+    seeked into directly; they are read through a decompressing stream kept open per
+    member, which is cheap for lookups in increasing offset order and restarts otherwise.
+    """
+    name = "uspto"
+
+    def __init__(self, index_path):
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(index_path)
+        self.index_path = index_path
+        self._conn = sqlite3.connect(index_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._archives = {}
+        self._streams = {}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def _locate(self, publication_number):
+        key = normalize_publication_number(publication_number)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT publication_number, archive, member, offset, length FROM records WHERE publication_number = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT publication_number, archive, member, offset, length FROM records"
+                    " WHERE base_number = ? ORDER BY publication_number DESC LIMIT 1",
+                    (_KIND_CODE_RE.sub("", key),)
+                ).fetchone()
+        return row
+
+    def _mapped(self, archive):
+        """(mmap of the archive, {member: data offset or None when deflated}, ZipFile or None)."""
+        opened = self._archives.get(archive)
+        if opened is None:
+            with open(archive, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            starts = {"": 0}
+            zf = None
+            if zipfile.is_zipfile(archive):
+                zf = zipfile.ZipFile(archive)
+                starts = {}
+                for info in zf.infolist():
+                    if info.compress_type != zipfile.ZIP_STORED:
+                        starts[info.filename] = None
+                        continue
+                    # Local file header: 30 fixed bytes, then the name and extra field
+                    name_len, extra_len = struct.unpack("<HH", mapped[info.header_offset + 26:info.header_offset + 30])
+                    starts[info.filename] = info.header_offset + 30 + name_len + extra_len
+            opened = self._archives[archive] = (mapped, starts, zf)
+        return opened
+
+    def _read_record(self, archive, member, offset, length):
+        with self._lock:
+            mapped, starts, zf = self._mapped(archive)
+            start = starts.get(member)
+            if start is not None:
+                return mapped[start + offset:start + offset + length]
+            stream = self._streams.get((archive, member))
+            if stream is None or stream.tell() > offset:
+                if stream is not None:
+                    stream.close()
+                stream = self._streams[(archive, member)] = zf.open(member)
+            stream.seek(offset)
+            return stream.read(length)
+
+    def get(self, publication_number, log=None, breaker=None):
+        row = self._locate(publication_number)
+        if row is None:
+            return None
+        number, archive, member, offset, length = row
+        return parse_uspto_record(publication_number, self._read_record(archive, member, offset, length))
+
+
+# Offline corpora are indexed once per process and shared by every report
+_OFFLINE_SOURCES = {}
+_OFFLINE_SOURCES_LOCK = threading.Lock()
+
+
+def configured_patent_sources(names=None, corpus=None, uspto_index=None):
+    """
+    Build the ordered list of patent text sources from PAROLA_PATENT_SOURCES,
+    PAROLA_OFFLINE_CORPUS (paths separated by os.pathsep) and PAROLA_USPTO_INDEX.
+    """
+    names = [n.strip().lower() for n in (names or PAROLA_PATENT_SOURCES).split(",") if n.strip()]
+    corpus = PAROLA_OFFLINE_CORPUS if corpus is None else corpus
+    uspto_index = PAROLA_USPTO_INDEX if uspto_index is None else uspto_index
+    sources = []
+    for name in names:
+        if name == "offline":
+            for path in filter(None, corpus.split(os.pathsep)):
+                with _OFFLINE_SOURCES_LOCK:
+                    source = _OFFLINE_SOURCES.get(path)
+                    if source is None:
+                        try:
+                            source = _OFFLINE_SOURCES[path] = OfflinePatentSource(path)
+                        except Exception as e:
+                            print(f"⚠ Note: offline patent corpus {path} unavailable ({e})")
+                            continue
+                sources.append(source)
+        elif name == "uspto":
+            if not uspto_index:
+                continue
+            with _OFFLINE_SOURCES_LOCK:
+                source = _OFFLINE_SOURCES.get(uspto_index)
+                if source is None:
+                    try:
+                        source = _OFFLINE_SOURCES[uspto_index] = UsptoBulkSource(uspto_index)
+                    except Exception as e:
+                        print(f"⚠ Note: USPTO bulk index {uspto_index} unavailable ({e})")
+                        continue
+            sources.append(source)
+        elif name == "cache":
+            sources.append(CachedPatentSource(PATENT_PAGE_CACHE))
+        elif name == "network":
+            sources.append(NetworkPatentSource(
+                PATENT_SCRAPER, after_cache=any(s.name == "cache" for s in sources)
+            ))
+        else:
+            print(f"⚠ Note: unknown patent source '{name}' ignored")
+    return sources
+
+
+def load_patent_document(patent_number, sources, log=None, breaker=None):
+    """
+    Ask each source in turn and return (document, source) for the first one that has
+    patent_number. Parsed documents are memoized in _PATENT_DOCUMENTS. Returns
+    (None, None) when no source has the patent; if a source failed, its error is raised.
+    """
+    error = None
+    for source in sources:
+        try:
+            document = source.get(patent_number, log=log, breaker=breaker)
+        except Exception as e:
+            error = e
+            continue
+        if document is not None:
+            if document.status_code == 200:
+                _PATENT_DOCUMENTS.put(normalize_publication_number(patent_number), document)
+            return document, source
+    if error is not None:
+        raise error
+    return None, None
+
+# =========================================================
+# Workbook loading
+# =========================================================
+def _excel_cell_value(cell):
+    """Cell value as pandas' openpyxl reader returns it (see OpenpyxlReader._convert_cell)."""
+    value = cell.value
+    if value is None:
+        return ""
+    if cell.data_type == "e":
+        return np.nan
+    if cell.data_type == "n":
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    if CellRichText is not None and isinstance(value, CellRichText):
+        return str(value)
+    return value
+
+
+# Worksheet cell storage and SelectiveExcelReader's renumbering of sheets and defined names
+# rely on openpyxl internals; they are only used on the release series they were tested
+# against (requirements.txt pins it). Other versions go through the public API.
+OPENPYXL_TESTED_RELEASES = ("3.1.",)
+
+
+def openpyxl_internals_supported():
+    return (OPENPYXL_VERSION or "").startswith(OPENPYXL_TESTED_RELEASES)
+
+
+def worksheet_cells(ws):
+    """
+    {(row, column): cell} of the cells present in ws (1-based), for read-only use. On a
+    tested openpyxl this is the worksheet's own cell store, so empty cells are not created
+    the way ws.iter_rows() and ws.cell() create them; otherwise it is built with iter_rows.
+    """
+    cells = getattr(ws, "_cells", None)
+    if openpyxl_internals_supported() and isinstance(cells, dict):
+        return cells
+    return {(cell.row, cell.column): cell for row in ws.iter_rows() for cell in row}
+
+
+def worksheet_value_rows(ws):
+    """
+    Rows of ws as pandas.read_excel(header=None) sees them: every row from 1 to the
+    last one with data, trailing empty cells trimmed, then padded to a common width.
+    """
+    by_row = {}
+    for (row, column), cell in worksheet_cells(ws).items():
+        by_row.setdefault(row, {})[column] = cell
+    data = []
+    last_row_with_data = -1
+    for row_number in range(1, max(by_row, default=0) + 1):
+        cells = by_row.get(row_number, {})
+        converted = [""] * max(cells, default=0)
+        for column, cell in cells.items():
+            converted[column - 1] = _excel_cell_value(cell)
+        while converted and converted[-1] == "":
+            converted.pop()
+        if converted:
+            last_row_with_data = row_number - 1
+        data.append(converted)
+    data = data[:last_row_with_data + 1]
+    if data:
+        width = max(len(row) for row in data)
+        data = [row + [""] * (width - len(row)) for row in data]
+    return data
+
+
+def shared_string_text(node):
+    """Plain text of an <si> element, as openpyxl's Text.content builds it."""
+    text_tag = "{%s}t" % SHEET_MAIN_NS
+    # The plain <t> followed by the <t> of every run; phonetic runs are left out
+    pieces = []
+    plain = node.find(text_tag)
+    if plain is not None and plain.text is not None:
+        pieces.append(plain.text)
+    for run in node.iterfind("{%s}r" % SHEET_MAIN_NS):
+        text = run.find(text_tag)
+        if text is not None and text.text is not None:
+            pieces.append(text.text)
+    # Exactly what openpyxl's read_string_table and CellRichText.from_tree do with escapes:
+    # the x005F_ prefix is dropped and _xHHHH_ sequences are kept as they are
+    return "".join(pieces).replace('x005F_', '')
+
+
+def read_plain_string_table(src):
+    """
+    Shared strings as openpyxl's read_string_table returns them, in one ElementTree pass
+    without building openpyxl Text objects. Also returns the set of indices whose entry
+    has formatted runs, for RichTextResolver.
+    """
+    si_tag = "{%s}si" % SHEET_MAIN_NS
+    run_tag = "{%s}r" % SHEET_MAIN_NS
+    strings = []
+    formatted = set()
+    for _, node in ElementTree.iterparse(src):
+        if node.tag != si_tag:
+            continue
+        if node.find(run_tag) is not None:
+            formatted.add(len(strings))
+        strings.append(shared_string_text(node))
+        node.clear()
+    return strings, formatted
+
+
+def is_report_sheet(position, name, first_worksheet, active):
+    """The sheets a report reads: the data sheet, the active sheet and the Matrix sheet."""
+    return position in (first_worksheet, active) or name.strip().lower() == "matrix"
+
+
+if ExcelReader is not None:
+    class SelectiveExcelReader(ExcelReader):
+        """
+        ExcelReader that only parses the worksheets keep(position, name, first_worksheet,
+        active) accepts, decided from the workbook manifest before any sheet XML is read.
+        Skipped sheets are left out of the workbook; the active sheet index and sheet-local
+        defined names are renumbered to match. With an openpyxl release outside
+        OPENPYXL_TESTED_RELEASES every sheet is read.
+        """
+
+        def __init__(self, filename, keep=is_report_sheet, **kwargs):
+            super().__init__(filename, **kwargs)
+            if not openpyxl_internals_supported():
+                keep = None
+            self.keep = keep
+            self.shared_strings_part = None
+            self.formatted_strings = set()
+            self.sheet_parts = {}
+
+        def read_strings(self):
+            content_type = self.package.find(SHARED_STRINGS)
+            if self.rich_text or content_type is None:
+                return super().read_strings()
+            self.shared_strings_part = content_type.PartName[1:]
+            with self.archive.open(self.shared_strings_part) as src:
+                self.shared_strings, self.formatted_strings = read_plain_string_table(src)
+
+        def read_worksheets(self):
+            parser = self.parser
+            if self.keep is None:
+                self.sheet_parts = {sheet.name: parser.rels[sheet.id].target for sheet in parser.sheets
+                                    if sheet.id and parser.rels[sheet.id].target in self.valid_files}
+                return super().read_worksheets()
+            # The sheets load_workbook would add, in workbook order; their positions are
+            # what activeTab and localSheetId refer to
+            loaded = [sheet for sheet in parser.sheets
+                      if sheet.id and parser.rels[sheet.id].target in self.valid_files]
+            first_worksheet = next((i for i, sheet in enumerate(loaded)
+                                    if "chartsheet" not in parser.rels[sheet.id].Type), None)
+            active = self.wb._active_sheet_index
+            kept = [i for i, sheet in enumerate(loaded)
+                    if self.keep is None or self.keep(i, sheet.name, first_worksheet, active)]
+            skipped = {id(loaded[i]) for i in set(range(len(loaded))) - set(kept)}
+            parser.sheets = [sheet for sheet in parser.sheets if id(sheet) not in skipped]
+            self.sheet_parts = {loaded[i].name: parser.rels[loaded[i].id].target for i in kept}
+            super().read_worksheets()
+
+            position = {old: new for new, old in enumerate(kept)}
+            self.wb._active_sheet_index = position.get(active, len(self.wb._sheets))
+            names = []
+            for defn in parser.defined_names.definedName:
+                if defn.localSheetId is not None:
+                    if int(defn.localSheetId) not in position:
+                        continue
+                    defn.localSheetId = position[int(defn.localSheetId)]
+                names.append(defn)
+            parser.defined_names.definedName = names
+
+
+class RichTextResolver:
+    """
+    Run formatting for string cells of a workbook loaded with rich_text=False.
+
+    value(cell) returns what a rich_text=True load would have put in cell.value: a
+    CellRichText for formatted shared or inline strings, the plain value otherwise.
+    A sheet's string cells are mapped to their sharedStrings entry or inline <is>
+    element in one XML scan the first time one of its cells is asked for. A formatted
+    shared string is cut straight out of the sharedStrings XML when first needed;
+    decoded values are memoized.
+    """
+    _SST_RE = re.compile(rb"<((?:[\w.-]+:)?sst)\b[^>]*>")
+    _SI_RE = re.compile(rb"<(?:[\w.-]+:)?si\b[^>]*?(?:/>|>.*?</(?:[\w.-]+:)?si\s*>)", re.S)
+
+    def __init__(self, content, sheet_parts, shared_strings_part=None, shared_strings=(), formatted_strings=()):
+        self.content = content
+        self.sheet_parts = dict(sheet_parts)
+        self.shared_strings_part = shared_strings_part
+        self.shared_strings = shared_strings
+        self.formatted_strings = formatted_strings
+        self._archive = None
+        self._shared_xml = None
+        self._shared_root = None
+        self._shared_spans = None
+        self._string_cells = {}
+        self._values = {}
+
+    def _open(self, part):
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(BytesIO(self.content))
+        return self._archive.open(part)
+
+    def shared_string_element(self, index):
+        """The <si> element of a shared string, parsed on its own."""
+        si_tag = "{%s}si" % SHEET_MAIN_NS
+        if self._shared_spans is None:
+            with self._open(self.shared_strings_part) as src:
+                self._shared_xml = src.read()
+            root = self._SST_RE.search(self._shared_xml)
+            self._shared_root = (root.group(0), b"</" + root.group(1) + b">") if root else None
+            self._shared_spans = [m.span() for m in self._SI_RE.finditer(self._shared_xml)]
+        if self._shared_root is not None and len(self._shared_spans) == len(self.shared_strings):
+            start, end = self._shared_spans[index]
+            opening, closing = self._shared_root
+            try:
+                # Wrapped in the root tag so its namespace declarations still apply
+                node = ElementTree.fromstring(opening + self._shared_xml[start:end] + closing)[0]
+            except (ElementTree.ParseError, IndexError):
+                node = None
+            if node is not None and node.tag == si_tag and shared_string_text(node) == self.shared_strings[index]:
+                return node
+        # The byte scan did not line up with the parsed table (comments, CDATA...): stream to the entry
+        position = 0
+        with self._open(self.shared_strings_part) as src:
+            for _, node in ElementTree.iterparse(src):
+                if node.tag == si_tag:
+                    if position == index:
+                        return node
+                    node.clear()
+                    position += 1
+        raise IndexError(index)
+
+    def string_cells(self, title):
+        """(row, column) -> ("s", shared string index) or ("inline", <is> element) for a sheet."""
+        cells = self._string_cells.get(title)
+        if cells is not None:
+            return cells
+        cells = self._string_cells[title] = {}
+        part = self.sheet_parts.get(title)
+        if part is None:
+            return cells
+        formatted = self.formatted_strings
+        row_tag = "{%s}row" % SHEET_MAIN_NS
+        cell_tag = "{%s}c" % SHEET_MAIN_NS
+        value_tag = "{%s}v" % SHEET_MAIN_NS
+        inline_tag = "{%s}is" % SHEET_MAIN_NS
+        row_counter = col_counter = 0
+        with self._open(part) as src:
+            # Cells without an "r" attribute are numbered the way openpyxl's WorkSheetParser does
+            for event, node in ElementTree.iterparse(src, events=("start", "end")):
+                if node.tag == row_tag:
+                    if event == "start":
+                        row_counter = int(node.get("r")) if node.get("r") else row_counter + 1
+                        col_counter = 0
+                    else:
+                        node.clear()
+                    continue
+                if event != "end" or node.tag != cell_tag:
+                    continue
+                coordinate = node.get("r")
+                if coordinate:
+                    row, col_counter = coordinate_to_tuple(coordinate)
+                else:
+                    col_counter += 1
+                    row = row_counter
+                kind = node.get("t")
+                if kind == "s" and formatted:
+                    index = node.findtext(value_tag)
+                    if index and int(index) in formatted:
+                        cells[(row, col_counter)] = ("s", int(index))
+                elif kind == "inlineStr":
+                    inline = node.find(inline_tag)
+                    if inline is not None:
+                        cells[(row, col_counter)] = ("inline", inline)
+        return cells
+
+    def value(self, cell):
+        value = cell.value
+        if not isinstance(value, str):
+            return value
+        key = (cell.parent.title, cell.row, cell.column)
+        if key in self._values:
+            return self._values[key]
+        source = self.string_cells(cell.parent.title).get((cell.row, cell.column))
+        if source is not None:
+            kind, ref = source
+            if kind == "s":
+                # As openpyxl's read_rich_text decodes a shared string
+                value = CellRichText.from_tree(self.shared_string_element(ref))
+                if len(value) == 0:
+                    value = ''
+                elif len(value) == 1 and isinstance(value[0], str):
+                    value = value[0]
+            else:
+                # As openpyxl's parse_richtext_string decodes an inline string
+                value = CellRichText.from_tree(ref) or ""
+                if len(value) == 1 and isinstance(value[0], str):
+                    value = value[0]
+        self._values[key] = value
+        return value
+
+
+def read_workbook(file_path, all_sheets=False, rich_text=False, content=None):
+    """
+    Parse an .xlsx workbook once. Returns (df, wb, rich_text): df holds the first sheet's
+    values exactly as pd.read_excel(file_path, header=None) would build them, wb is the
+    openpyxl workbook (data_only) for cell styles and number formats, and rich_text is a
+    RichTextResolver for run formatting (None when rich_text=True puts CellRichText values
+    in the cells up front). Unless all_sheets is set, only the sheets a report reads are
+    parsed (is_report_sheet). content is the file's bytes when the caller already has them.
+    """
+    if content is None:
+        with open(file_path, "rb") as f:
+            content = f.read()
+    reader = SelectiveExcelReader(BytesIO(content), keep=None if all_sheets else is_report_sheet,
+                                  data_only=True, rich_text=rich_text)
+    reader.read()
+    wb = reader.wb
+    data = worksheet_value_rows(wb.worksheets[0])
+    try:
+        df = TextParser(data, header=None, skip_blank_lines=False).read()
+    except EmptyDataError:
+        df = pd.DataFrame()
+    resolver = None
+    if not rich_text:
+        resolver = RichTextResolver(content, reader.sheet_parts, reader.shared_strings_part,
+                                    reader.shared_strings, reader.formatted_strings)
+    return df, wb, resolver
+
+
+EXPERT_COMMENTS_LABELS = ('Expert Comments', 'Expert/Reviewer Comments', 'Reviewer Comments')
+
+
+class WorkbookLayout:
+    """
+    Positions of the anchor labels on a project workbook's data sheet, found in one scan
+    at load (df positions; the Matrix sheet is read by MatrixSnapshot):
+
+        first_rows: exact column-0 label -> first row holding it (df[df[0] == label])
+        folded_rows: stripped, lower-cased column-0 label -> first row holding it
+        required_claims_row: first row (row-major) with a cell containing "required claim"
+        database_cell: (row, col) of the first cell equal to "database", ignoring case
+    """
+
+    def __init__(self, df):
+        self.first_rows = {}
+        self.folded_rows = {}
+        self.required_claims_row = None
+        self.database_cell = None
+        if df is not None and not df.empty:
+            self._scan_data(df)
+
+    def _scan_data(self, df):
+        if 0 in df.columns:
+            for row, value in zip(df.index, df[0]):
+                if isinstance(value, str):
+                    self.first_rows.setdefault(value, row)
+                    self.folded_rows.setdefault(value.strip().lower(), row)
+        required = []
+        database = []
+        for col_pos in range(df.shape[1]):
+            column = df.iloc[:, col_pos]
+            if column.dtype != object and not isinstance(column.dtype, pd.StringDtype):
+                continue
+            try:
+                folded = column.str.strip().str.lower()
+            except AttributeError:
+                # Object column without any text (dates, numbers)
+                continue
+            hits = folded.str.contains("required claim", regex=False, na=False).to_numpy(dtype=bool, na_value=False)
+            if hits.any():
+                required.append((hits.argmax(), col_pos))
+            hits = folded.eq("database").to_numpy(dtype=bool, na_value=False)
+            if hits.any():
+                database.append((hits.argmax(), col_pos))
+        # Earliest row, then leftmost column: the order a row-by-row scan meets them
+        if required:
+            self.required_claims_row = df.index[min(required)[0]]
+        if database:
+            row_pos, col_pos = min(database)
+            self.database_cell = (df.index[row_pos], col_pos)
+
+    def row_of(self, label, ignore_case=False):
+        """First row whose column-0 cell is label, or None."""
+        if ignore_case:
+            return self.folded_rows.get(label.strip().lower())
+        return self.first_rows.get(label)
+
+    def first_label_row(self, labels):
+        """(label, row) for the first of labels, in priority order, present in column 0; else (None, None)."""
+        for label in labels:
+            row = self.first_rows.get(label)
+            if row is not None:
+                return label, row
+        return None, None
+
+
+_CLAIM_FRAGMENT_NUMBER_RE = re.compile(r"(\d+)\.")
+
+
+class ClaimFragmentTable:
+    """
+    The Expert Comments block of a project workbook split by claim in one pass.
+
+    block / block_rows: every non-empty fragment below the header and its df row
+    claims: read-only {claim number: (fragments, df rows)}. A claim starts at the
+    first fragment numbered "<n>." and runs until a fragment with another number,
+    the same rule the per-claim scans used; later repeats of a number are ignored.
+    """
+
+    def __init__(self, df, layout):
+        _, header_row = layout.first_label_row(EXPERT_COMMENTS_LABELS)
+        self.header_row = header_row
+        block = []
+        block_rows = []
+        if header_row is not None:
+            column = df.iloc[header_row + 1:, 0]
+            for row, value in zip(range(header_row + 1, len(df)), column):
+                if pd.isna(value) or str(value).strip() == "":
+                    break
+                block.append(str(value).strip())
+                block_rows.append(row)
+        self.block = tuple(block)
+        self.block_rows = tuple(block_rows)
+        claims = {}
+        current = None
+        for text, row in zip(self.block, self.block_rows):
+            match = _CLAIM_FRAGMENT_NUMBER_RE.match(text)
+            if match:
+                number = match.group(1)
+                if number != current:
+                    current = number if number not in claims else None
+                    if current is not None:
+                        claims[current] = ([], [])
+            if current is not None:
+                claims[current][0].append(text)
+                claims[current][1].append(row)
+        self.claims = MappingProxyType({n: (tuple(f), tuple(r)) for n, (f, r) in claims.items()})
+
+    def fragments(self, claim_number):
+        """(fragments, rows) lists for claim_number, empty when the block does not have it."""
+        fragments, rows = self.claims.get(str(claim_number), ((), ()))
+        return list(fragments), list(rows)
+
+
+THEME_COLOR_NAMES = ("lt1", "dk1", "lt2", "dk2", "accent1", "accent2",
+                     "accent3", "accent4", "accent5", "accent6", "hlink", "folHlink")
+
+
+def parse_theme_colors(theme_xml):
+    """The 12 theme colors of a workbook theme as 6-digit hex (None where unresolvable)."""
+    colors = [None] * len(THEME_COLOR_NAMES)
+    if not theme_xml:
+        return colors
+    try:
+        ns = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
+        clr_scheme = ElementTree.fromstring(theme_xml).find(".//a:clrScheme", ns)
+        if clr_scheme is None:
+            return colors
+        for i, name in enumerate(THEME_COLOR_NAMES):
+            node = clr_scheme.find(f"a:{name}", ns)
+            if node is None:
+                continue
+            srgb = node.find(".//a:srgbClr", ns)
+            if srgb is not None and srgb.get("val"):
+                colors[i] = srgb.get("val")[-6:]
+                continue
+            sysclr = node.find(".//a:sysClr", ns)
+            if sysclr is not None and sysclr.get("lastClr"):
+                colors[i] = sysclr.get("lastClr")[-6:]
+    except Exception:
+        return [None] * len(THEME_COLOR_NAMES)
+    return colors
+
+
+def apply_tint_to_rgb(rgb_hex, tint):
+    if rgb_hex is None:
+        return None
+    rgb_hex = rgb_hex[-6:]
+    if tint is None:
+        tint = 0
+    try:
+        tint = float(tint)
+    except Exception:
+        tint = 0
+    result = []
+    for i in range(0, 6, 2):
+        channel = int(rgb_hex[i:i+2], 16)
+        if tint < 0:
+            channel = int(channel * (1.0 + tint))
+        else:
+            channel = int(channel + (255 - channel) * tint)
+        channel = max(0, min(255, channel))
+        result.append(f"{channel:02X}")
+    return "".join(result)
+
+
+class ExcelFillColors:
+    """
+    Solid cell fills of a workbook as 6-digit hex. The theme palette is parsed once;
+    resolved colors are memoized by (type, value, tint) and cells by their fill id,
+    so a whole Matrix sheet costs a few dictionary lookups.
+    """
+
+    def __init__(self, wb):
+        self.wb = wb
+        self.theme_colors = parse_theme_colors(getattr(wb, "loaded_theme", None))
+        self._colors = {}
+        self._fills = {}
+
+    def theme_rgb(self, theme_index):
+        try:
+            theme_index = int(theme_index)
+        except Exception:
+            return None
+        if theme_index < 0 or theme_index >= len(self.theme_colors):
+            return None
+        return self.theme_colors[theme_index]
+
+    def color_to_hex(self, excel_color):
+        if excel_color is None:
+            return None
+        try:
+            key = (excel_color.type, excel_color.value, excel_color.tint)
+            hash(key)
+        except Exception:
+            return self._resolve_color(excel_color)
+        if key not in self._colors:
+            self._colors[key] = self._resolve_color(excel_color)
+        return self._colors[key]
+
+    def _resolve_color(self, excel_color):
+        rgb_hex = None
+        try:
+            if excel_color.type == "rgb" and excel_color.rgb:
+                rgb_hex = str(excel_color.rgb)[-6:]
+            elif excel_color.type == "indexed" and excel_color.indexed is not None:
+                indexed_rgb = COLOR_INDEX[int(excel_color.indexed)]
+                rgb_hex = str(indexed_rgb)[-6:]
+            elif excel_color.type == "theme" and excel_color.theme is not None:
+                rgb_hex = self.theme_rgb(excel_color.theme)
+                rgb_hex = apply_tint_to_rgb(rgb_hex, getattr(excel_color, "tint", 0))
+        except Exception:
+            rgb_hex = None
+        if not rgb_hex or len(rgb_hex) != 6:
+            return None
+        return rgb_hex.upper()
+
+    def fill_to_hex(self, cell):
+        if cell is None:
+            return None
+        try:
+            # Cells sharing a fill id share the Fill object
+            fill_id = cell._style.fillId
+        except Exception:
+            return self._resolve_fill(cell.fill)
+        if fill_id not in self._fills:
+            self._fills[fill_id] = self._resolve_fill(cell.fill)
+        return self._fills[fill_id]
+
+    def fill_id_to_hex(self, fill_id):
+        if fill_id not in self._fills:
+            self._fills[fill_id] = self._resolve_fill(self.wb._fills[fill_id])
+        return self._fills[fill_id]
+
+    def _resolve_fill(self, fill):
+        if fill is None:
+            return None
+        try:
+            if fill.fill_type != "solid":
+                return None
+            return self.color_to_hex(fill.fgColor)
+        except Exception:
+            return None
+
+
+def rich_text_runs(value):
+    """
+    A cell value as (text, font) runs for rendering: font is (size, bold, italic) for a
+    formatted TextBlock and None for plain text. None for values that render no text.
+    """
+    if CellRichText is not None and isinstance(value, CellRichText):
+        runs = []
+        for block in value:
+            if isinstance(block, TextBlock):
+                font = block.font
+                runs.append((str(block.text) if block.text else "", (
+                    font.size if font and font.size else None,
+                    bool(font.bold) if font else False,
+                    bool(font.italic) if font else False,
+                )))
+            else:
+                runs.append((str(block), None))
+        return tuple(runs)
+    if isinstance(value, str):
+        return ((value, None),)
+    return None
+
+
+class MatrixSnapshot:
+    """
+    What the Key Concepts table needs from a workbook's Matrix sheet, read in one pass
+    over its cells (1-based openpyxl positions; title is None without a Matrix sheet):
+
+        title: sheet name
+        reference_cols: consecutive row-2 header columns starting at the "A" header
+        headers: row-2 values of reference_cols
+        key_concept_cell: (row, col) of the "Key Concept(s)" header
+        concept_rows: the non-empty rows below it in that column
+        concepts: rich_text_runs of each concept cell
+        fill_codes: concept row x reference column -> index into fill_palette (hex or None)
+    """
+
+    def __init__(self, wb=None, fill_colors=None, rich_value=None):
+        self.title = None
+        self.reference_start_col = None
+        self.reference_cols = []
+        self.headers = []
+        self.key_concept_cell = None
+        self.concept_rows = []
+        self.concepts = []
+        self.fill_palette = [None]
+        self.fill_codes = np.zeros((0, 0), dtype=np.int32)
+        if wb is not None:
+            self._read(wb, fill_colors if fill_colors is not None else ExcelFillColors(wb),
+                       rich_value if rich_value is not None else (lambda cell: cell.value))
+
+    def _read(self, wb, fill_colors, rich_value):
+        for sheet_name in wb.sheetnames:
+            if sheet_name.strip().lower() == "matrix":
+                self.title = sheet_name
+                break
+        if self.title is None:
+            return
+        ws = wb[self.title]
+        cells = worksheet_cells(ws)
+        values = {key: cell.value for key, cell in cells.items() if cell.value is not None}
+        max_row, max_column = ws.max_row, ws.max_column
+
+        for col in range(1, max_column + 1):
+            value = values.get((2, col))
+            if value is not None and str(value).strip().upper() == "A":
+                self.reference_start_col = col
+                break
+        if self.reference_start_col is not None:
+            col = self.reference_start_col
+            while col <= max_column and str(values.get((2, col), "")).strip() != "":
+                self.reference_cols.append(col)
+                col += 1
+        self.headers = [values.get((2, col)) for col in self.reference_cols]
+
+        # The first match in row-major order
+        self.key_concept_cell = min(
+            (key for key, value in values.items()
+             if value and str(value).strip().lower() in ("key concept", "key concepts")),
+            default=None,
+        )
+        if self.key_concept_cell is None:
+            return
+        header_row, key_col = self.key_concept_cell
+        row = header_row + 1
+        while row <= max_row:
+            value = values.get((row, key_col))
+            if value is None or str(value).strip() == "":
+                break
+            self.concept_rows.append(row)
+            row += 1
+        self.concepts = [rich_text_runs(rich_value(cells[(row, key_col)])) for row in self.concept_rows]
+
+        palette = {None: 0}
+        self.fill_codes = np.zeros((len(self.concept_rows), len(self.reference_cols)), dtype=np.int32)
+        for i, row in enumerate(self.concept_rows):
+            for j, col in enumerate(self.reference_cols):
+                cell = cells.get((row, col))
+                # A cell missing from the sheet has the default style (fill id 0)
+                fill_hex = fill_colors.fill_to_hex(cell) if cell is not None else fill_colors.fill_id_to_hex(0)
+                self.fill_codes[i, j] = palette.setdefault(fill_hex, len(palette))
+        self.fill_palette = list(palette)
+
+    def fill(self, i, j):
+        """Fill color (hex or None) of concept i under reference column j."""
+        return self.fill_palette[self.fill_codes[i, j]]
+
+    def to_data(self):
+        """The snapshot as JSON-serialisable data (ExtractedWorkbookCache)."""
+        return {
+            "title": self.title,
+            "reference_start_col": self.reference_start_col,
+            "reference_cols": self.reference_cols,
+            "headers": [cell_value_to_data(value) for value in self.headers],
+            "key_concept_cell": self.key_concept_cell,
+            "concept_rows": self.concept_rows,
+            "concepts": [runs_to_data(runs) for runs in self.concepts],
+            "fill_palette": self.fill_palette,
+            "fill_codes": self.fill_codes.tolist(),
+            "fill_shape": list(self.fill_codes.shape),
+        }
+
+    @classmethod
+    def from_data(cls, data):
+        """A snapshot rebuilt from to_data()."""
+        snapshot = cls()
+        snapshot.title = data["title"]
+        snapshot.reference_start_col = data["reference_start_col"]
+        snapshot.reference_cols = list(data["reference_cols"])
+        snapshot.headers = [cell_value_from_data(value) for value in data["headers"]]
+        snapshot.key_concept_cell = tuple(data["key_concept_cell"]) if data["key_concept_cell"] is not None else None
+        snapshot.concept_rows = list(data["concept_rows"])
+        snapshot.concepts = [runs_from_data(runs) for runs in data["concepts"]]
+        snapshot.fill_palette = list(data["fill_palette"])
+        snapshot.fill_codes = np.array(data["fill_codes"], dtype=np.int32).reshape(data["fill_shape"])
+        return snapshot
+
+
+_LEADING_ZERO_DAY_RE = re.compile(r"^0\d\s")
+
+
+@lru_cache(maxsize=None)
+def compile_date_format(number_format):
+    """
+    Formatter for datetimes shown with an Excel number_format, compiled once per format:
+    month formats without a day -> "January 2014" / "Jan 2014", year-only -> "2014",
+    anything else -> "13 June 2008" without a leading zero on the day.
+    """
+    fmt = (number_format or "").lower()
+    if ("mmmm" in fmt or "mmm" in fmt) and "yyyy" in fmt and "d" not in fmt:
+        pattern = "%B %Y" if "mmmm" in fmt else "%b %Y"
+        return lambda value: value.strftime(pattern)
+    if "yyyy" in fmt and "m" not in fmt and "d" not in fmt:
+        return lambda value: value.strftime("%Y")
+
+    def day_month_year(value):
+        out = value.strftime("%d %B %Y")
+        return out[1:] if out.startswith("0") else out
+    return day_month_year
+
+
+def format_excel_date(value, number_format):
+    """Text Excel displays for a date cell holding value with number_format."""
+    if value in (None, ""):
+        return ""
+    # Excel serial number -> datetime
+    if isinstance(value, (int, float)):
+        try:
+            value = from_excel(value)
+        except Exception:
+            return str(value)
+    if isinstance(value, datetime):
+        return compile_date_format(number_format)(value)
+    # If Excel stored it as text already, return text (strip leading day zero if present)
+    s = str(value).strip()
+    if s.lower() == "nan":
+        return ""
+    if _LEADING_ZERO_DAY_RE.match(s):
+        return s[1:]
+    return s
+
+
+def cell_value_to_data(value):
+    """
+    A workbook or DataFrame cell value as JSON data. Strings, numbers (NaN included),
+    booleans and None are kept as they are; dates, times and missing-value markers become
+    a one-key dict naming their type. Anything else raises TypeError.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if value is pd.NaT:
+        return {"nat": None}
+    if value is pd.NA:
+        return {"na": None}
+    if isinstance(value, pd.Timestamp):
+        return {"timestamp": value.isoformat()}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if isinstance(value, time_of_day):
+        return {"time": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"timedelta": value.total_seconds()}
+    raise TypeError(f"cannot cache a {type(value).__name__} cell value")
+
+
+def cell_value_from_data(data):
+    """The value cell_value_to_data() turned into data."""
+    if not isinstance(data, dict):
+        return data
+    (kind, value), = data.items()
+    if kind == "nat":
+        return pd.NaT
+    if kind == "na":
+        return pd.NA
+    if kind == "timestamp":
+        return pd.Timestamp(value)
+    if kind == "datetime":
+        return datetime.fromisoformat(value)
+    if kind == "date":
+        return date.fromisoformat(value)
+    if kind == "time":
+        return time_of_day.fromisoformat(value)
+    if kind == "timedelta":
+        return timedelta(seconds=value)
+    raise ValueError(f"unknown cached cell value type {kind!r}")
+
+
+def dataframe_to_data(df):
+    """df as JSON data: its index, column labels, dtypes and the values of each column."""
+    return {
+        "index": [cell_value_to_data(label) for label in df.index],
+        "columns": [cell_value_to_data(label) for label in df.columns],
+        "dtypes": [str(dtype) for dtype in df.dtypes],
+        "values": [[cell_value_to_data(value) for value in df.iloc[:, i].tolist()] for i in range(df.shape[1])],
+    }
+
+
+def dataframe_from_data(data):
+    """The DataFrame dataframe_to_data() turned into data, with the same dtypes."""
+    index = [cell_value_from_data(label) for label in data["index"]]
+    index = pd.RangeIndex(len(index)) if index == list(range(len(index))) else pd.Index(index)
+    columns = [cell_value_from_data(label) for label in data["columns"]]
+    series = [pd.Series([cell_value_from_data(value) for value in values], index=index, dtype=dtype)
+              for values, dtype in zip(data["values"], data["dtypes"])]
+    df = pd.concat(series, axis=1) if series else pd.DataFrame(index=index)
+    df.columns = pd.Index(columns) if columns else df.columns
+    return df
+
+
+def runs_to_data(runs):
+    """rich_text_runs() output as JSON data."""
+    return None if runs is None else [[text, font] for text, font in runs]
+
+
+def runs_from_data(data):
+    """The rich_text_runs() tuple runs_to_data() turned into data."""
+    return None if data is None else tuple((text, tuple(font) if font is not None else None) for text, font in data)
+
+
+def _app_code_version():
+    """Short hash of this module's source, or APP_VERSION when the source is not on disk (frozen builds)."""
+    try:
+        with open(os.path.abspath(__file__), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+    except (OSError, NameError):
+        return APP_VERSION
+
+
+# Bump whenever load_excel or the extraction steps change what they produce for a workbook
+WORKBOOK_PARSER_VERSION = 3
+APP_CODE_VERSION = _app_code_version()
+WORKBOOK_CACHE_ENABLED = os.environ.get("PAROLA_WORKBOOK_CACHE", "1").lower() not in ("0", "false", "no")
+WORKBOOK_CACHE_MAX_ENTRIES = int(os.environ.get("PAROLA_WORKBOOK_CACHE_MAX_ENTRIES", 50))
+
+
+class ExtractedWorkbookCache:
+    """
+    Report data extracted from project workbooks, as JSON in one file per workbook under
+    `directory` (plain data only: see PatentReportGenerator.store_extracted_workbook).
+    Entries are keyed by WORKBOOK_PARSER_VERSION, APP_CODE_VERSION and the SHA-256 of the
+    workbook bytes, so a re-saved or edited workbook, a new parser or another build of the
+    app misses. Only the `max_entries` most recently used files are kept. The directory is
+    kept private to its owner, and a file is only read when it and the directory belong to
+    the current user and nobody else can write to them.
+    """
+
+    def __init__(self, directory, max_entries=WORKBOOK_CACHE_MAX_ENTRIES, enabled=WORKBOOK_CACHE_ENABLED):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(content):
+        return f"v{WORKBOOK_PARSER_VERSION}-{APP_CODE_VERSION}-{hashlib.sha256(content).hexdigest()}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _trusted(self, f):
+        """Whether the open file f and the cache directory are the current user's alone."""
+        if not hasattr(os, "getuid"):
+            return True
+        uid = os.getuid()
+        directory = os.stat(self.directory)
+        entry = os.fstat(f.fileno())
+        return (directory.st_uid == uid and not directory.st_mode & 0o022
+                and entry.st_uid == uid and not entry.st_mode & 0o022)
+
+    def get(self, key):
+        """The entry stored under key, or None."""
+        entry = None
+        if self.enabled:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if self._trusted(f):
+                        entry = json.load(f)
+                    else:
+                        print(f"⚠ Note: ignoring workbook cache file not private to this user ({path})")
+                if entry is not None:
+                    os.utime(path)
+            except FileNotFoundError:
+                entry = None
+            except Exception as e:
+                print(f"⚠ Note: workbook cache read failed ({e})")
+                entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """Store entry under key and drop the least recently used files above max_entries."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            if hasattr(os, "getuid") and os.stat(self.directory).st_uid == os.getuid():
+                os.chmod(self.directory, 0o700)
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(partial, path)
+            self._evict()
+        except Exception as e:
+            print(f"⚠ Note: workbook cache write failed ({e})")
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            os.remove(path)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+EXTRACTED_WORKBOOK_CACHE = ExtractedWorkbookCache(os.path.join(PAROLA_CACHE_DIR, "workbooks"))
+
+
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # OLE compound file: how Office stores encrypted documents
+ZIP_SIGNATURE = b"PK\x03\x04"  # plain .docx package
+TEMPLATE_DISK_CACHE = os.environ.get("PAROLA_TEMPLATE_DISK_CACHE", "").lower() in ("1", "true", "yes")
+DECRYPTED_CACHE_MAX_ENTRIES = 8
+
+
+def office_file_format(data):
+    """'cfb' for an OLE compound file (encrypted Office document), 'zip' for a plain package, else None."""
+    if data[:len(CFB_SIGNATURE)] == CFB_SIGNATURE:
+        return "cfb"
+    if data[:len(ZIP_SIGNATURE)] == ZIP_SIGNATURE:
+        return "zip"
+    return None
+
+
+class DecryptedDocumentCache:
+    """
+    Decrypted bytes of password-protected Office files, keyed by the SHA-256 of the
+    encrypted file. Each entry carries an HMAC of its key and the password under a secret
+    that never leaves this machine, and is only returned for the password it was decrypted
+    with: neither the key nor the entry can be used to test passwords without the secret.
+    The `max_entries` most recently used files are kept in memory (under a per-process
+    secret); with a `directory` they are also written there, so the deliberately slow key
+    derivation runs once per template version instead of once per report. The directory
+    and its files (the secret and plaintext packages) are readable only by their owner.
+    """
+
+    def __init__(self, directory=None, max_entries=DECRYPTED_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._secret = None
+
+    @staticmethod
+    def key(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".sealed")
+
+    def _make_directory(self):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid") and os.stat(self.directory).st_uid == os.getuid():
+            os.chmod(self.directory, 0o700)
+
+    def _load_secret(self):
+        """The HMAC secret: random per process in memory, kept in the directory (0600) otherwise."""
+        with self._lock:
+            if self._secret is not None:
+                return self._secret
+            if self.directory is None:
+                self._secret = os.urandom(32)
+                return self._secret
+        self._make_directory()
+        path = os.path.join(self.directory, "secret.key")
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(os.urandom(32))
+        except FileExistsError:
+            pass
+        with open(path, "rb") as f:
+            secret = f.read()
+        if len(secret) != 32:
+            raise ValueError("decrypted template cache secret is damaged")
+        with self._lock:
+            self._secret = secret
+        return secret
+
+    def _tag(self, key, password):
+        return hmac.new(self._load_secret(), key.encode("ascii") + b"\0" + password.encode("utf-8"),
+                        hashlib.sha256).digest()
+
+    def get(self, key, password):
+        """Decrypted bytes stored under key for password, or None."""
+        try:
+            tag = self._tag(key, password)
+        except Exception as e:
+            print(f"⚠ Note: decrypted template cache unavailable ({e})")
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1] if hmac.compare_digest(entry[0], tag) else None
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                stored_tag, data = f.read(len(tag)), f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠ Note: decrypted template cache read failed ({e})")
+            return None
+        if not hmac.compare_digest(stored_tag, tag):
+            return None
+        self._remember(key, tag, data)
+        return data
+
+    def put(self, key, password, data):
+        try:
+            tag = self._tag(key, password)
+        except Exception as e:
+            print(f"⚠ Note: decrypted template cache unavailable ({e})")
+            return
+        self._remember(key, tag, data)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(tag)
+                f.write(data)
+            os.replace(partial, path)
+        except Exception as e:
+            print(f"⚠ Note: decrypted template cache write failed ({e})")
+
+    def _remember(self, key, tag, data):
+        with self._lock:
+            self._entries[key] = (tag, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+DECRYPTED_DOCUMENT_CACHE = DecryptedDocumentCache(
+    os.path.join(PAROLA_CACHE_DIR, "decrypted_templates") if TEMPLATE_DISK_CACHE else None)
+
+
+def decrypt_office_document(data, password):
+    """Decrypted bytes of a password-protected Office file (office_file_format 'cfb'), cached."""
+    key = DECRYPTED_DOCUMENT_CACHE.key(data)
+    decrypted = DECRYPTED_DOCUMENT_CACHE.get(key, password)
+    if decrypted is None:
+        office_file = msoffcrypto.OfficeFile(io.BytesIO(data))
+        office_file.load_key(password=password)
+        decrypted_file = io.BytesIO()
+        office_file.decrypt(decrypted_file)
+        decrypted = decrypted_file.getvalue()
+        DECRYPTED_DOCUMENT_CACHE.put(key, password, decrypted)
+    return decrypted
+
+
 def unlock_password_protected_docx(file_bytes, password):
     """Decrypt password-protected Word file"""
     try:
+        # A plain package needs no password work
+        if office_file_format(file_bytes) == "zip":
+            return io.BytesIO(file_bytes)
         if msoffcrypto is None:
             print("⚠ Note: msoffcrypto not available, assuming file is not password-protected")
             return io.BytesIO(file_bytes)
-            
-        encrypted_file = io.BytesIO(file_bytes)
-        decrypted_file = io.BytesIO()
-
-        office_file = msoffcrypto.OfficeFile(encrypted_file)
-        office_file.load_key(password=password)
-        office_file.decrypt(decrypted_file)
 
-        decrypted_file.seek(0)
+        decrypted_file = io.BytesIO(decrypt_office_document(file_bytes, password))
         print("✓ Template unlocked successfully!")
         return decrypted_file
     except Exception as e:
@@ -73,171 +2399,539 @@ def unlock_password_protected_docx(file_bytes, password):
         # Return original bytes if decryption fails (file might not be protected)
         return io.BytesIO(file_bytes)
 
-def extract_mapping_section(edited_doc):
+class PlaceholderAutomaton:
+    """
+    Aho-Corasick automaton over a set of placeholder keys: one scan of a text finds every
+    key at once. At the root state it jumps straight to the next character that can start
+    a key, so text without placeholders is skipped at C speed.
+    """
+
+    def __init__(self, keys):
+        self.keys = [key for key in dict.fromkeys(keys) if key]
+        goto = [{}]
+        outputs = [()]
+        for key in self.keys:
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(())
+                state = nxt
+            outputs[state] = outputs[state] + (key,)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                back = fail[state]
+                while back and ch not in goto[back]:
+                    back = fail[back]
+                fail[nxt] = goto[back].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        starts = "".join(sorted(goto[0]))
+        self._start_re = re.compile("[" + re.escape(starts) + "]") if starts else None
+
+    def matches(self, text):
+        """Leftmost-longest, non-overlapping (start, end, key) occurrences of the keys in text."""
+        if self._start_re is None:
+            return []
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = []
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if state == 0:
+                m = self._start_re.search(text, i)
+                if m is None:
+                    break
+                i = m.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for key in outputs[state]:
+                found.append((i + 1 - len(key), i + 1, key))
+            i += 1
+        found.sort(key=lambda m: (m[0], m[0] - m[1]))
+        chosen = []
+        end = 0
+        for match in found:
+            if match[0] >= end:
+                chosen.append(match)
+                end = match[1]
+        return chosen
+
+
+W_P = qn('w:p')
+W_T = qn('w:t')
+W_TBL = qn('w:tbl')
+W_BODY = qn('w:body')
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_RUN_BREAK_RE = re.compile(r"([\t\r\n])")
+
+
+def document_text_parts(doc):
+    """The main document part and every header and footer part it references."""
+    parts = [doc.part]
+    for rel in doc.part.rels.values():
+        if not rel.is_external and rel.reltype in (RT.HEADER, RT.FOOTER) and rel.target_part not in parts:
+            parts.append(rel.target_part)
+    return parts
+
+
+def owning_paragraph(t):
+    """Innermost w:p holding text node t (a textbox paragraph, not the one anchoring the textbox)."""
+    p = t.getparent()
+    while p is not None and p.tag != W_P:
+        p = p.getparent()
+    return p
+
+
+def paragraph_text_nodes(root):
+    """{w:p: [w:t, ...]} for every paragraph under root holding text, in document order."""
+    units = {}
+    for t in root.iter(W_T):
+        p = owning_paragraph(t)
+        if p is not None:
+            units.setdefault(p, []).append(t)
+    return units
+
+
+def own_text_nodes(p):
+    """The w:t nodes of paragraph p, leaving out those of textboxes anchored in it."""
+    return [t for t in p.iter(W_T) if owning_paragraph(t) is p]
+
+
+def _set_t_text(t, text):
+    t.text = text
+    if len(text.strip()) < len(text):
+        t.set(_XML_SPACE, "preserve")
+    elif _XML_SPACE in t.attrib:
+        del t.attrib[_XML_SPACE]
+
+
+def set_text_node(t, text):
+    """Set a w:t node's text the way python-docx writes run text: tabs and line breaks become w:tab / w:br."""
+    pieces = _RUN_BREAK_RE.split(text)
+    _set_t_text(t, pieces[0])
+    anchor = t
+    for piece in pieces[1:]:
+        if piece == "\t":
+            node = OxmlElement('w:tab')
+        elif piece in ("\r", "\n"):
+            node = OxmlElement('w:br')
+        elif piece:
+            node = OxmlElement('w:t')
+            _set_t_text(node, piece)
+        else:
+            continue
+        anchor.addnext(node)
+        anchor = node
+
+
+def replace_in_text_nodes(nodes, automaton, replacements):
+    """
+    Replace the automaton's keys across the text of one paragraph's w:t nodes. A key split
+    over several runs is replaced in the run where it starts and its remaining characters
+    are removed from the others, so every run keeps its formatting. Returns the number of
+    replacements.
+    """
+    texts = [t.text or "" for t in nodes]
+    joined = "".join(texts)
+    found = automaton.matches(joined)
+    if not found:
+        return 0
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text)
+    out = [[] for _ in nodes]
+
+    def copy_span(a, b):
+        i = max(bisect_right(starts, a) - 1, 0)
+        while a < b:
+            end = min(b, starts[i] + len(texts[i]))
+            if end > a:
+                out[i].append(joined[a:end])
+                a = end
+            i += 1
+
+    pos = 0
+    for start, end, key in found:
+        copy_span(pos, start)
+        out[bisect_right(starts, start) - 1].append(replacements[key])
+        pos = end
+    copy_span(pos, len(joined))
+    for t, text, pieces in zip(nodes, texts, out):
+        new_text = "".join(pieces)
+        if new_text != text:
+            set_text_node(t, new_text)
+    return len(found)
+
+
+_CLAIM_HEADER_RE = re.compile(r"\[CLAIM_HEADER(\d+)\]")
+
+
+def has_page_break(element):
+    """Whether element holds a <w:br w:type="page"/>."""
+    return any(br.get(qn('w:type')) == 'page' for br in element.xpath('.//w:br'))
+
+
+class SectionIndex:
+    """
+    The children of a document body with the text of its paragraphs read once, for finding
+    section headings ("criteria for the publication search", "about us", ...) and the
+    elements between them. Lookups match lowercased, stripped paragraph text, like the
+    section routines did with p.text.lower(); each key's matches are collected on first
+    use. insert_before/insert_after/remove change the body and the index together; sync()
+    picks up elements added or removed behind its back. A paragraph's text is read when it
+    enters the index; paragraphs rewritten in place are read again with refresh().
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self._children = []
+        self._text = {}
+        self._lower = {}
+        self._matches = {}
+        self._positions = None
+        self.sync()
+
+    def __len__(self):
+        return len(self._children)
+
+    def sync(self):
+        children = list(self.body)
+        if children == self._children:
+            return
+        text, lower = {}, {}
+        for el in children:
+            if el.tag != W_P:
+                continue
+            if el in self._text:
+                text[el], lower[el] = self._text[el], self._lower[el]
+            else:
+                text[el] = (el.text or "").strip()
+                lower[el] = text[el].lower()
+        self._children, self._text, self._lower = children, text, lower
+        self._matches = {}
+        self._positions = None
+
+    def text(self, el):
+        """Stripped text of a body paragraph, None for other elements."""
+        return self._text.get(el)
+
+    def lower(self, el):
+        return self._lower.get(el)
+
+    def paragraphs(self):
+        """(position, element, stripped text) of every body paragraph."""
+        return [(i, el, self._text[el]) for i, el in enumerate(self._children) if el in self._text]
+
+    def position(self, el):
+        if self._positions is None:
+            self._positions = {child: i for i, child in enumerate(self._children)}
+        return self._positions[el]
+
+    def elements(self):
+        """Body elements in document order."""
+        return list(self._children)
+
+    def element_at(self, position):
+        return self._children[position] if 0 <= position < len(self._children) else None
+
+    def previous(self, el):
+        return self.element_at(self.position(el) - 1)
+
+    def following(self, el):
+        """Body elements after el."""
+        return self._children[self.position(el) + 1:]
+
+    def matches(self, key):
+        """Body paragraphs whose lowercased text contains key, in document order."""
+        found = self._matches.get(key)
+        if found is None:
+            found = self._matches[key] = [el for el in self._children if key in self._lower.get(el, ())]
+        return found
+
+    def first(self, key, exact=False, after=None):
+        """
+        First paragraph whose text contains key (or equals it, with exact), optionally only
+        among those after element after.
+        """
+        start = -1 if after is None else self.position(after)
+        for el in self.matches(key):
+            if exact and self._lower[el] != key:
+                continue
+            if start < 0 or self.position(el) > start:
+                return el
+        return None
+
+    def first_of(self, keys, after=None):
+        """First paragraph after element after whose text contains any of keys."""
+        found = [el for el in (self.first(key, after=after) for key in keys) if el is not None]
+        return min(found, key=self.position, default=None)
+
+    def index_of(self, key, exact=False):
+        el = self.first(key, exact)
+        return None if el is None else self.position(el)
+
+    def section(self, start, end=None):
+        """Body elements after start, up to end (exclusive) or to the end of the body."""
+        stop = self.position(end) if end is not None else len(self._children)
+        return self._children[self.position(start) + 1:stop]
+
+    def insert_before(self, anchor, elements):
+        """Insert new elements, in order, right before anchor."""
+        position = self.position(anchor)
+        for el in elements:
+            anchor.addprevious(el)
+        self._added(position, elements)
+
+    def insert_after(self, anchor, elements):
+        """Insert new elements, in order, right after anchor."""
+        position = self.position(anchor) + 1
+        for el in reversed(elements):
+            anchor.addnext(el)
+        self._added(position, elements)
+
+    def remove(self, elements):
+        gone = set(elements)
+        for el in elements:
+            self.body.remove(el)
+            lower = self._lower.pop(el, None)
+            self._text.pop(el, None)
+            if lower:
+                for key, found in self._matches.items():
+                    if key in lower:
+                        found.remove(el)
+        self._children = [el for el in self._children if el not in gone]
+        self._positions = None
+
+    def refresh(self, el):
+        """Read the text of a body paragraph again after its runs were rewritten in place."""
+        old = self._lower.get(el, "")
+        self._text[el] = (el.text or "").strip()
+        lower = self._lower[el] = self._text[el].lower()
+        for key in [key for key in self._matches if key in lower or key in old]:
+            del self._matches[key]
+
+    def _added(self, position, elements):
+        self._children[position:position] = elements
+        self._positions = None
+        for el in elements:
+            if el.tag == W_P:
+                self.refresh(el)
+
+
+def body_child(el):
+    """The w:body holding el and its child that el is in (el itself for body children)."""
+    parent = el.getparent()
+    while parent is not None and parent.tag != W_BODY:
+        el, parent = parent, parent.getparent()
+    return parent, el
+
+
+class DocumentView:
+    """
+    Paragraph and Table proxies for the children of a document body, built once, and the
+    text of each paragraph read once. doc.paragraphs and doc.tables build new proxies on
+    every call and the routines re-read p.text on every scan; the view keeps both for as
+    long as the element is unchanged. sync() picks up body elements inserted, moved or
+    removed since the last lookup, and new paragraphs are read on first use. A paragraph
+    whose runs were rewritten in place is read again after touch(). text() and lower()
+    serve the cached text, so they depend on touch(); find() re-reads the paragraph it is
+    about to return and read() always reads the element, for scans whose result must not
+    depend on every edit having been touched.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.body = doc.element.body
+        self._children = []
+        self._proxies = {}
+        self._text = {}
+        self._lower = {}
+        self._paragraphs = None
+        self._tables = None
+        self.sync()
+
+    def sync(self):
+        children = list(self.body)
+        if children == self._children:
+            return
+        present = set(children)
+        self._proxies = {el: proxy for el, proxy in self._proxies.items() if el in present}
+        self._text = {el: text for el, text in self._text.items() if el in present}
+        self._lower = {el: lower for el, lower in self._lower.items() if el in present}
+        self._children = children
+        self._paragraphs = self._tables = None
+
+    def _proxy(self, el, cls):
+        proxy = self._proxies.get(el)
+        if proxy is None:
+            proxy = self._proxies[el] = cls(el, self.doc)
+        return proxy
+
+    def paragraphs(self):
+        """Body paragraphs in document order, like doc.paragraphs."""
+        if self._paragraphs is None:
+            self._paragraphs = [self._proxy(el, Paragraph) for el in self._children if el.tag == W_P]
+        return list(self._paragraphs)
+
+    def tables(self):
+        """Body tables in document order, like doc.tables."""
+        if self._tables is None:
+            self._tables = [self._proxy(el, Table) for el in self._children if el.tag == W_TBL]
+        return list(self._tables)
+
+    def text(self, paragraph):
+        """Paragraph.text of a body paragraph (proxy or w:p element)."""
+        el = getattr(paragraph, '_element', paragraph)
+        text = self._text.get(el)
+        if text is None:
+            text = self._text[el] = el.text or ""
+        return text
+
+    def read(self, paragraph):
+        """Paragraph.text read from the element again, updating the cached text if it changed."""
+        el = getattr(paragraph, '_element', paragraph)
+        text = el.text or ""
+        if self._text.get(el) != text:
+            self._text[el] = text
+            self._lower.pop(el, None)
+        return text
+
+    def lower(self, paragraph):
+        el = getattr(paragraph, '_element', paragraph)
+        lower = self._lower.get(el)
+        if lower is None:
+            lower = self._lower[el] = self.text(el).lower()
+        return lower
+
+    def find(self, key, case_sensitive=False):
+        """
+        First body paragraph whose text contains key, compared lowercased unless
+        case_sensitive.
+        """
+        if self._paragraphs is None:
+            self.paragraphs()
+        cached = self.text if case_sensitive else self.lower
+        key = key if case_sensitive else key.lower()
+        for paragraph in self._paragraphs:
+            if key not in cached(paragraph):
+                continue
+            # It may have changed without touch(): check the current text before returning it
+            self.read(paragraph)
+            if key in cached(paragraph):
+                return paragraph
+        return None
+
+    def touch(self, el):
+        """Read body element el again on next use, after its text was changed in place."""
+        self._text.pop(el, None)
+        self._lower.pop(el, None)
+
+
+def extract_mapping_section(edited_doc, index=None):
     """Extract the Mapping section from edited document"""
     if not edited_doc:
         return []
-    body = edited_doc.element.body
+    if index is None:
+        index = SectionIndex(edited_doc.element.body)
     elements = []
-    start_found = False
-    
+
     # Debug: Print all paragraph text to help identify the correct patterns
     print("DEBUG: Searching for mapping section in edited document...")
-    for i, child in enumerate(list(body)):
-        if child.tag == qn('w:p'):
-            p = Paragraph(child, edited_doc)
-            text = p.text.strip()
-            if text and len(text) < 100:  # Only print short text (likely headings)
-                print(f"  Paragraph {i}: '{text}'")
-    
-    for child in list(body):
-        if child.tag == qn('w:p'):
-            p = Paragraph(child, edited_doc)
-            text_lower = p.text.lower().strip()
-            # Match exactly on the section header text
-            if not start_found and "mappings based on selected references" in text_lower:
-                print(f"DEBUG: Found mapping section start with text: '{p.text}'")
-                start_found = True
-                # Include the header itself
-                elements.append(child)
-                continue
-        if start_found:
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, edited_doc)
-                text_lower = p.text.lower().strip()
-                # Stop at Disclaimer section - everything after should be regenerated
-                # Note: Appendices and Search Strategies are regenerated from Excel
-                if "disclaimer" in text_lower:
-                    print(f"DEBUG: Found mapping section end with text: '{p.text}'")
-                    break
-            # Include all elements (paragraphs, tables, drawings, etc.)
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, edited_doc)
-                # Check if this paragraph contains page breaks by looking at XML
-                has_page_break = False
-                try:
-                    for run_element in child.xpath('.//w:br'):
-                        break_type = run_element.get(qn('w:type'))
-                        if break_type == 'page':
-                            has_page_break = True
-                            break
-                except Exception:
-                    pass
-                
-                text_content = p.text.strip()
-                if text_content or has_page_break:
-                    # Include paragraph if it has text OR if it contains page breaks
-                    elements.append(child)
-            else:
-                # Include all other elements (tables, drawings, etc.)
+    for i, child, text in index.paragraphs():
+        if text and len(text) < 100:  # Only print short text (likely headings)
+            print(f"  Paragraph {i}: '{text}'")
+
+    # Match exactly on the section header text
+    start = index.first("mappings based on selected references")
+    if start is not None:
+        print(f"DEBUG: Found mapping section start with text: '{start.text}'")
+        # Include the header itself
+        elements.append(start)
+        # Stop at Disclaimer section - everything after should be regenerated
+        # Note: Appendices and Search Strategies are regenerated from Excel
+        end = index.first("disclaimer", after=start)
+        if end is not None:
+            print(f"DEBUG: Found mapping section end with text: '{end.text}'")
+        # Include all elements (paragraphs, tables, drawings, etc.)
+        for child in index.section(start, end):
+            # Include paragraph if it has text OR if it contains page breaks
+            if child.tag != W_P or index.text(child) or has_page_break(child):
                 elements.append(child)
-    
+
     print(f"DEBUG: Extracted {len(elements)} elements from mapping section")
-    
+
     # If no elements found, try a more general search
     if len(elements) == 0:
         print("DEBUG: No mapping section found with specific patterns, trying general search...")
-        for i, child in enumerate(list(body)):
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, edited_doc)
-                text_lower = p.text.lower().strip()
-                if "mappings based" in text_lower:
-                    print(f"  Found potential mapping header at paragraph {i}: '{p.text[:100]}...'")
-    
+        for child in index.matches("mappings based"):
+            print(f"  Found potential mapping header at paragraph {index.position(child)}: '{child.text[:100]}...'")
+
     return [deepcopy(el) for el in elements]
 
-def extract_criteria_section(edited_doc):
+def extract_criteria_section(edited_doc, index=None):
     """Extract the Criteria for Publication Search section from edited document"""
     if not edited_doc:
         return []
-    body = edited_doc.element.body
+    if index is None:
+        index = SectionIndex(edited_doc.element.body)
     elements = []
-    start_found = False
-    
+
     # Debug: Print all paragraph text to help identify the correct patterns
     print("DEBUG: Searching for criteria section in edited document...")
-    for i, child in enumerate(list(body)):
-        if child.tag == qn('w:p'):
-            p = Paragraph(child, edited_doc)
-            text = p.text.strip()
-            if text and len(text) < 100:  # Only print short text (likely headings)
-                print(f"  Paragraph {i}: '{text}'")
-    
-    for child in list(body):
-        if child.tag == qn('w:p'):
-            p = Paragraph(child, edited_doc)
-            text_lower = p.text.lower().strip()
-            # Match exactly on the section header text
-            if not start_found and "criteria for the publication search" in text_lower:
-                print(f"DEBUG: Found criteria section start with text: '{p.text}'")
-                start_found = True
-                # Skip the header itself, start collecting from next element
-                continue
-        if start_found:
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, edited_doc)
-                text_lower = p.text.lower().strip()
-                # Look for mapping section header as end marker
-                if "mappings based on selected references" in text_lower:
-                    print(f"DEBUG: Found criteria section end with text: '{p.text}'")
-                    break
+    for i, child, text in index.paragraphs():
+        if text and len(text) < 100:  # Only print short text (likely headings)
+            print(f"  Paragraph {i}: '{text}'")
+
+    # Match exactly on the section header text
+    start = index.first("criteria for the publication search")
+    if start is not None:
+        print(f"DEBUG: Found criteria section start with text: '{start.text}'")
+        # Skip the header itself, start collecting from next element
+        # Look for mapping section header as end marker
+        end = index.first("mappings based on selected references", after=start)
+        if end is not None:
+            print(f"DEBUG: Found criteria section end with text: '{end.text}'")
+        for child in index.section(start, end):
             # Only append paragraphs that are not empty OR contain page breaks
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, edited_doc)
-                
-                # Check if this paragraph contains page breaks by looking at XML
-                has_page_break = False
-                try:
-                    for run_element in child.xpath('.//w:br'):
-                        break_type = run_element.get(qn('w:type'))
-                        if break_type == 'page':
-                            has_page_break = True
-                            break
-                except Exception:
-                    pass
-                
-                if p.text.strip() or has_page_break:
+            if child.tag == W_P:
+                if index.text(child) or has_page_break(child):
                     elements.append(child)
             # Include all tables
-            elif child.tag == qn('w:tbl'):
+            elif child.tag == W_TBL:
                 elements.append(child)
-    
+
     print(f"DEBUG: Extracted {len(elements)} elements from criteria section")
-    
+
     # If no elements found, try a more general search
     if len(elements) == 0:
         print("DEBUG: No criteria section found with specific patterns, trying general search...")
-        for i, child in enumerate(list(body)):
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, edited_doc)
-                text_lower = p.text.lower().strip()
-                if "criteria for" in text_lower:
-                    print(f"  Found potential criteria header at paragraph {i}: '{p.text[:100]}...'")
-    
+        for child in index.matches("criteria for"):
+            print(f"  Found potential criteria header at paragraph {index.position(child)}: '{child.text[:100]}...'")
+
     return [deepcopy(el) for el in elements]
 
-def remove_section(doc, start_key, end_key):
+def remove_section(doc, start_key, end_key, index=None):
     """Remove a section from document between two markers"""
-    body = doc.element.body
-    to_remove = []
-    start_found = False
-    for child in list(body):
-        if child.tag == qn('w:p'):
-            p = Paragraph(child, doc)
-            text_lower = p.text.lower().strip()
-            if not start_found and start_key in text_lower:
-                start_found = True
-                to_remove.append(child)
-                continue
-        if start_found:
-            if child.tag == qn('w:p'):
-                p = Paragraph(child, doc)
-                text_lower = p.text.lower().strip()
-                if end_key in text_lower:
-                    break
-            to_remove.append(child)
-    for el in to_remove:
-        body.remove(el)
+    if index is None:
+        index = SectionIndex(doc.element.body)
+    start = index.first(start_key)
+    if start is None:
+        return
+    index.remove([start] + index.section(start, index.first(end_key, after=start)))
 
 def insert_element_after(anchor, element):
     """Insert element after anchor, sanitizing relationships"""
@@ -326,14 +3020,42 @@ class PatentReportGenerator:
         self.edited_report_path = edited_report_path
         self.template_password = template_password
         self.df = None
+        # Anchor label positions in df and the Matrix sheet, built by load_excel
+        self.layout = None
+        # Expert Comments fragments split by claim number, built by load_excel
+        self.claim_fragments = None
         self.doc = None
         self.edited_doc = None
         self.gen_doc = None  # For generating fresh sections in update mode
         self.excel_filename = None
         self.template_filename = None
+        # SectionIndex of each document body the section routines have looked into
+        self._section_indexes = {}
+        # DocumentView of each document body the generator has looked up paragraphs or tables in
+        self._document_views = {}
         self.global_color_index = 0  # For consistent color cycling across claims
         # Feb10: openpyxl worksheet for precise date formatting via Excel number_format
         self.ws = None
+        # Run formatting of workbook cells, decoded only for the cells that are rendered
+        self.rich_text = None
+        # Hex colors of the workbook's cell fills, resolved once per fill
+        self.fill_colors = None
+        # Matrix sheet contents for the Key Concepts table
+        self.matrix = None
+        # rich_text_runs of the non-empty mapping cells, keyed by df (row, col)
+        self.mapping_cells = {}
+        # Extracted data restored from EXTRACTED_WORKBOOK_CACHE, or the key to store it under
+        self.cached_extraction = None
+        self._workbook_cache_key = None
+        # Snapshot of the shared page cache counters so the log reports this run only
+        self._page_cache_stats_start = PATENT_PAGE_CACHE.stats()
+        self._scraper_stats_start = PATENT_SCRAPER.stats()
+        # Stops network lookups for the rest of this report once Google Patents is unreachable
+        self._scrape_breaker = ScraperCircuitBreaker()
+        # Where abstracts and claims come from, in order (PAROLA_PATENT_SOURCES)
+        self.patent_sources = configured_patent_sources()
+        # Pending background fetches keyed by normalized publication number
+        self._patent_prefetch = {}
 
     class Reference:
         """
@@ -366,31 +3088,67 @@ class PatentReportGenerator:
         """Update progress using the configured callback function."""
         self.progress_callback(value, message)
 
-    def load_excel(self, file_path):
-        """
-        Load Excel file containing patent data.
-        
-        Args:
-            file_path: Path to the Excel file to load
-        """
-        self.log("Loading Excel file...")
-        try:
+    def load_excel(self, file_path):
+        """
+        Load Excel file containing patent data.
+        
+        Args:
+            file_path: Path to the Excel file to load
+        """
+        self.log("Loading Excel file...")
+        try:
+            self.ws = None
+            self.wb = None
+            self.rich_text = None
+            self.fill_colors = None
+            self.matrix = None
+            self.mapping_cells = {}
+            self.cached_extraction = None
+            self._workbook_cache_key = None
+            self.excel_filename = os.path.basename(file_path)
+            with open(file_path, "rb") as f:
+                content = f.read()
+            key = EXTRACTED_WORKBOOK_CACHE.key(content)
+            cached = EXTRACTED_WORKBOOK_CACHE.get(key)
+            if cached is not None:
+                try:
+                    # Unchanged workbook: the extraction steps restore their results from the entry
+                    self.restore_extracted_workbook(cached)
+                    self.log("Excel data restored from the workbook cache.")
+                    return
+                except Exception as e:
+                    self.log(f"Warning: Workbook cache entry unusable ({str(e)}), reading the workbook")
+                    self.cached_extraction = None
+            self._workbook_cache_key = key
+            # One openpyxl parse gives both the value grid and the cells behind it
+            if load_workbook is not None:
+                try:
+                    self.df, self.wb, self.rich_text = read_workbook(file_path, content=content)
+                    self.ws = self.wb.active
+                    self.layout = WorkbookLayout(self.df)
+                    self.fill_colors = ExcelFillColors(self.wb)
+                    self.matrix = MatrixSnapshot(self.wb, self.fill_colors, self.excel_rich_value)
+                    self.claim_fragments = ClaimFragmentTable(self.df, self.layout)
+                    self.log("Excel file loaded successfully.")
+                    return
+                except Exception as e:
+                    self.log(f"Warning: Single-pass workbook load failed ({str(e)}), falling back to pandas")
+
             self.df = pd.read_excel(file_path, header=None)
-            self.excel_filename = os.path.basename(file_path)
             self.log("Excel file loaded successfully.")
 
             # Feb10: also load workbook via openpyxl so we can honor Excel's displayed date formats
-            self.ws = None
-            self.wb = None
             if load_workbook is not None:
                 try:
-                    with open(file_path, "rb") as f:
-                        excel_bytes = f.read()
-                    wb = load_workbook(BytesIO(excel_bytes), data_only=True, rich_text=True)
+                    wb = load_workbook(BytesIO(content), data_only=True, rich_text=True)
                     self.wb = wb
                     self.ws = wb.active
                 except Exception as e:
                     self.log(f"Warning: Could not load workbook with openpyxl for precise date formatting: {str(e)}")
+            self.layout = WorkbookLayout(self.df)
+            self.fill_colors = ExcelFillColors(self.wb) if self.wb is not None else None
+            self.matrix = MatrixSnapshot(self.wb, self.fill_colors, self.excel_rich_value)
+            self.claim_fragments = ClaimFragmentTable(self.df, self.layout)
         except Exception as e:
             self.log(f"Error loading Excel file: {str(e)}")
             raise
@@ -404,40 +3162,68 @@ class PatentReportGenerator:
         """
         self.log("Loading Word template...")
         try:
-            try:
-                # Store decrypted bytes for gen_doc creation in update mode
-                with open(file_path, 'rb') as f:
-                    template_bytes = f.read()
-                self.doc = Document(io.BytesIO(template_bytes))
-                self.template_filename = os.path.basename(file_path)
-                self.log("Word template loaded successfully.")
-                # Store bytes for gen_doc creation
-                self.template_bytes = template_bytes
-            except Exception as e_normal:
+            with open(file_path, 'rb') as f:
+                template_bytes = f.read()
+            # Encrypted templates are OLE compound files: decrypt up front instead of after a failed open
+            encrypted = office_file_format(template_bytes) == "cfb"
+            if encrypted:
                 if msoffcrypto is None:
-                    self.log(f"Note: msoffcrypto not available. Error opening template: {str(e_normal)}")
-                    raise
+                    raise RuntimeError("Template is password-protected and msoffcrypto is not available")
                 try:
-                    with open(file_path, 'rb') as f:
-                        encrypted_bytes = f.read()
-                    encrypted_file = io.BytesIO(encrypted_bytes)
-                    decrypted_file = io.BytesIO()
-                    office_file = msoffcrypto.OfficeFile(encrypted_file)
-                    office_file.load_key(password=self.template_password)
-                    office_file.decrypt(decrypted_file)
-                    decrypted_file.seek(0)
-                    self.doc = Document(decrypted_file)
-                    self.template_filename = os.path.basename(file_path)
-                    self.log("Template unlocked and loaded successfully.")
-                    # Store decrypted bytes for gen_doc creation
-                    self.template_bytes = decrypted_file.getvalue()
+                    template_bytes = decrypt_office_document(template_bytes, self.template_password)
                 except Exception as e_unlock:
                     self.log(f"Error unlocking template: {str(e_unlock)}")
-                    raise e_normal
+                    raise
+            # Store decrypted bytes for gen_doc creation in update mode
+            self.template_bytes = template_bytes
+            self.doc = self.instantiate_template()
+            self.log("Template unlocked and loaded successfully." if encrypted else "Word template loaded successfully.")
+            self.template_filename = os.path.basename(file_path)
         except Exception as e:
             self.log(f"Error loading Word template: {str(e)}")
             raise
     
+    def instantiate_template(self):
+        """A fresh Document of the loaded template, opened from its (decrypted) package bytes."""
+        return Document(io.BytesIO(self.template_bytes))
+
+    def section_index(self, doc):
+        """The SectionIndex of doc's body, synced with changes made since it was last used."""
+        body = doc.element.body
+        index = self._section_indexes.get(body)
+        if index is None:
+            index = self._section_indexes[body] = SectionIndex(body)
+        else:
+            index.sync()
+        return index
+
+    def document_view(self, doc):
+        """The DocumentView of doc's body, synced with changes made since it was last used."""
+        body = doc.element.body
+        view = self._document_views.get(body)
+        if view is None:
+            view = self._document_views[body] = DocumentView(doc)
+        else:
+            view.sync()
+        return view
+
+    def touch(self, *items):
+        """
+        Record that the text of paragraphs (or runs, cells, tables or elements inside them)
+        was changed in place, so the views and section indexes of their document read the
+        body element holding them again.
+        """
+        for item in items:
+            body, el = body_child(getattr(item, '_element', item))
+            if body is None:
+                continue
+            view = getattr(self, '_document_views', {}).get(body)
+            if view is not None:
+                view.touch(el)
+            index = getattr(self, '_section_indexes', {}).get(body)
+            if index is not None and index.text(el) is not None:
+                index.refresh(el)
+
     def setup_update_mode_documents(self):
         """
         Set up document structure for update mode.
@@ -451,8 +3237,7 @@ class PatentReportGenerator:
             
             # Prepare a separate generated document from blank template
             if hasattr(self, 'template_bytes') and self.template_bytes:
-                decrypted_blank = unlock_password_protected_docx(self.template_bytes, self.template_password)
-                self.gen_doc = Document(decrypted_blank)
+                self.gen_doc = self.instantiate_template()
                 self.log("✓ Prepared fresh document for regenerated sections")
             else:
                 self.gen_doc = old_doc
@@ -644,26 +3429,7 @@ class PatentReportGenerator:
     def get_all_claim_numbers_from_google(self, patent_number):
         """Fetch all claim numbers from Google Patents"""
         try:
-            url = f"https://patents.google.com/patent/{patent_number}/en"
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                return []
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            claims_div = soup.find("section", itemprop="claims")
-            if not claims_div:
-                return []
-
-            claims_text = claims_div.get_text(separator="\n")
-            claim_lines = claims_text.strip().split("\n")
-
-            claim_numbers = []
-            for line in claim_lines:
-                match = re.match(r'^(\d+)\.', line.strip())
-                if match:
-                    claim_numbers.append(match.group(1))
-
-            return claim_numbers
+            return self.get_patent_document(patent_number).claim_numbers()
         except Exception:
             return []
 
@@ -731,46 +3497,31 @@ class PatentReportGenerator:
         when possible. row/col are 0-based indices into self.df (same as df.iloc).
         Falls back to legacy string-based handling when openpyxl context is absent.
         """
-        # Primary path: use openpyxl worksheet if available
-        if getattr(self, "ws", None) is not None and from_excel is not None:
-            try:
-                cell = self.ws.cell(row=row + 1, column=col + 1)  # openpyxl is 1-based
-                v = cell.value
-                fmt = (cell.number_format or "").lower()
-
-                if v in (None, ""):
-                    return ""
-
-                # Excel serial number -> datetime
-                if isinstance(v, (int, float)):
-                    try:
-                        v = from_excel(v)
-                    except Exception:
-                        return str(v)
-
-                from datetime import datetime as _dt
-                if isinstance(v, _dt):
-                    # Month + Year (no day), e.g. "January 2014"
-                    if ("mmmm" in fmt or "mmm" in fmt) and "yyyy" in fmt and "d" not in fmt:
-                        return v.strftime("%B %Y") if "mmmm" in fmt else v.strftime("%b %Y")
-                    # Year-only
-                    if "yyyy" in fmt and "m" not in fmt and "d" not in fmt:
-                        return v.strftime("%Y")
-                    # Default: Day Month Year without leading zero
-                    out = v.strftime("%d %B %Y")
-                    return out[1:] if out.startswith("0") else out
-
-                # If Excel stored it as text already, return text (strip leading day zero if present)
-                s = str(v).strip()
-                if s.lower() == "nan":
-                    return ""
-                if re.match(r"^0\d\s", s):
-                    return s[1:]
-                return s
-            except Exception:
-                # Fall through to legacy behavior below
-                pass
+        return self.format_dates([(row, col)])[0]
+
+    def format_dates(self, positions):
+        """format_date for many (row, col) positions at once, e.g. a whole reference block."""
+        ws = getattr(self, "ws", None)
+        use_ws = ws is not None and from_excel is not None
+        cells = worksheet_cells(ws) if use_ws else None
+        results = []
+        for row, col in positions:
+            # openpyxl rejects rows/columns below 1; those went to the legacy path before too
+            if use_ws and row >= 0 and col >= 0:
+                cell = cells.get((row + 1, col + 1))
+                try:
+                    if cell is None:
+                        results.append("")
+                    else:
+                        results.append(format_excel_date(cell.value, cell.number_format))
+                    continue
+                except Exception:
+                    # Fall through to legacy behavior below
+                    pass
+            results.append(self._format_date_from_df(row, col))
+        return results
 
+    def _format_date_from_df(self, row, col):
         # Fallback: legacy behavior using raw value from dataframe (pre-Feb10 appV6 logic)
         try:
             date_val = self.df.iloc[row, col]
@@ -815,6 +3566,12 @@ class PatentReportGenerator:
                 formatted = formatted[1:]
         return formatted
 
+    def excel_rich_value(self, ws_cell):
+        """Value of a workbook cell with its run formatting (CellRichText) where it has any."""
+        if self.rich_text is None:
+            return ws_cell.value
+        return self.rich_text.value(ws_cell)
+
     def clean_text(self, value):
         if pd.isna(value):
             return ""
@@ -1131,17 +3888,77 @@ class PatentReportGenerator:
             # Non-US Patent - keep as-is
             ref.PublicationName = ref.PublicationNumber
 
+    def prefetch_patent_document(self, patent_number):
+        """Start loading and parsing patent_number in the background; get_patent_document waits for it."""
+        key = normalize_publication_number(patent_number)
+        if not key or key in self._patent_prefetch:
+            return
+        if key in _PATENT_DOCUMENTS:
+            return
+        self.log(f"Prefetching patent text for {patent_number} in background...")
+        self._patent_prefetch[key] = _PATENT_PREFETCH_EXECUTOR.submit(self._load_patent_document, patent_number)
+
+    def get_patent_document(self, patent_number):
+        """
+        Return the parsed PatentDocument for patent_number. Successful parses are
+        memoized per publication number; network errors propagate to the caller.
+        """
+        key = normalize_publication_number(patent_number)
+        document = _PATENT_DOCUMENTS.get(key)
+        if document is not None:
+            return document
+        future = self._patent_prefetch.pop(key, None)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as e:
+                self.log(f"Background fetch for {patent_number} failed ({str(e)}), retrying...")
+        return self._load_patent_document(patent_number)
+
+    def _load_patent_document(self, patent_number):
+        """
+        Ask each configured patent source in turn. The first document found wins; if no
+        source has the patent, the last source error is raised, or a 404 document returned.
+        """
+        was_open = not self._scrape_breaker.allow()
+        try:
+            document, _ = load_patent_document(
+                patent_number, self.patent_sources, log=self.log, breaker=self._scrape_breaker
+            )
+        finally:
+            if not was_open and not self._scrape_breaker.allow():
+                self.log(f"⚠ Google Patents unavailable ({self._scrape_breaker.reason}); "
+                         "using Excel claim fragments for the rest of this report")
+        if document is None:
+            self.log(f"{patent_number} not found in patent sources ({', '.join(s.name for s in self.patent_sources)})")
+            return PatentDocument(patent_number, 404)
+        return document
+
+    def log_patent_cache_stats(self):
+        """Log page cache and HTTP client counters accumulated since this generator was created."""
+        start = self._page_cache_stats_start
+        now = PATENT_PAGE_CACHE.stats()
+        hits = now["hits"] - start["hits"]
+        misses = now["misses"] - start["misses"]
+        revalidated = now["revalidated"] - start["revalidated"]
+        saved = now["bytes_saved"] - start["bytes_saved"]
+        self.log(f"Patent page cache: {hits} hits, {misses} misses, {revalidated} revalidated (304), {saved / 1024:.1f} KB saved")
+        start = self._scraper_stats_start
+        now = PATENT_SCRAPER.stats()
+        requests_made = now["requests"] - start["requests"]
+        retries = now["retries"] - start["retries"]
+        latency = now["latency"] - start["latency"]
+        average_ms = (latency / requests_made * 1000) if requests_made else 0.0
+        self.log(f"Patent scraper: {requests_made} HTTP requests, {retries} retries, {average_ms:.0f} ms average latency")
+        if not self._scrape_breaker.allow():
+            self.log(f"Patent scraper circuit breaker tripped: {self._scrape_breaker.reason}")
+
     def fetch_abstract(self, publication_number):
-        url = f"https://patents.google.com/patent/{publication_number}/en"
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
+            document = self.get_patent_document(publication_number)
+            if document.status_code != 200 or document.abstract is None:
                 return "Abstract not found."
-            soup = BeautifulSoup(response.content, "html.parser")
-            abstract_tag = soup.find("meta", {"name": "DC.description"})
-            if abstract_tag:
-                return abstract_tag.get("content", "Abstract not found.")
-            return "Abstract not found."
+            return document.abstract
         except Exception as e:
             self.log(f"Error fetching abstract: {str(e)}")
             return "Abstract fetch error."
@@ -1153,26 +3970,15 @@ class PatentReportGenerator:
         """
         claim_parts = []
         try:
-            expert_comments_variations = ['Expert Comments', 'Expert/Reviewer Comments', 'Reviewer Comments']
-            claim_start_idx = None
-
-            for variation in expert_comments_variations:
-                try:
-                    claim_start_idx = df[df[0] == variation].index[0] + 1
-                    break
-                except (IndexError, KeyError):
-                    continue
+            table = self.claim_fragments
+            if df is not self.df or table is None:
+                table = ClaimFragmentTable(df, WorkbookLayout(df))
 
-            if claim_start_idx is None:
+            if table.header_row is None:
                 self.log("Error: No Expert/Reviewer Comments row found in Excel file.")
                 return []
 
-            while claim_start_idx < len(df):
-                cell_value = df.iloc[claim_start_idx, 0]
-                if pd.isna(cell_value) or str(cell_value).strip() == "":
-                    break
-                claim_parts.append(str(cell_value).strip())
-                claim_start_idx += 1
+            claim_parts = list(table.block)
         except Exception as e:
             self.log(f"Error extracting claim fragments from Excel: {str(e)}")
         return claim_parts
@@ -1187,34 +3993,14 @@ class PatentReportGenerator:
 
     def get_claim_from_google_patents(self, patent_number, claim_num):
         try:
-            url = f"https://patents.google.com/patent/{patent_number}/en"
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                self.log(f"Failed to fetch claim {claim_num}: HTTP {response.status_code}")
+            document = self.get_patent_document(patent_number)
+            if document.status_code != 200:
+                self.log(f"Failed to fetch claim {claim_num}: HTTP {document.status_code}")
                 return None
-            soup = BeautifulSoup(response.content, "html.parser")
-            claims_div = soup.find("section", itemprop="claims")
-            if not claims_div:
+            if document.claims is None:
                 self.log(f"No claims section found for claim {claim_num}")
                 return None
-            claims_text = claims_div.get_text(separator="\n")
-            claim_lines = claims_text.strip().split("\n")
-            claim_full_text = ""
-            collect = False
-            for line in claim_lines:
-                if re.match(rf"^{claim_num}\.", line.strip()):
-                    collect = True
-                elif re.match(r"^\d+\.", line.strip()) and not line.strip().startswith(f"{claim_num}."):
-                    if collect:
-                        break
-                if collect:
-                    processed_line = re.sub(
-                        r'\bUS(\d{7,})\b',
-                        lambda m: self.format_number_with_commas(m.group(1)),
-                        line.strip()
-                    )
-                    claim_full_text += processed_line + "\n"
-            return claim_full_text.strip()
+            return document.claim_text(claim_num) or ""
         except Exception as e:
             self.log(f"Error fetching claim {claim_num}: {str(e)}")
             return None
@@ -1226,6 +4012,7 @@ class PatentReportGenerator:
         if text:
             run = para.add_run(text)
             run.font.name = 'Inter'
+        self.touch(para)
         return para
 
     def insert_table_after_paragraph(self, doc, table, paragraph):
@@ -1320,33 +4107,6 @@ class PatentReportGenerator:
                 main_para.paragraph_format.space_after = Pt(0)
                 main_para.paragraph_format.space_before = Pt(0)
                 
-                def apply_rich_text_from_excel(paragraph, ws_cell, default_size=9, bold_color=None):
-                    from openpyxl.cell.rich_text import CellRichText, TextBlock
-                    if ws_cell is None or ws_cell.value is None:
-                        return
-                    cell_val = ws_cell.value
-                    if isinstance(cell_val, CellRichText):
-                        for block in cell_val:
-                            if isinstance(block, TextBlock):
-                                text = str(block.text) if block.text else ""
-                                run = paragraph.add_run(text)
-                                run.font.name = 'Inter'
-                                run.font.size = Pt(block.font.size if block.font and block.font.size else default_size)
-                                run.bold = bool(block.font.bold) if block.font else False
-                                run.italic = bool(block.font.italic) if block.font else False
-                                if run.bold and bold_color is not None:
-                                    run.font.color.rgb = bold_color
-                                else:
-                                    run.font.color.rgb = RGBColor(0x00, 0x00, 0x00)
-                            else:
-                                run = paragraph.add_run(str(block))
-                                run.font.name = 'Inter'
-                                run.font.size = Pt(default_size)
-                    elif isinstance(cell_val, str):
-                        run = paragraph.add_run(cell_val)
-                        run.font.name = 'Inter'
-                        run.font.size = Pt(default_size)
-
                 mapping_references = [
                     ref for ref in self.sorted_references
                     if self.should_include_ref_in_mapping(ref)
@@ -1357,12 +4117,8 @@ class PatentReportGenerator:
                 # Filter to only refs that have content for this fragment
                 refs_with_content = []
                 for ref in mapping_references:
-                    if ref.ColIndex is not None and excel_row != -1 and self.ws is not None:
-                        ws_cell = self.ws.cell(row=excel_row + 1, column=ref.ColIndex + 1)
-                        cell_val = ws_cell.value
-                        has_content = cell_val is not None and str(cell_val).strip() not in ('', 'nan')
-                        if has_content:
-                            refs_with_content.append(ref)
+                    if ref.ColIndex is not None and excel_row != -1 and (excel_row, ref.ColIndex) in self.mapping_cells:
+                        refs_with_content.append(ref)
 
                 if refs_with_content:
                     for i, ref in enumerate(refs_with_content):
@@ -1387,9 +4143,9 @@ class PatentReportGenerator:
                         newline_run.font.name = 'Inter'
                         newline_run.font.size = Pt(9)
 
-                        ws_cell = self.ws.cell(row=excel_row + 1, column=ref.ColIndex + 1)
                         claim_color = color_cycle[(self.global_color_index - 1) % 2]
-                        apply_rich_text_from_excel(main_para, ws_cell, default_size=9, bold_color=claim_color)
+                        self.add_excel_runs(main_para, self.mapping_cells[(excel_row, ref.ColIndex)],
+                                            default_size=9, bold_color=claim_color)
 
                         if i < len(refs_with_content) - 1:
                             spacing_run = main_para.add_run("\n")
@@ -1422,6 +4178,25 @@ class PatentReportGenerator:
                 rPr.append(szCs)
                 pPr.append(rPr)
                 self.set_paragraph_default_font(main_para, 'Inter', 9)
+                self.touch(main_para)
+
+    def add_excel_runs(self, paragraph, runs, default_size=9, bold_color=None):
+        """Render rich_text_runs of an Excel cell into paragraph."""
+        for text, font in runs or ():
+            run = paragraph.add_run(text)
+            run.font.name = 'Inter'
+            if font is None:
+                run.font.size = Pt(default_size)
+                continue
+            size, bold, italic = font
+            run.font.size = Pt(size if size else default_size)
+            run.bold = bold
+            run.italic = italic
+            if run.bold and bold_color is not None:
+                run.font.color.rgb = bold_color
+            else:
+                run.font.color.rgb = RGBColor(0x00, 0x00, 0x00)
+        self.touch(paragraph)
 
     def clear_cell_keep_formatting(self, cell):
         """Clear text but keep cell formatting and shading."""
@@ -1435,6 +4210,7 @@ class PatentReportGenerator:
             para = cell.add_paragraph()
             para.paragraph_format.space_after = Pt(0)
             para.paragraph_format.space_before = Pt(0)
+        self.touch(cell)
 
     def set_paragraph_default_font(self, paragraph, font_name='Inter', font_size=9):
         """
@@ -1464,40 +4240,40 @@ class PatentReportGenerator:
         """
         self.log("Extracting patent-at-issue and claims...")
         try:
+            cached = self.cached_extraction
             # Extract patent number using improved extraction method
-            self.PatentAtIssue_Number = self.extract_patent_number(self.df.iloc[1, 0])
+            if cached is not None:
+                self.PatentAtIssue_Number = cached["patent_at_issue"]
+                self.PatentAtIssue_PriorityDate = cached["priority_date"]
+            else:
+                self.PatentAtIssue_Number = self.extract_patent_number(self.df.iloc[1, 0])
+                # Feb10: Excel-displayed priority date, read while the workbook cells are loaded
+                self.PatentAtIssue_PriorityDate = self.format_date(1, 1)
+            # Network work for the abstract and claims overlaps with the rest of the Excel extraction
+            self.prefetch_patent_document(self.PatentAtIssue_Number)
             self.short_patent_name = self.get_short_patent_name_with_suffix(self.PatentAtIssue_Number)
             self.short_patent_name_v2 = self.get_short_patent_name_v2(self.PatentAtIssue_Number)
             self.short_patent_name_lower = self.short_patent_name.replace(" Patent", " patent")
 
             # Look for "Required Claims" row first (new method)
-            required_claims_row_idx = None
-            for idx, row in self.df.iterrows():
-                for col_idx, cell in enumerate(row):
-                    if pd.notna(cell) and 'required claim' in str(cell).strip().lower():
-                        required_claims_row_idx = idx
-                        break
-                if required_claims_row_idx is not None:
-                    break
+            required_claims_row_idx = self.layout.required_claims_row
 
             self.ClaimNumbers = []
-            if required_claims_row_idx is not None:
+            # "All" is answered by Google Patents, so such claim lists are never cached
+            self.claims_from_patent_page = False
+            if cached is not None and cached["claim_numbers"] is not None:
+                self.ClaimNumbers = list(cached["claim_numbers"])
+            elif required_claims_row_idx is not None:
                 claim_input = self.df.iloc[required_claims_row_idx, 1] if len(self.df.columns) > 1 else None
                 if pd.notna(claim_input):
+                    self.claims_from_patent_page = str(claim_input).strip().upper() == "ALL"
                     self.ClaimNumbers = self.parse_claim_numbers(claim_input, self.PatentAtIssue_Number)
 
             # Feb10: FALLBACK – if no "Required Claims" row, derive claims from any Expert/Reviewer Comments header
             if not self.ClaimNumbers:
-                expert_comments_variations = ['Expert Comments', 'Expert/Reviewer Comments', 'Reviewer Comments']
-                expert_comments_row_idx = None
-
-                for variation in expert_comments_variations:
-                    try:
-                        expert_comments_row_idx = self.df[self.df[0] == variation].index[0]
-                        self.log(f"Found '{variation}' row for claim numbers")
-                        break
-                    except (IndexError, KeyError):
-                        continue
+                variation, expert_comments_row_idx = self.layout.first_label_row(EXPERT_COMMENTS_LABELS)
+                if variation is not None:
+                    self.log(f"Found '{variation}' row for claim numbers")
 
                 if expert_comments_row_idx is None:
                     raise RuntimeError("Could not find Expert Comments, Expert/Reviewer Comments, or Reviewer Comments row in Excel")
@@ -1519,17 +4295,22 @@ class PatentReportGenerator:
 
     def extract_search_results(self):
         self.log("Extracting search results...")
+        if self.cached_extraction is not None:
+            search_df, total_hits = self.cached_extraction["search_results"]
+            self.log("Search results extracted.")
+            return search_df.copy(), total_hits
+        search_results = self.read_search_results()
+        # Last extraction step: everything the report reads from the workbook is known now
+        self.store_extracted_workbook(search_results)
+        return search_results
+
+    def read_search_results(self):
+        """(search_df, total_hits) from the table under the 'Database' header."""
         search_results = []
-        database_rows = []
-        for idx, row in self.df.iterrows():
-            for col_idx, cell in enumerate(row):
-                if pd.notna(cell) and str(cell).strip().lower() == 'database':
-                    database_rows.append((idx, col_idx))
-                    break
-        if not database_rows:
+        if self.layout.database_cell is None:
             self.log("No 'Database' header found in Excel.")
             return pd.DataFrame(), 0
-        header_row, header_col = database_rows[0]
+        header_row, header_col = self.layout.database_cell
         if header_col + 3 >= len(self.df.columns):
             self.log("Excel columns insufficient for search results.")
             return pd.DataFrame(), 0
@@ -1568,134 +4349,203 @@ class PatentReportGenerator:
         self.log("Search results extracted.")
         return search_df, total_hits
 
+    def build_reference_table(self, rank_header_row):
+        """
+        Columnar table of the reference grid below the 'Rank' row.
+
+        Rank cells sit every third row from rank_header_row in every column after the
+        first; a column ends at its first empty rank cell. The cells are masked with
+        NumPy and the fields above each hit (publication number at -9 ... URL at -2)
+        are gathered with one fancy-indexing slice per field. Entries are in the
+        column-major order of the original cell-by-cell walk.
+        """
+        grid = self.df.to_numpy(dtype=object)
+        n_rows, n_cols = grid.shape
+        table = {"rank": [], "row": [], "col": [], "related": []}
+        if n_cols < 2 or rank_header_row >= n_rows:
+            return table
+        rank_rows = np.arange(rank_header_row, n_rows, 3)
+        ranks = grid[rank_rows, 1:]
+        # Cells before the first empty rank cell of each column
+        live = ~np.logical_or.accumulate(pd.isna(ranks), axis=0)
+        cols, row_slots = np.nonzero(live.T)
+        for col, slot in zip(cols + 1, row_slots):
+            cell_value = grid[rank_rows[slot], col]
+            rank_text = self.normalize_rank(cell_value)
+            if (
+                self.is_normal_letter_rank(rank_text)
+                or self.is_system_parent_rank(rank_text)
+                or self.is_system_child_rank(rank_text)
+            ):
+                related = False
+            elif rank_text in ['RR', 'RR NPL']:
+                related = True
+                rank_text = str(cell_value)
+            else:
+                continue
+            table["rank"].append(rank_text)
+            table["row"].append(int(rank_rows[slot]))
+            table["col"].append(int(col))
+            table["related"].append(related)
+
+        rows = np.array(table["row"], dtype=np.intp)
+        cols = np.array(table["col"], dtype=np.intp)
+        # Offsets above the rank row; negative rows wrap around like df.iloc does
+        table["in_range"] = (rows - 9 >= -n_rows).tolist()
+        safe_rows = np.where(rows - 9 >= -n_rows, rows, n_rows - 1)
+        for name, offset in (("publication", 9), ("current_assignee", 5), ("original_assignee", 4),
+                             ("title", 3), ("url", 2)):
+            table[name] = grid[safe_rows - offset, cols].tolist()
+        return table
+
     def process_references(self):
         self.log("Processing references...")
         self.top_references = []
         self.related_references = []
 
-        def process_reference(rank_cell, is_related=False):
-            ref = self.Reference()
-            ref.Rank = rank_cell
-            current_row, current_col = rank_cell_coords
-            try:
-                if not is_related:
-                    ref.RawPublicationNumber = str(self.df.iloc[current_row-9, current_col])
-                    ref.PublicationNumber = self.clean_publication_number(self.df.iloc[current_row-9, current_col])
-                    # Feb10: use Excel-displayed dates via row/col indices
-                    ref.PriorityDate = self.format_date(current_row-8, current_col)
-                    ref.FilingDate = self.format_date(current_row-7, current_col)
-                    ref.PublicationDate = self.format_date(current_row-6, current_col)
-                    # Align assignee offsets with notebook: Original at -4, Current at -5 for top refs
-                    ref.OriginalAssignee = str(self.df.iloc[current_row-4, current_col])
-                    ref.CurrentAssignee = str(self.df.iloc[current_row-5, current_col])
-                    ref.Title = str(self.df.iloc[current_row-3, current_col]).strip()
-                    ref.URL = str(self.df.iloc[current_row-2, current_col])
-                    ref.isNPL = False if "patents.google" in ref.URL else True
+        cached = self.cached_extraction
+        if cached is not None:
+            self.top_references = list(cached["top_references"])
+            self.related_references = list(cached["related_references"])
+            self.mapping_cells = cached["mapping_cells"]
+            self.include_other_related_references = len(self.related_references) > 0
+            self.log("References processed.")
+            return
+
+        try:
+            rank_header_row = self.layout.row_of('Rank')
+            if rank_header_row is None:
+                raise IndexError("No 'Rank' row found in Excel")
+            table = self.build_reference_table(rank_header_row)
+            # Feb10: Excel-displayed priority/filing/publication dates (rows -8, -7, -6) in one batch
+            top = [i for i, related in enumerate(table["related"]) if not related and table["in_range"][i]]
+            dates = iter(self.format_dates(
+                (table["row"][i] - offset, table["col"][i]) for i in top for offset in (8, 7, 6)
+            ))
+            for i, rank_text in enumerate(table["rank"]):
+                current_row, current_col = table["row"][i], table["col"][i]
+                if not table["in_range"][i]:
+                    self.log(f"Error processing reference at row {current_row}, col {current_col}: "
+                             "single positional indexer is out-of-bounds")
+                    continue
+                ref = self.Reference()
+                ref.Rank = rank_text
+                ref.URL = str(table["url"][i])
+                ref.isNPL = False if "patents.google" in ref.URL else True
+                ref.Title = str(table["title"][i]).strip()
+                # Align assignee offsets with notebook: Original at -4, Current at -5
+                ref.OriginalAssignee = str(table["original_assignee"][i])
+                ref.CurrentAssignee = str(table["current_assignee"][i])
+                ref.PublicationNumber = self.clean_publication_number(table["publication"][i])
+                ref.ColIndex = current_col
+                if not table["related"][i]:
+                    ref.RawPublicationNumber = str(table["publication"][i])
+                    ref.PriorityDate, ref.FilingDate, ref.PublicationDate = next(dates), next(dates), next(dates)
                     self.top_references.append(ref)
-                    ref.ColIndex = current_col
                 else:
-                    ref.URL = str(self.df.iloc[current_row-2, current_col])
-                    ref.isNPL = False if "patents.google" in ref.URL else True
-                    ref.Title = str(self.df.iloc[current_row-3, current_col]).strip()
-                    ref.OriginalAssignee = str(self.df.iloc[current_row-4, current_col])
-                    ref.CurrentAssignee = str(self.df.iloc[current_row-5, current_col])
-                    ref.PublicationNumber = self.clean_publication_number(self.df.iloc[current_row-9, current_col])
                     self.related_references.append(ref)
-                    ref.ColIndex = current_col
-            except IndexError as e:
-                self.log(f"Error processing reference at row {current_row}, col {current_col}: {str(e)}")
-
-        try:
-            rank_header_row = self.df[self.df[0] == 'Rank'].index[0]
-            current_col = 1
-            while current_col < self.df.shape[1]:
-                current_row = rank_header_row
-                while current_row < self.df.shape[0]:
-                    cell_value = self.df.iloc[current_row, current_col]
-                    if pd.isna(cell_value):
-                        break
-                    rank_text = self.normalize_rank(cell_value)
-                    if (
-                        self.is_normal_letter_rank(rank_text)
-                        or self.is_system_parent_rank(rank_text)
-                        or self.is_system_child_rank(rank_text)
-                    ):
-                        rank_cell_coords = (current_row, current_col)
-                        process_reference(rank_text, is_related=False)
-                    elif rank_text in ['RR', 'RR NPL']:
-                        rank_cell_coords = (current_row, current_col)
-                        process_reference(str(cell_value), is_related=True)
-                    current_row += 3
-                current_col += 1
             self.include_other_related_references = len(self.related_references) > 0
+            self.mapping_cells = self.read_mapping_cells()
             self.log("References processed.")
         except Exception as e:
             self.log(f"Error processing references: {str(e)}")
             raise
 
-    def replace_in_paragraphs_and_tables(self, doc, replacements):
+    def read_mapping_cells(self):
+        """
+        rich_text_runs of every non-empty mapping cell (Expert Comments rows x top reference
+        columns) keyed by df (row, col), so the mapping tables render without the workbook.
+        """
+        cells = {}
+        if self.ws is None or self.claim_fragments is None:
+            return cells
+        columns = sorted({ref.ColIndex for ref in self.top_references if ref.ColIndex is not None})
+        ws_cells = worksheet_cells(self.ws)
+        for row in self.claim_fragments.block_rows:
+            for col in columns:
+                ws_cell = ws_cells.get((row + 1, col + 1))
+                if ws_cell is None:
+                    continue
+                cell_val = ws_cell.value
+                if cell_val is not None and str(cell_val).strip() not in ('', 'nan'):
+                    cells[(row, col)] = rich_text_runs(self.excel_rich_value(ws_cell))
+        return cells
+
+    def store_extracted_workbook(self, search_results):
+        """
+        Cache what the extraction steps read from a freshly parsed workbook (load_excel), as
+        plain data: DataFrames column by column, references as attribute dicts, rich text as
+        run lists. The layout and claim fragments are found again from df on restore.
+        """
+        if self._workbook_cache_key is None or not hasattr(self, "ClaimNumbers") or not hasattr(self, "top_references"):
+            return
+        search_df, total_hits = search_results
         try:
-            for p in doc.paragraphs:
-                for key, val in replacements.items():
-                    if key in p.text:
-                        inline = p.runs
-                        text = "".join(run.text for run in inline)
-                        text = text.replace(key, val)
-                        for i in range(len(inline) - 1, -1, -1):
-                            p.runs[i].text = ""
-                        if not inline:
-                            p.add_run(text)
-                        else:
-                            p.runs[0].text = text
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for p in cell.paragraphs:
-                            for key, val in replacements.items():
-                                if key in p.text:
-                                    inline = p.runs
-                                    text = "".join(run.text for run in inline)
-                                    text = text.replace(key, val)
-                                    for i in range(len(inline) - 1, -1, -1):
-                                        p.runs[i].text = ""
-                                    if not inline:
-                                        p.add_run(text)
-                                    else:
-                                        p.runs[0].text = text
+            entry = {
+                "df": dataframe_to_data(self.df),
+                "matrix": self.matrix.to_data(),
+                "patent_at_issue": self.PatentAtIssue_Number,
+                "priority_date": self.PatentAtIssue_PriorityDate,
+                "claim_numbers": None if self.claims_from_patent_page else list(self.ClaimNumbers),
+                "top_references": [{name: cell_value_to_data(value) for name, value in vars(ref).items()}
+                                   for ref in self.top_references],
+                "related_references": [{name: cell_value_to_data(value) for name, value in vars(ref).items()}
+                                       for ref in self.related_references],
+                "mapping_cells": [[row, col, runs_to_data(runs)] for (row, col), runs in self.mapping_cells.items()],
+                "search_results": {"df": dataframe_to_data(search_df), "total_hits": total_hits},
+            }
         except Exception as e:
-            self.log(f"Error replacing text in paragraphs/tables: {str(e)}")
-
-    def replace_in_textboxes(self, doc, replacements):
+            self.log(f"Note: Workbook data not cached ({str(e)})")
+            entry = None
+        if entry is not None:
+            EXTRACTED_WORKBOOK_CACHE.put(self._workbook_cache_key, entry)
+        self._workbook_cache_key = None
+
+    def restore_extracted_workbook(self, entry):
+        """Set up the state load_excel leaves for the extraction steps from a store_extracted_workbook entry."""
+        def reference(data):
+            ref = self.Reference()
+            ref.__dict__.update({name: cell_value_from_data(value) for name, value in data.items()})
+            return ref
+
+        df = dataframe_from_data(entry["df"])
+        search = entry["search_results"]
+        self.cached_extraction = {
+            "patent_at_issue": entry["patent_at_issue"],
+            "priority_date": entry["priority_date"],
+            "claim_numbers": entry["claim_numbers"],
+            "top_references": [reference(data) for data in entry["top_references"]],
+            "related_references": [reference(data) for data in entry["related_references"]],
+            "mapping_cells": {(row, col): runs_from_data(runs) for row, col, runs in entry["mapping_cells"]},
+            "search_results": (dataframe_from_data(search["df"]), search["total_hits"]),
+        }
+        self.df = df
+        self.layout = WorkbookLayout(df)
+        self.claim_fragments = ClaimFragmentTable(df, self.layout)
+        self.matrix = MatrixSnapshot.from_data(entry["matrix"])
+
+    def replace_placeholders(self, doc, replacements):
+        """
+        Replace every key of replacements in one pass over the document: body paragraphs,
+        table cells at any depth, textboxes, headers and footers. Keys split across runs are
+        found too, and each value is inserted exactly once (values are never searched again).
+        """
         try:
-            parts = [doc.part]
-            for section in doc.sections:
-                try:
-                    if section.header:
-                        parts.append(section.header.part)
-                except Exception:
-                    pass
-                try:
-                    if section.footer:
-                        parts.append(section.footer.part)
-                except Exception:
-                    pass
-            for part in parts:
-                root = part.element
-                tx_nodes = root.xpath(".//*[local-name()='txbxContent']//*[local-name()='t']")
-                for t in tx_nodes:
-                    if t.text:
-                        for key, val in replacements.items():
-                            if key in t.text:
-                                t.text = t.text.replace(key, val)
+            automaton = PlaceholderAutomaton(replacements)
+            for part in document_text_parts(doc):
+                for nodes in paragraph_text_nodes(part.element).values():
+                    if replace_in_text_nodes(nodes, automaton, replacements):
+                        self.touch(nodes[0])
         except Exception as e:
-            self.log(f"Error replacing text in textboxes: {str(e)}")
+            self.log(f"Error replacing placeholders: {str(e)}")
 
     def find_paragraph_with_placeholder(self, doc, placeholder):
         try:
-            for p in doc.paragraphs:
-                if placeholder in p.text:
-                    return p
-            for table in doc.tables:
+            view = self.document_view(doc)
+            paragraph = view.find(placeholder, case_sensitive=True)
+            if paragraph is not None:
+                return paragraph
+            for table in view.tables():
                 for row in table.rows:
                     for cell in row.cells:
                         for p in cell.paragraphs:
@@ -1709,7 +4559,7 @@ class PatentReportGenerator:
 
     def find_table_with_placeholder(self, doc, placeholder):
         try:
-            for table in doc.tables:
+            for table in self.document_view(doc).tables():
                 for row in table.rows:
                     for cell in row.cells:
                         if any(placeholder in p.text for p in cell.paragraphs):
@@ -1750,6 +4600,7 @@ class PatentReportGenerator:
                     r.text = ""
                 if len(p.runs) == 0:
                     p.add_run("")
+            self.touch(cell)
         except Exception as e:
             self.log(f"Error clearing cell: {str(e)}")
 
@@ -1764,6 +4615,7 @@ class PatentReportGenerator:
             run.bold = bold
             if color_rgb:
                 run.font.color.rgb = color_rgb
+            self.touch(cell)
         except Exception as e:
             self.log(f"Error setting cell text: {str(e)}")
 
@@ -1797,6 +4649,7 @@ class PatentReportGenerator:
             run_element.append(text_element)
             hyperlink.append(run_element)
             paragraph._p.append(hyperlink)
+            self.touch(paragraph)
         except Exception as e:
             self.log(f"Error adding hyperlink to paragraph: {str(e)}")
 
@@ -1847,8 +4700,7 @@ class PatentReportGenerator:
 
           # Use target_doc: gen_doc for update mode, doc otherwise
           target_doc = self.get_target_doc("title")
-          self.replace_in_textboxes(target_doc, title_replacements)
-          self.replace_in_paragraphs_and_tables(target_doc, title_replacements)
+          self.replace_placeholders(target_doc, title_replacements)
           self.log("Title page processed.")
       except Exception as e:
           self.log(f"Error processing title page: {str(e)}")
@@ -1900,10 +4752,12 @@ class PatentReportGenerator:
                     )
                     run1.font.name = "Inter"
                     run1.font.size = Pt(10)
+                self.touch(obj_para)
 
             ref_anchor = self.find_paragraph_with_placeholder(target_doc, "[REFERENCE_LIST]")
             if ref_anchor:
                 ref_anchor.text = ""
+                self.touch(ref_anchor)
 
                 numbering_part = target_doc.part.numbering_part
                 if numbering_part is None:
@@ -2083,11 +4937,7 @@ class PatentReportGenerator:
                           self.find_table_with_placeholder(target_doc, "[REF_OWNER]")
                 if table_rr:
                     # Check if an ORR heading exists anywhere; if so, skip generating another heading
-                    other_refs_heading = None
-                    for paragraph in target_doc.paragraphs:
-                        if "other related references" in paragraph.text.lower():
-                            other_refs_heading = paragraph
-                            break
+                    other_refs_heading = self.document_view(target_doc).find("other related references")
                     if other_refs_heading:
                         # Page break before existing ORR heading
                         self.add_page_break_before_paragraph(target_doc, other_refs_heading)
@@ -2224,11 +5074,7 @@ class PatentReportGenerator:
                     self.log("Warning: Other related references table not found.")
             else:
                 # No related references: keep section and show message (match notebook behavior)
-                other_refs_heading = None
-                for paragraph in target_doc.paragraphs:
-                    if "other related references" in paragraph.text.lower():
-                        other_refs_heading = paragraph
-                        break
+                other_refs_heading = self.document_view(target_doc).find("other related references")
 
                 if other_refs_heading:
                     # Add page break before the heading to start section on a new page
@@ -2270,8 +5116,8 @@ class PatentReportGenerator:
                 patent_display_text = self.PatentAtIssue_Number
             
             assignee_display = str(self.df.iloc[1, 3]) if pd.notna(self.df.iloc[1, 3]) else ""
-            # Feb10: use Excel-displayed date for priority using row/col indices
-            priority_display = self.format_date(1, 1)
+            # Feb10: Excel-displayed priority date, kept with the extracted workbook data
+            priority_display = self.PatentAtIssue_PriorityDate
 
             abstract_text = self.fetch_abstract(self.PatentAtIssue_Number)
             abstract_text = abstract_text.lstrip()
@@ -2282,7 +5128,7 @@ class PatentReportGenerator:
                 "[PATENT_AT_ISSUE_PRIORITY_DATE]": f"Earliest Priority Date: {priority_display}",
                 "[PATENT_AT_ISSUE_ABSTRACT]": abstract_text,
             }
-            self.replace_in_paragraphs_and_tables(target_doc, patent_replacements)
+            self.replace_placeholders(target_doc, patent_replacements)
             self.log("Patent-at-issue section processed.")
         except Exception as e:
             self.log(f"Error processing patent-at-issue section: {str(e)}")
@@ -2329,7 +5175,8 @@ class PatentReportGenerator:
             # Extract and preserve criteria section from edited document
             if self.update_mode:
                 self.log("DEBUG: In update mode, extracting criteria section...")
-                preserved_criteria_elements = extract_criteria_section(self.edited_doc)
+                preserved_criteria_elements = extract_criteria_section(
+                    self.edited_doc, self.section_index(self.edited_doc) if self.edited_doc else None)
             else:
                 self.log("DEBUG: Not in update mode, skipping criteria extraction")
                 preserved_criteria_elements = []
@@ -2373,11 +5220,13 @@ class PatentReportGenerator:
             #         empty_para.paragraph_format.space_before = Pt(0)
             #         break
             
-            self.replace_in_paragraphs_and_tables(self.doc, {
+            # Located before the placeholder is replaced, while it still holds the token
+            criteria_anchor = self.find_paragraph_with_placeholder(self.doc, "[CRITERIA_TEXT]")
+            self.replace_placeholders(self.doc, {
                 "[CRITERIA_TEXT]": criteria_intro,
                 "[CRITERIA_CLAIM/S]": ""
             })
-            criteria_anchor = self.find_paragraph_with_placeholder(self.doc, "[CRITERIA_TEXT]") or self.find_paragraph_with_placeholder(self.doc, criteria_intro)
+            criteria_anchor = criteria_anchor or self.find_paragraph_with_placeholder(self.doc, criteria_intro)
             if criteria_anchor:
                 for run in criteria_anchor.runs:
                     run.bold = True
@@ -2396,11 +5245,7 @@ class PatentReportGenerator:
                 if criteria_anchor:
                     # First, find a new anchor point before the criteria section
                     # Look for the paragraph that contains "CRITERIA FOR THE PUBLICATION SEARCH" heading
-                    new_anchor = None
-                    for p in self.doc.paragraphs:
-                        if "criteria for the publication search" in p.text.lower():
-                            new_anchor = p
-                            break
+                    new_anchor = self.document_view(self.doc).find("criteria for the publication search")
 
                     if new_anchor:
                         # Remove the criteria anchor paragraph (which contains the generated claims text)
@@ -2483,22 +5328,7 @@ class PatentReportGenerator:
                             fragments_to_use = claim_parts if claim_parts else [web_scraped_claim]
                         else:
                             # Extract claim fragments for the specific ClaimNumber from Excel (June 16)
-                            all_fragments = self.extract_claim_fragments_from_excel(self.df)
-                            fragments_to_use = []
-                            collecting = False
-
-                            for frag in all_fragments:
-                                frag = str(frag).strip()
-
-                                if re.match(rf"^{re.escape(str(ClaimNumber))}\.", frag):
-                                    collecting = True
-                                    fragments_to_use.append(frag)
-
-                                elif collecting and re.match(r"^\d+\.", frag):
-                                    break
-
-                                elif collecting:
-                                    fragments_to_use.append(frag)
+                            fragments_to_use, _ = self.claim_fragments.fragments(ClaimNumber)
 
                         # Merge fragments around "claim X" references
                         merged_fragments = merge_claim_fragments(fragments_to_use)
@@ -2529,6 +5359,7 @@ class PatentReportGenerator:
                     else:
                         criteria_anchor.text = ""
                         self.log("Warning: No criteria text found in Excel for FTO report.")
+                    self.touch(criteria_anchor)
                 else:
                     self.log("Warning: [CRITERIA_CLAIM/S] placeholder not found for FTO report.")
             self.log("Criteria section processed.")
@@ -2539,11 +5370,11 @@ class PatentReportGenerator:
     def find_mapping_tables(self, doc):
         try:
             tables = []
-            for t in doc.tables:
+            for t in self.document_view(doc).tables():
                 header_no = None
                 for cell in t.rows[0].cells:
                     for p in cell.paragraphs:
-                        m = re.search(r"\[CLAIM_HEADER(\d+)\]", p.text)
+                        m = _CLAIM_HEADER_RE.search(p.text)
                         if m:
                             header_no = int(m.group(1))
                             break
@@ -2597,6 +5428,7 @@ class PatentReportGenerator:
                             r.bold = True
                             r.font.name = 'Inter'
                             r.font.size = Pt(10)
+            self.touch(table)
         except Exception as e:
             self.log(f"Error updating table headers: {str(e)}")
 
@@ -2622,42 +5454,14 @@ class PatentReportGenerator:
             r = p.add_run("")
             r.font.name = 'Inter'
             r.font.size = Pt(10)
+            self.touch(cell)
         except Exception as e:
             self.log(f"Error clearing cell strictly: {str(e)}")
 
     def get_claim_fragments_for_claim(self, claim_number):
         try:
-            # Feb10: support multiple possible Expert/Reviewer Comments header labels
-            expert_comments_variations = ['Expert Comments', 'Expert/Reviewer Comments', 'Reviewer Comments']
-            claim_start_idx = None
-            for variation in expert_comments_variations:
-                try:
-                    claim_start_idx = self.df[self.df[0] == variation].index[0] + 1
-                    break
-                except (IndexError, KeyError):
-                    continue
-
-            claim_fragments = []
-            fragment_rows = []
-            if claim_start_idx is not None:
-                current_idx = claim_start_idx
-                found_claim = False
-
-                while current_idx < len(self.df):
-                    cell_value = self.df.iloc[current_idx, 0]
-                    if pd.isna(cell_value) or str(cell_value).strip() == "":
-                        break
-                    cell_str = str(cell_value).strip()
-                    if re.match(rf"^{claim_number}\.", cell_str):
-                        found_claim = True
-                        claim_fragments.append(cell_str)
-                        fragment_rows.append(current_idx)
-                    elif found_claim and re.match(r"^\d+\.", cell_str):
-                        break
-                    elif found_claim:
-                        claim_fragments.append(cell_str)
-                        fragment_rows.append(current_idx)
-                    current_idx += 1
+            # Feb10: any Expert/Reviewer Comments header label; split by claim at load
+            claim_fragments, fragment_rows = self.claim_fragments.fragments(claim_number)
 
             if not claim_fragments:
                 web_scraped = self.get_claim_from_google_patents(self.PatentAtIssue_Number, claim_number)
@@ -2709,33 +5513,6 @@ class PatentReportGenerator:
             ClaimNumbers = self.ClaimNumbers
             claim_word = self.claim_word
 
-            def apply_rich_text_from_excel(paragraph, ws_cell, default_size=9, bold_color=None):
-                from openpyxl.cell.rich_text import CellRichText, TextBlock
-                if ws_cell is None or ws_cell.value is None:
-                    return
-                cell_val = ws_cell.value
-                if isinstance(cell_val, CellRichText):
-                    for block in cell_val:
-                        if isinstance(block, TextBlock):
-                            text = str(block.text) if block.text else ""
-                            run = paragraph.add_run(text)
-                            run.font.name = 'Inter'
-                            run.font.size = Pt(block.font.size if block.font and block.font.size else default_size)
-                            run.bold = bool(block.font.bold) if block.font else False
-                            run.italic = bool(block.font.italic) if block.font else False
-                            if run.bold and bold_color is not None:
-                                run.font.color.rgb = bold_color
-                            else:
-                                run.font.color.rgb = RGBColor(0x00, 0x00, 0x00)
-                        else:
-                            run = paragraph.add_run(str(block))
-                            run.font.name = 'Inter'
-                            run.font.size = Pt(default_size)
-                elif isinstance(cell_val, str):
-                    run = paragraph.add_run(cell_val)
-                    run.font.name = 'Inter'
-                    run.font.size = Pt(default_size)
-
             def remove_table_column(table, col_idx):
                 """Remove a column from a python-docx table by index."""
                 for row in table.rows:
@@ -2828,87 +5605,6 @@ class PatentReportGenerator:
                     shd.set(qn('w:fill'), fill_hex)
                     tcPr.append(shd)
 
-            def excel_color_to_hex(excel_color):
-                if excel_color is None:
-                    return None
-                rgb_hex = None
-                try:
-                    if excel_color.type == "rgb" and excel_color.rgb:
-                        rgb_hex = str(excel_color.rgb)[-6:]
-                    elif excel_color.type == "indexed" and excel_color.indexed is not None:
-                        from openpyxl.styles.colors import COLOR_INDEX
-                        indexed_rgb = COLOR_INDEX[int(excel_color.indexed)]
-                        rgb_hex = str(indexed_rgb)[-6:]
-                    elif excel_color.type == "theme" and excel_color.theme is not None:
-                        rgb_hex = get_theme_rgb(excel_color.theme)
-                        rgb_hex = apply_tint_to_rgb(rgb_hex, getattr(excel_color, "tint", 0))
-                except Exception:
-                    rgb_hex = None
-                if not rgb_hex or len(rgb_hex) != 6:
-                    return None
-                return rgb_hex.upper()
-
-            def get_theme_rgb(theme_index):
-                try:
-                    import xml.etree.ElementTree as ET
-                    theme_xml = getattr(wb, "loaded_theme", None)
-                    if not theme_xml:
-                        return None
-                    root = ET.fromstring(theme_xml)
-                    ns = {"a": "http://schemas.openxmlformats.org/drawingml/2006/main"}
-                    clr_scheme = root.find(".//a:clrScheme", ns)
-                    if clr_scheme is None:
-                        return None
-                    theme_order = [
-                        "lt1", "dk1", "lt2", "dk2", "accent1", "accent2",
-                        "accent3", "accent4", "accent5", "accent6", "hlink", "folHlink"
-                    ]
-                    if int(theme_index) < 0 or int(theme_index) >= len(theme_order):
-                        return None
-                    node = clr_scheme.find(f"a:{theme_order[int(theme_index)]}", ns)
-                    if node is None:
-                        return None
-                    srgb = node.find(".//a:srgbClr", ns)
-                    if srgb is not None and srgb.get("val"):
-                        return srgb.get("val")[-6:]
-                    sysclr = node.find(".//a:sysClr", ns)
-                    if sysclr is not None and sysclr.get("lastClr"):
-                        return sysclr.get("lastClr")[-6:]
-                except Exception:
-                    return None
-                return None
-
-            def apply_tint_to_rgb(rgb_hex, tint):
-                if rgb_hex is None:
-                    return None
-                rgb_hex = rgb_hex[-6:]
-                if tint is None:
-                    tint = 0
-                try:
-                    tint = float(tint)
-                except Exception:
-                    tint = 0
-                result = []
-                for i in range(0, 6, 2):
-                    channel = int(rgb_hex[i:i+2], 16)
-                    if tint < 0:
-                        channel = int(channel * (1.0 + tint))
-                    else:
-                        channel = int(channel + (255 - channel) * tint)
-                    channel = max(0, min(255, channel))
-                    result.append(f"{channel:02X}")
-                return "".join(result)
-
-            def excel_fill_to_hex(cell):
-                if cell is None or cell.fill is None:
-                    return None
-                try:
-                    if cell.fill.fill_type != "solid":
-                        return None
-                    return excel_color_to_hex(cell.fill.fgColor)
-                except Exception:
-                    return None
-
             def clear_paragraph_pagination_constraints(paragraph):
                 try:
                     paragraph.paragraph_format.keep_with_next = False
@@ -2963,69 +5659,33 @@ class PatentReportGenerator:
                             allow_table_to_break_across_pages(current_table)
 
             def populate_key_concepts_table_from_matrix(doc_obj):
-                matrix_ws = None
-                for sheet_name in wb.sheetnames:
-                    if sheet_name.strip().lower() == "matrix":
-                        matrix_ws = wb[sheet_name]
-                        break
-                if matrix_ws is None:
+                # Read from the Matrix sheet in one pass when the workbook was loaded
+                matrix = self.matrix if self.matrix is not None else MatrixSnapshot(wb, rich_value=self.excel_rich_value)
+                if matrix.title is None:
                     print("⚠ No Matrix sheet found. Skipping Key Concepts table.")
                     return
 
-                # Reference column headers are in ROW 2 (not row 1)
-                # Dynamically find "A" in row 2, then collect consecutive headers from there
-                reference_cols = []
-                ref_start_col = None
-
-                for scan_col in range(1, matrix_ws.max_column + 1):
-                    cell_val = matrix_ws.cell(row=2, column=scan_col).value
-                    if cell_val is not None and str(cell_val).strip().upper() == "A":
-                        ref_start_col = scan_col
-                        break
-
+                # Reference column headers are in ROW 2 (not row 1), starting at the "A" header
+                ref_start_col = matrix.reference_start_col
                 if ref_start_col is None:
                     print("⚠ Could not find 'A' header in row 2 of Matrix sheet. Skipping Key Concepts table.")
                     return
+                reference_cols = list(matrix.reference_cols)
 
-                col_idx = ref_start_col
-                while col_idx <= matrix_ws.max_column:
-                    header_value = matrix_ws.cell(row=2, column=col_idx).value
-                    if header_value is None or str(header_value).strip() == "":
-                        break
-                    reference_cols.append(col_idx)
-                    col_idx += 1
-
-                print(f"✓ Found reference headers in row 2, starting col={ref_start_col}: {[matrix_ws.cell(row=2, column=c).value for c in reference_cols]}")
+                print(f"✓ Found reference headers in row 2, starting col={ref_start_col}: {list(matrix.headers)}")
 
-                # Find "Key Concept" column dynamically
                 key_concept_col = None
                 key_concept_data_start_row = None
-
-                for scan_row in range(1, matrix_ws.max_row + 1):
-                    for scan_col in range(1, matrix_ws.max_column + 1):
-                        cell_val = matrix_ws.cell(row=scan_row, column=scan_col).value
-                        if cell_val and str(cell_val).strip().lower() in ("key concept", "key concepts"):
-                            key_concept_col = scan_col
-                            key_concept_data_start_row = scan_row + 1
-                            print(f"✓ Found 'Key Concept' column at col={scan_col}, data starts at row={scan_row + 1}")
-                            break
-                    if key_concept_col is not None:
-                        break
+                if matrix.key_concept_cell is not None:
+                    key_concept_row, key_concept_col = matrix.key_concept_cell
+                    key_concept_data_start_row = key_concept_row + 1
+                    print(f"✓ Found 'Key Concept' column at col={key_concept_col}, data starts at row={key_concept_data_start_row}")
 
                 if key_concept_col is None:
                     print("⚠ Could not find 'Key Concept' column in Matrix sheet. Skipping Key Concepts table.")
                     return
 
-                # Collect concept rows dynamically
-                concept_rows = []
-                row_idx = key_concept_data_start_row
-                while row_idx <= matrix_ws.max_row:
-                    concept_cell = matrix_ws.cell(row=row_idx, column=key_concept_col)
-                    concept_value = concept_cell.value
-                    if concept_value is None or str(concept_value).strip() == "":
-                        break
-                    concept_rows.append(row_idx)
-                    row_idx += 1
+                concept_rows = matrix.concept_rows
 
                 table = find_key_concepts_table(doc_obj)
                 if table is None:
@@ -3066,8 +5726,7 @@ class PatentReportGenerator:
                     if c_idx == 0:
                         label = "Key Concepts"
                     else:
-                        matrix_col_idx = reference_cols[c_idx - 1]
-                        header_val = matrix_ws.cell(row=2, column=matrix_col_idx).value
+                        header_val = matrix.headers[c_idx - 1]
                         label = str(header_val).strip() if header_val else chr(ord('A') + c_idx - 1)
                     run = p.add_run(label)
                     run.font.name = "Inter"
@@ -3075,21 +5734,21 @@ class PatentReportGenerator:
                     run.bold = True
 
                 # Body rows - concept from Column D, colors from columns F onward
-                for out_row_idx, matrix_row_idx in enumerate(concept_rows, start=1):
+                for out_row_idx, concept_runs in enumerate(matrix.concepts, start=1):
                     row = table.rows[out_row_idx]
 
                     concept_cell = row.cells[0]
                     p = clear_word_cell_content(concept_cell)
                     p.paragraph_format.space_before = Pt(0)
                     p.paragraph_format.space_after = Pt(0)
-                    apply_rich_text_from_excel(p, matrix_ws.cell(row=matrix_row_idx, column=key_concept_col))
+                    self.add_excel_runs(p, concept_runs)
 
-                    for out_col_idx, matrix_col_idx in enumerate(reference_cols, start=1):
+                    for out_col_idx in range(1, len(reference_cols) + 1):
                         word_cell = row.cells[out_col_idx]
                         clear_word_cell_content(word_cell)
-                        fill_hex = excel_fill_to_hex(matrix_ws.cell(row=matrix_row_idx, column=matrix_col_idx))
-                        set_word_cell_shading(word_cell, fill_hex)
+                        set_word_cell_shading(word_cell, matrix.fill(out_row_idx - 1, out_col_idx - 1))
 
+                self.touch(table)
                 set_table_autofit_to_window(table)
                 set_key_concepts_column_widths(table, doc_obj, 3.0)
                 set_repeating_header_row(table)
@@ -3097,29 +5756,21 @@ class PatentReportGenerator:
 
             #Feb16: Process Mappings Overview placeholder
             mappings_overview_text = f"{self.claim_word} {self.format_claims_as_ranges(self.ClaimNumbers)} of the {self.short_patent_name_lower}"
-            self.replace_in_paragraphs_and_tables(self.doc, {
+            self.replace_placeholders(self.doc, {
                 "[MAPPINGS_OVERVIEW]": mappings_overview_text
             })
             if self.gen_doc and self.gen_doc != self.doc:
-                self.replace_in_paragraphs_and_tables(self.gen_doc, {
+                self.replace_placeholders(self.gen_doc, {
                     "[MAPPINGS_OVERVIEW]": mappings_overview_text
                 })
 
             # Diagnostics: capture section indices before any changes
             try:
-                def _idx_of(text):
-                    from docx.text.paragraph import Paragraph as _Paragraph
-                    body = self.doc.element.body
-                    for i, el in enumerate(list(body)):
-                        if el.tag.endswith('p'):
-                            p = _Paragraph(el, self.doc)
-                            if text.lower() in (p.text or '').lower():
-                                return i
-                    return None
-                criteria_idx_pre = _idx_of('criteria for the publication search')
-                mappings_idx_pre = _idx_of('mappings based on selected references')
-                about_idx_pre = _idx_of('about us')
-                disclaimer_idx_pre = _idx_of('disclaimer')
+                index = self.section_index(self.doc)
+                criteria_idx_pre = index.index_of('criteria for the publication search')
+                mappings_idx_pre = index.index_of('mappings based on selected references')
+                about_idx_pre = index.index_of('about us')
+                disclaimer_idx_pre = index.index_of('disclaimer')
                 self.log(f"DEBUG: [pre-mappings] indices → criteria={criteria_idx_pre}, mappings={mappings_idx_pre}, about={about_idx_pre}, disclaimer={disclaimer_idx_pre}")
             except Exception:
                 pass
@@ -3138,7 +5789,8 @@ class PatentReportGenerator:
             # Extract and preserve mapping section from edited document
             if self.update_mode:
                 self.log("DEBUG: In update mode, extracting mapping section...")
-                preserved_mapping_elements = extract_mapping_section(self.edited_doc)
+                preserved_mapping_elements = extract_mapping_section(
+                    self.edited_doc, self.section_index(self.edited_doc) if self.edited_doc else None)
             else:
                 self.log("DEBUG: Not in update mode, skipping mapping extraction")
                 preserved_mapping_elements = []
@@ -3158,25 +5810,27 @@ class PatentReportGenerator:
                 # Find the last paragraph that was processed in the criteria section
                 # Look for the criteria anchor or the last paragraph before mappings
                 self.last_inserted_para = None
+                view = self.document_view(self.doc)
+                paragraphs = view.paragraphs()
                 if not self.update_mode:
                     # Look for criteria section by searching for common patterns
-                    for p in self.doc.paragraphs:
-                        text_lower = p.text.lower().strip()
+                    for p in paragraphs:
+                        text_lower = view.read(p).lower().strip()
                         if any(pattern in text_lower for pattern in ["criteria for the publication search", "criteria for publication search", "criteria"]):
                             self.last_inserted_para = p
                             break
                 else:
                     # In update mode, look for the last paragraph in the document
-                    for p in reversed(self.doc.paragraphs):
-                        text_lower = p.text.lower().strip()
+                    for p in reversed(paragraphs):
+                        text_lower = view.read(p).lower().strip()
                         # Skip if it's a heading or placeholder
                         if not any(keyword in text_lower for keyword in ["mappings based", "criteria for the", "disclaimer", "appendix"]):
                             self.last_inserted_para = p
                             break
 
                 # If not found, use the last paragraph in the document
-                if self.last_inserted_para is None and self.doc.paragraphs:
-                    self.last_inserted_para = self.doc.paragraphs[-1]
+                if self.last_inserted_para is None and paragraphs:
+                    self.last_inserted_para = paragraphs[-1]
 
             # If we have preserved elements, replace the generated Mapping section with them
             if self.update_mode and preserved_mapping_elements:
@@ -3184,35 +5838,20 @@ class PatentReportGenerator:
                 self.log("DEBUG: Removing existing mapping section...")
                 # Remove from "Mappings Based" to just before "Disclaimer" (don't remove the disclaimer itself)
                 # Find the disclaimer paragraph first to know where to stop
-                disclaimer_para = None
-                for p in self.doc.paragraphs:
-                    if "disclaimer" in p.text.lower():
-                        disclaimer_para = p
-                        break
-                
-                if disclaimer_para:
+                index = self.section_index(self.doc)
+                disclaimer_el = index.first("disclaimer")
+
+                if disclaimer_el is not None:
                     # Remove from "Mappings Based" up to but not including the disclaimer paragraph
-                    body = self.doc.element.body
-                    elems_to_remove = []
-                    remove_started = False
-                    for child in list(body):
-                        if child.tag == qn('w:p'):
-                            p = Paragraph(child, self.doc)
-                            text_lower = p.text.lower().strip()
-                            if "mappings based on selected references" in text_lower:
-                                remove_started = True
-                                elems_to_remove.append(child)
-                                continue
-                        if remove_started:
-                            if child == disclaimer_para._element:
-                                break  # Stop before removing the disclaimer
-                            elems_to_remove.append(child)
-                    for el in elems_to_remove:
-                        body.remove(el)
+                    mappings_el = index.first("mappings based on selected references")
+                    if mappings_el is not None:
+                        # Stop before removing the disclaimer
+                        end = disclaimer_el if index.position(disclaimer_el) > index.position(mappings_el) else None
+                        index.remove([mappings_el] + index.section(mappings_el, end))
                     self.log("DEBUG: Mapping section removal completed")
                 else:
                     # Fallback to original method
-                    remove_section(self.doc, "mappings based on selected references", "disclaimer")
+                    remove_section(self.doc, "mappings based on selected references", "disclaimer", index)
                     self.log("DEBUG: Mapping section removal completed (fallback)")
                 current_anchor = self.last_inserted_para
                 if isinstance(current_anchor, Table):
@@ -3225,15 +5864,12 @@ class PatentReportGenerator:
                 self.log(f"DEBUG: Number of mapping elements to insert: {len(preserved_mapping_elements)}")
                 
                 # Find mappings header and insert blank line after it in update mode
-                mappings_header = None
-                for p in self.doc.paragraphs:
-                    if "mappings based on selected references" in p.text.lower():
-                        mappings_header = p
-                        # Insert an empty paragraph after the mappings header
-                        empty_para_after_header = self.insert_paragraph_after(p, "")
-                        empty_para_after_header.paragraph_format.space_after = Pt(0)
-                        empty_para_after_header.paragraph_format.space_before = Pt(0)
-                        break
+                mappings_header = self.document_view(self.doc).find("mappings based on selected references")
+                if mappings_header is not None:
+                    # Insert an empty paragraph after the mappings header
+                    empty_para_after_header = self.insert_paragraph_after(mappings_header, "")
+                    empty_para_after_header.paragraph_format.space_after = Pt(0)
+                    empty_para_after_header.paragraph_format.space_before = Pt(0)
                 
                 # Add page break before inserting preserved mapping elements
                 # page_break_para = self.doc.add_paragraph()
@@ -3323,7 +5959,7 @@ class PatentReportGenerator:
                             last_table = new_table
                 else:  # FTO
                     mapping_table = None
-                    for t in self.doc.tables:
+                    for t in self.document_view(self.doc).tables():
                         for row in t.rows:
                             if len(row.cells) >= 2:
                                 left_has = any("[CLAIM_ELEMENT]" in p.text for p in row.cells[0].paragraphs)
@@ -3382,6 +6018,7 @@ class PatentReportGenerator:
                                     placeholder_run = main_para.add_run("\n")
                                     placeholder_run.font.name = 'Inter'
                                     placeholder_run.font.size = Pt(9)
+                        self.touch(mapping_table)
                     else:
                         self.log("Warning: No criteria fragments found for FTO mapping table.")
 
@@ -3396,11 +6033,7 @@ class PatentReportGenerator:
             if self.update_mode:
                 # In Update mode: force placement immediately after the header,
                 # with a blank paragraph before and after the intro paragraph.
-                mappings_header = None
-                for p in self.doc.paragraphs:
-                    if "mappings based on selected references" in p.text.lower():
-                        mappings_header = p
-                        break
+                mappings_header = self.document_view(self.doc).find("mappings based on selected references")
                 if mappings_header is not None:
                     # Blank before intro
                     pre_blank = self.insert_paragraph_after(mappings_header, "")
@@ -3418,33 +6051,18 @@ class PatentReportGenerator:
 
                     # Remove any duplicate mappings intro paragraphs between the mappings header and disclaimer
                     try:
-                        body = self.doc.element.body
+                        index = self.section_index(self.doc)
                         keyphrase = "these are the mappings of the elements"
-                        disclaimer_el = None
-                        # Find disclaimer paragraph element
-                        for child in list(body):
-                            if child.tag == qn('w:p'):
-                                p = Paragraph(child, self.doc)
-                                if "disclaimer" in (p.text or "").lower():
-                                    disclaimer_el = child
-                                    break
-                        remove_started = False
-                        to_remove = []
-                        for child in list(body):
-                            if child.tag == qn('w:p'):
-                                p = Paragraph(child, self.doc)
-                                text_lower = (p.text or "").lower().strip()
-                                if not remove_started and "mappings based on selected references" in text_lower:
-                                    remove_started = True
-                                    continue
-                                if remove_started:
-                                    if disclaimer_el is not None and child is disclaimer_el:
-                                        break
-                                    # Mark duplicates that are not the freshly inserted intro paragraph
-                                    if keyphrase in text_lower and child is not intro_para._p:
-                                        to_remove.append(child)
-                        for el in to_remove:
-                            body.remove(el)
+                        header_el = index.first("mappings based on selected references")
+                        disclaimer_el = index.first("disclaimer")
+                        if header_el is not None:
+                            if disclaimer_el is not None and index.position(disclaimer_el) <= index.position(header_el):
+                                disclaimer_el = None
+                            # Mark duplicates that are not the freshly inserted intro paragraph
+                            index.remove([
+                                child for child in index.section(header_el, disclaimer_el)
+                                if keyphrase in (index.lower(child) or "") and child is not intro_para._p
+                            ])
                     except Exception:
                         pass
                 else:
@@ -3452,6 +6070,7 @@ class PatentReportGenerator:
                     mappings_paragraph = self.find_paragraph_with_placeholder(self.doc, "[MAPPINGS_PARAGRAPH]")
                     if mappings_paragraph:
                         mappings_paragraph.text = para_text
+                        self.touch(mappings_paragraph)
                         self.apply_font_style(mappings_paragraph)
                         # Add surrounding blanks
                         pre_blank = self.insert_paragraph_after(mappings_paragraph, "")
@@ -3467,13 +6086,10 @@ class PatentReportGenerator:
                 mappings_paragraph = self.find_paragraph_with_placeholder(self.doc, "[MAPPINGS_PARAGRAPH]")
                 if mappings_paragraph:
                     mappings_paragraph.text = para_text
+                    self.touch(mappings_paragraph)
                     self.apply_font_style(mappings_paragraph)
                 else:
-                    mappings_header = None
-                    for p in self.doc.paragraphs:
-                        if "mappings based on selected references" in p.text.lower():
-                            mappings_header = p
-                            break
+                    mappings_header = self.document_view(self.doc).find("mappings based on selected references")
                     if mappings_header is not None:
                         intro_para = self.insert_paragraph_after(mappings_header, para_text)
                         self.apply_font_style(intro_para)
@@ -3482,19 +6098,11 @@ class PatentReportGenerator:
             self.log("Mappings section processed.")
             # Diagnostics: capture section indices after changes
             try:
-                def _idx_of2(text):
-                    from docx.text.paragraph import Paragraph as _Paragraph
-                    body = self.doc.element.body
-                    for i, el in enumerate(list(body)):
-                        if el.tag.endswith('p'):
-                            p = _Paragraph(el, self.doc)
-                            if text.lower() in (p.text or '').lower():
-                                return i
-                    return None
-                criteria_idx_post = _idx_of2('criteria for the publication search')
-                mappings_idx_post = _idx_of2('mappings based on selected references')
-                about_idx_post = _idx_of2('about us')
-                disclaimer_idx_post = _idx_of2('disclaimer')
+                index = self.section_index(self.doc)
+                criteria_idx_post = index.index_of('criteria for the publication search')
+                mappings_idx_post = index.index_of('mappings based on selected references')
+                about_idx_post = index.index_of('about us')
+                disclaimer_idx_post = index.index_of('disclaimer')
                 self.log(f"DEBUG: [post-mappings] indices → criteria={criteria_idx_post}, mappings={mappings_idx_post}, about={about_idx_post}, disclaimer={disclaimer_idx_post}")
             except Exception:
                 pass
@@ -3510,7 +6118,7 @@ class PatentReportGenerator:
           
           self.search_results_df, self.total_search_hits = self.extract_search_results()
           if not self.search_results_df.empty:
-              self.replace_in_paragraphs_and_tables(target_doc, {"[HITS_TOTAL]": f"{self.total_search_hits:,}"})
+              self.replace_placeholders(target_doc, {"[HITS_TOTAL]": f"{self.total_search_hits:,}"})
               self.search_results_df['Database_norm'] = self.search_results_df['Database'].astype(str).str.strip().str.lower()
               typo_map = {
                   "gogle patents": "google patents",
@@ -3655,6 +6263,7 @@ class PatentReportGenerator:
                                   run = para.add_run(part)
                                   run.font.name = 'Inter'
                                   run.font.size = Pt(9)
+                      self.touch(para)
                   if len(self.search_results_df) > 0:
                       first = self.search_results_df.iloc[0]
                       self.set_cell_text(template_row.cells[0], str(first['S/No']), size=9, bold=True)
@@ -3702,11 +6311,7 @@ class PatentReportGenerator:
 
     def find_paragraph_contains(self, doc, text):
         """Find paragraph containing specific text (case-insensitive)."""
-        search_text = text.lower()
-        for p in doc.paragraphs:
-            if search_text in (p.text or '').lower():
-                return p
-        return None
+        return self.document_view(doc).find(text)
 
     def simple_replace_section(self, src_doc, dst_doc, start_heading_text, end_heading_text):
         """
@@ -3715,56 +6320,41 @@ class PatentReportGenerator:
         """
         try:
             self.log(f"    🔍 Looking for '{start_heading_text}' in source document...")
-            start_p = self.find_paragraph_contains(src_doc, start_heading_text)
-            if not start_p:
+            src = self.section_index(src_doc)
+            start_key = start_heading_text.lower()
+            end_key = end_heading_text.lower() if end_heading_text else None
+            start_p = src.first(start_key)
+            if start_p is None:
                 self.log(f"    ❌ Could not find '{start_heading_text}' in source document")
                 return False
 
             self.log(f"    ✅ Found '{start_heading_text}' in source document")
 
-            # Find end boundary
+            # Find end boundary: end_heading_text after the start position
             end_p = None
-            if end_heading_text:
-                elems = list(src_doc.element.body)
-                start_idx = elems.index(start_p._p)
-
-                # Look for end_heading_text after the start position
-                for i in range(start_idx + 1, len(elems)):
-                    if elems[i].tag == qn('w:p'):
-                        p = Paragraph(elems[i], src_doc)
-                        if end_heading_text.lower() in (p.text or '').lower():
-                            end_p = p
-                            break
-
-                if not end_p:
+            if end_key:
+                end_p = src.first(end_key, after=start_p)
+                if end_p is None:
                     self.log(f"    ⚠️  Could not find '{end_heading_text}' after '{start_heading_text}' in source document, using end of document")
 
             # Get source content (excluding the heading to avoid duplicates)
-            elems = list(src_doc.element.body)
-            start_idx = elems.index(start_p._p)
-            end_idx = elems.index(end_p._p) if end_p is not None else len(elems)
-            # Skip the heading paragraph to avoid duplicates
-            src_slice = elems[start_idx + 1:end_idx]
+            src_slice = src.section(start_p, end_p)
             self.log(f"    📋 Found {len(src_slice)} elements to copy from source (excluding heading)")
 
             # Find destination section
             self.log(f"    🔍 Looking for '{start_heading_text}' in destination document...")
-            dst_start_p = self.find_paragraph_contains(dst_doc, start_heading_text)
-            if not dst_start_p:
+            dst = self.section_index(dst_doc)
+            dst_start_p = dst.first(start_key)
+            if dst_start_p is None:
                 # If destination start heading doesn't exist, insert before end_heading if possible
                 self.log(f"    ❌ Could not find '{start_heading_text}' in destination document")
-                if end_heading_text:
-                    insert_before = self.find_paragraph_contains(dst_doc, end_heading_text)
-                    if insert_before:
+                if end_key:
+                    insert_before = dst.first(end_key)
+                    if insert_before is not None:
                         self.log(f"    ➕ Inserting new section '{start_heading_text}' before '{end_heading_text}' in destination (including source heading)")
                         # Insert the source heading and its content before insert_before
-                        elems_dst = list(dst_doc.element.body)
-                        insert_idx = elems_dst.index(insert_before._p)
-                        # Build slice including heading in source
-                        full_src_slice = elems[start_idx:end_idx]
-                        for el in reversed(full_src_slice):
-                            new_el = deepcopy(el)
-                            insert_before._p.addprevious(new_el)
+                        full_src_slice = [start_p] + src_slice
+                        dst.insert_before(insert_before, [deepcopy(el) for el in reversed(full_src_slice)])
                         self.log(f"    ✅ Inserted section '{start_heading_text}' into destination")
                         return True
                 return False
@@ -3773,19 +6363,9 @@ class PatentReportGenerator:
 
             # Find end boundary in destination
             dst_end_p = None
-            if end_heading_text:
-                dst_elems = list(dst_doc.element.body)
-                dst_start_idx = dst_elems.index(dst_start_p._p)
-
-                # Look for end_heading_text after the start position
-                for i in range(dst_start_idx + 1, len(dst_elems)):
-                    if dst_elems[i].tag == qn('w:p'):
-                        p = Paragraph(dst_elems[i], dst_doc)
-                        if end_heading_text.lower() in (p.text or '').lower():
-                            dst_end_p = p
-                            break
-
-                if not dst_end_p:
+            if end_key:
+                dst_end_p = dst.first(end_key, after=dst_start_p)
+                if dst_end_p is None:
                     # Fallback: find any next major section as boundary to avoid wiping whole doc
                     self.log(f"    ⚠️  Could not find '{end_heading_text}' after '{start_heading_text}' in destination document, searching for next section boundary")
                     major_sections = [
@@ -3796,41 +6376,26 @@ class PatentReportGenerator:
                         'disclaimer',
                         'appendix'
                     ]
-                    for i in range(dst_start_idx + 1, len(dst_elems)):
-                        if dst_elems[i].tag == qn('w:p'):
-                            p = Paragraph(dst_elems[i], dst_doc)
-                            text_lower = (p.text or '').lower()
-                            if any(ms in text_lower for ms in major_sections):
-                                dst_end_p = p
-                                self.log(f"    ✅ Found boundary at: '{p.text.strip()}'")
-                                break
-                    if not dst_end_p:
+                    dst_end_p = dst.first_of(major_sections, after=dst_start_p)
+                    if dst_end_p is not None:
+                        self.log(f"    ✅ Found boundary at: '{dst.text(dst_end_p)}'")
+                    else:
                         self.log(f"    ⚠️  No section boundary found, using end of document")
 
             # Remove existing content (keep the heading)
-            dst_elems = list(dst_doc.element.body)
-            dst_start_idx = dst_elems.index(dst_start_p._p)
-            dst_end_idx = dst_elems.index(dst_end_p._p) if dst_end_p is not None else len(dst_elems)
-
-            # Remove elements after the heading
-            elements_to_remove = dst_end_idx - dst_start_idx - 1
-            self.log(f"    🗑️  Removing {elements_to_remove} existing elements from destination")
-
-            # Remove elements in reverse order
-            for i in range(dst_end_idx - 1, dst_start_idx, -1):
-                if i < len(dst_elems):
-                    el = dst_elems[i]
-                    dst_doc.element.body.remove(el)
+            dst_slice = dst.section(dst_start_p, dst_end_p)
+            self.log(f"    🗑️  Removing {len(dst_slice)} existing elements from destination")
+            dst.remove(dst_slice)
 
             # Insert new content after the heading
             self.log(f"    ➕ Inserting {len(src_slice)} elements into destination")
-
-            # Insert elements in reverse order to maintain correct order
+            new_elements = []
             for i, el in enumerate(reversed(src_slice)):
-                new_el = deepcopy(el)
-                dst_start_p._p.addnext(new_el)
+                new_elements.append(deepcopy(el))
                 if i % 10 == 0:  # Log every 10th element to avoid spam
                     self.log(f"      Inserted element {i+1}/{len(src_slice)}")
+            new_elements.reverse()
+            dst.insert_after(dst_start_p, new_elements)
 
             self.log(f"    ✅ Successfully replaced section '{start_heading_text}'")
             return True
@@ -3855,8 +6420,9 @@ class PatentReportGenerator:
         def list_headings(doc_obj, doc_name):
             self.log(f"\n📋 Headings in {doc_name}:")
             count = 0
-            for i, p in enumerate(doc_obj.paragraphs):
-                text = p.text.strip()
+            view = self.document_view(doc_obj)
+            for i, p in enumerate(view.paragraphs()):
+                text = view.text(p).strip()
                 if text and len(text) < 100 and (text.isupper() or any(word in text.lower() for word in ['title', 'contents', 'objective', 'references', 'patent', 'criteria', 'mappings', 'search', 'appendix', 'disclaimer', 'about'])):
                     self.log(f"  {i}: '{text}'")
                     count += 1
@@ -3868,18 +6434,15 @@ class PatentReportGenerator:
 
         # Additional debug: Check if gen_doc has the expected content
         self.log(f"\n🔍 Checking gen_doc content:")
-        self.log(f"  - gen_doc has {len(self.gen_doc.paragraphs)} paragraphs")
-        self.log(f"  - gen_doc has {len(self.gen_doc.tables)} tables")
+        gen_view = self.document_view(self.gen_doc)
+        self.log(f"  - gen_doc has {len(gen_view.paragraphs())} paragraphs")
+        self.log(f"  - gen_doc has {len(gen_view.tables())} tables")
 
         # Check if the search strategies content exists in gen_doc
-        search_strategies_found = False
-        for p in self.gen_doc.paragraphs:
-            if "search strategy below resulted in" in p.text.lower():
-                search_strategies_found = True
-                self.log(f"  ✅ Found search strategies content: '{p.text[:100]}...'")
-                break
-
-        if not search_strategies_found:
+        strategies_para = gen_view.find("search strategy below resulted in")
+        if strategies_para is not None:
+            self.log(f"  ✅ Found search strategies content: '{gen_view.text(strategies_para)[:100]}...'")
+        else:
             self.log("  ❌ No search strategies content found in gen_doc")
 
         # Replace full Title Page (first-page content) from gen_doc into doc (up to OBJECTIVE)
@@ -3960,14 +6523,7 @@ class PatentReportGenerator:
         # Pre-merge diagnostics for Appendix B boundaries
         try:
             def _find_idx(doc_obj, text):
-                from docx.text.paragraph import Paragraph as _Paragraph
-                body = doc_obj.element.body
-                for i, el in enumerate(list(body)):
-                    if el.tag.endswith('p'):
-                        p = _Paragraph(el, doc_obj)
-                        if text.lower() in (p.text or '').lower():
-                            return i
-                return None
+                return self.section_index(doc_obj).index_of(text)
             dst_idx_appb = _find_idx(self.doc, 'appendix b') or _find_idx(self.doc, 'appendix b: search strategies')
             dst_idx_map = _find_idx(self.doc, 'mappings based on selected references')
             dst_idx_about = _find_idx(self.doc, 'about us')
@@ -4029,23 +6585,12 @@ class PatentReportGenerator:
         Criteria section, inserting a page break before the Mappings header.
         """
         try:
-            from docx.text.paragraph import Paragraph
-            from docx.oxml import OxmlElement
             from docx.oxml.ns import qn
 
-            body = doc.element.body
-            elems = list(body)
-
-            # Helper to find first index of paragraph containing text
-            def find_idx(substrs):
-                for i, el in enumerate(elems):
-                    if el.tag.endswith('p'):
-                        p = Paragraph(el, doc)
-                        t = (p.text or '').strip().lower()
-                        for s in (substrs if isinstance(substrs, (list, tuple)) else [substrs]):
-                            if s in t:
-                                return i
-                return None
+            index = self.section_index(doc)
+
+            def find_idx(substr):
+                return index.index_of(substr)
 
             criteria_idx = find_idx('criteria for the publication search')
             mappings_idx = find_idx('mappings based on selected references')
@@ -4057,58 +6602,35 @@ class PatentReportGenerator:
             if mappings_idx is None or criteria_idx is None or about_idx is None:
                 return
             if about_idx < mappings_idx:
+                criteria_el = index.element_at(criteria_idx)
+                mappings_el = index.element_at(mappings_idx)
                 # Determine end of mappings block: stop at the next major section after mappings
                 major_keys = [
                     'disclaimer', 'appendix', 'parola analytics', 'about us',
                     'objective', 'patent-at-issue', 'criteria for the publication search'
                 ]
-                end_idx = len(elems)
-                for i in range(mappings_idx + 1, len(elems)):
-                    el = elems[i]
-                    if el.tag.endswith('p'):
-                        p = Paragraph(el, doc)
-                        t = (p.text or '').strip().lower()
-                        if any(k in t for k in major_keys):
-                            end_idx = i
-                            break
+                end_el = index.first_of(major_keys, after=mappings_el)
 
                 # If there is a page-break paragraph immediately BEFORE the original mappings header, remove it
                 try:
-                    if mappings_idx - 1 >= 0 and elems[mappings_idx - 1].tag.endswith('p'):
-                        prev_el = elems[mappings_idx - 1]
-                        has_prev_page_br = any(br.get(qn('w:type')) == 'page' for br in prev_el.xpath('.//w:br'))
-                        if has_prev_page_br:
-                            body.remove(prev_el)
-                            elems = list(body)
-                            # Recompute mappings_idx after removal
-                            mappings_idx = None
-                            for i, el in enumerate(elems):
-                                if el.tag.endswith('p'):
-                                    p = Paragraph(el, doc)
-                                    if 'mappings based on selected references' in (p.text or '').strip().lower():
-                                        mappings_idx = i
-                                        break
+                    prev_el = index.previous(mappings_el)
+                    if prev_el is not None and prev_el.tag == W_P and has_page_break(prev_el):
+                        index.remove([prev_el])
                 except Exception:
                     pass
 
-                # Collect elements to move [mappings_idx, end_idx)
-                to_move = elems[mappings_idx:end_idx]
-                if not to_move:
-                    return
+                # Collect elements to move [mappings, end)
+                to_move = [mappings_el] + index.section(mappings_el, end_el)
 
                 # Find insertion point: end of criteria section.
-                # Walk forward from criteria_idx+1 until hitting a major section, insert after the last content before it.
-                insert_after_idx = criteria_idx
-                for i in range(criteria_idx + 1, len(elems)):
-                    el = elems[i]
-                    if el.tag.endswith('p'):
-                        p = Paragraph(el, doc)
-                        t = (p.text or '').strip().lower()
-                        if any(k in t for k in ['mappings based on selected references', 'disclaimer', 'appendix', 'about us', 'parola analytics']):
-                            break
-                    insert_after_idx = i
-
-                insert_ref_el = elems[insert_after_idx]
+                # Walk forward from criteria until hitting a major section, insert after the last content before it.
+                boundary_el = index.first_of(
+                    ['mappings based on selected references', 'disclaimer', 'appendix', 'about us', 'parola analytics'],
+                    after=criteria_el)
+                if boundary_el is not None:
+                    insert_ref_el = index.previous(boundary_el)
+                else:
+                    insert_ref_el = index.element_at(len(index) - 1)
 
                 # Do NOT insert any additional page break before the moved block.
                 # Also strip pageBreakBefore from the MAPPINGS header to avoid implicit breaks.
@@ -4123,35 +6645,15 @@ class PatentReportGenerator:
                                 pPr_h.remove(child)
                 except Exception:
                     pass
-                after_break_ref = insert_ref_el
-
-                # Insert copies in order after the break, then remove originals
-                for el in to_move:
-                    new_el = deepcopy(el)
-                    after_break_ref.addnext(new_el)
-                    after_break_ref = new_el
 
-                # Remove originals
-                for el in to_move:
-                    try:
-                        body.remove(el)
-                    except Exception:
-                        pass
+                # Insert copies in order after the insertion point, then remove originals
+                index.insert_after(insert_ref_el, [deepcopy(el) for el in to_move])
+                index.remove(to_move)
 
                 # Refresh indices for diagnostics
-                elems2 = list(body)
-                def find_idx2(substrs):
-                    for i, el in enumerate(elems2):
-                        if el.tag.endswith('p'):
-                            p = Paragraph(el, doc)
-                            t = (p.text or '').strip().lower()
-                            for s in (substrs if isinstance(substrs, (list, tuple)) else [substrs]):
-                                if s in t:
-                                    return i
-                    return None
-                mappings_idx2 = find_idx2('mappings based on selected references')
-                about_idx2 = find_idx2('about us')
-                criteria_idx2 = find_idx2('criteria for the publication search')
+                mappings_idx2 = find_idx('mappings based on selected references')
+                about_idx2 = find_idx('about us')
+                criteria_idx2 = find_idx('criteria for the publication search')
                 self.log(f"DEBUG: [relocate] indices after → criteria={criteria_idx2}, mappings={mappings_idx2}, about={about_idx2}")
                 if about_idx2 is not None and mappings_idx2 is not None and about_idx2 < mappings_idx2:
                     self.log("WARN: Relocation attempted but ABOUT US still precedes MAPPINGS.")
@@ -4166,33 +6668,24 @@ class PatentReportGenerator:
         without an intervening ORR table.
         """
         try:
-            body = doc.element.body
-            elems = list(body)
-            from docx.text.paragraph import Paragraph
-            for i, el in enumerate(elems):
-                if el.tag.endswith('p'):
-                    p = Paragraph(el, doc)
-                    txt = (p.text or '').strip().lower()
-                    if txt == 'other related references found':
-                        # Scan forward until next major section or a table
-                        j = i + 1
-                        found_table = False
-                        hit_boundary = False
-                        while j < len(elems):
-                            nxt = elems[j]
-                            if nxt.tag.endswith('tbl'):
-                                found_table = True
-                                break
-                            if nxt.tag.endswith('p'):
-                                pn = Paragraph(nxt, doc)
-                                t = (pn.text or '').strip().lower()
-                                if any(k in t for k in ['patent-at-issue', 'criteria for', 'mappings based', 'disclaimer', 'appendix']):
-                                    hit_boundary = True
-                                    break
-                            j += 1
-                        if hit_boundary and not found_table:
-                            body.remove(el)
-                            break
+            index = self.section_index(doc)
+            for el in list(index.matches('other related references found')):
+                if index.lower(el) != 'other related references found':
+                    continue
+                # Scan forward until next major section or a table
+                found_table = False
+                hit_boundary = False
+                for nxt in index.following(el):
+                    if nxt.tag == W_TBL:
+                        found_table = True
+                        break
+                    t = index.lower(nxt)
+                    if t is not None and any(k in t for k in ['patent-at-issue', 'criteria for', 'mappings based', 'disclaimer', 'appendix']):
+                        hit_boundary = True
+                        break
+                if hit_boundary and not found_table:
+                    index.remove([el])
+                    break
         except Exception:
             pass
 
@@ -4208,31 +6701,20 @@ class PatentReportGenerator:
             from docx.oxml import OxmlElement
             from docx.oxml.ns import qn
 
-            body = doc.element.body
-            elems = list(body)
+            index = self.section_index(doc)
 
             # Locate ORR heading if present
-            orr_heading_idx = None
-            for i, el in enumerate(elems):
-                if el.tag.endswith('p'):
-                    p = Paragraph(el, doc)
-                    text = (p.text or '').strip().lower()
-                    if 'other related references' in text:
-                        orr_heading_idx = i
-                        break
+            orr_heading = index.first('other related references')
 
             # Locate ORR table after heading
-            orr_table_idx = None
-            if orr_heading_idx is not None:
-                for j in range(orr_heading_idx + 1, len(elems)):
-                    if elems[j].tag.endswith('tbl'):
-                        orr_table_idx = j
-                        break
+            orr_table = None
+            if orr_heading is not None:
+                orr_table = next((el for el in index.following(orr_heading) if el.tag == W_TBL), None)
 
             # Fallback: detect ORR table by header texts
-            if orr_table_idx is None:
-                for i, el in enumerate(elems):
-                    if el.tag.endswith('tbl'):
+            if orr_table is None:
+                for el in index.elements():
+                    if el.tag == W_TBL:
                         tbl = Table(el, doc)
                         try:
                             if len(tbl.rows) > 0 and len(tbl.rows[0].cells) >= 2:
@@ -4244,20 +6726,16 @@ class PatentReportGenerator:
                                 if ('references found' in joined) and (
                                     'assignee' in joined or 'author/publisher' in joined or 'inventor' in joined
                                 ):
-                                    orr_table_idx = i
+                                    orr_table = el
                                     break
                         except Exception:
                             continue
 
-            if orr_table_idx is not None:
+            if orr_table is not None:
                 # If no ORR heading exists anywhere, insert one immediately before the table
-                if orr_heading_idx is None:
-                    has_header = False
-                    elems = list(body)
-                    if orr_table_idx - 1 >= 0 and elems[orr_table_idx - 1].tag.endswith('p'):
-                        prev_p = Paragraph(elems[orr_table_idx - 1], doc)
-                        if (prev_p.text or '').strip().lower() == 'other related references found':
-                            has_header = True
+                if orr_heading is None:
+                    prev_el = index.previous(orr_table)
+                    has_header = prev_el is not None and index.lower(prev_el) == 'other related references found'
                     if not has_header:
                         new_p = OxmlElement('w:p')
                         r = OxmlElement('w:r')
@@ -4289,21 +6767,14 @@ class PatentReportGenerator:
                         pPr.append(spacing)
                         new_p.append(pPr)
                         new_p.append(r)
-                        body.insert(orr_table_idx, new_p)
+                        index.insert_before(orr_table, [new_p])
 
                 # Add page break before Patent-at-Issue if it immediately follows a table
-                pat_p = None
-                pat_idx = None
-                for j, el in enumerate(list(body)):
-                    if el.tag.endswith('p'):
-                        p = Paragraph(el, doc)
-                        if (p.text or '').strip().lower() == 'patent-at-issue':
-                            pat_p = p
-                            pat_idx = j
-                            break
-                if pat_p is not None:
-                    elems2 = list(body)
-                    prev_is_tbl = (pat_idx - 1 >= 0 and elems2[pat_idx - 1].tag.endswith('tbl'))
+                pat_el = index.first('patent-at-issue', exact=True)
+                if pat_el is not None:
+                    pat_p = Paragraph(pat_el, doc)
+                    prev_el = index.previous(pat_el)
+                    prev_is_tbl = prev_el is not None and prev_el.tag == W_TBL
                     if prev_is_tbl:
                         # Insert a separate page-break paragraph BEFORE the heading paragraph
                         br = OxmlElement('w:br')
@@ -4318,7 +6789,7 @@ class PatentReportGenerator:
                         run_element.append(br)
                         new_break_p = OxmlElement('w:p')
                         new_break_p.append(run_element)
-                        pat_p._p.addprevious(new_break_p)
+                        index.insert_before(pat_el, [new_break_p])
 
                     # Normalize PATENT-AT-ISSUE heading formatting with robust style and spacing
                     try:
@@ -4381,6 +6852,7 @@ class PatentReportGenerator:
                                 r.font.color.rgb = RGBColor(0x40, 0x40, 0x40)
                             except Exception:
                                 pass
+                        self.touch(pat_el)
 
                         # Normalize the next paragraph's spacing-before to 0 to eliminate visual gap
                         nxt_el = pat_p._p.getnext()
@@ -4415,26 +6887,17 @@ class PatentReportGenerator:
             from docx.oxml import OxmlElement
             from docx.oxml.ns import qn
 
-            body = doc.element.body
-            elems = list(body)
-
-            criteria_idx = None
-            mappings_idx = None
+            index = self.section_index(doc)
 
             # Locate criteria heading and mappings heading
             self.log("DEBUG: ensure_page_break_before_mappings - scanning for section boundaries...")
-            for i, el in enumerate(elems):
-                if el.tag.endswith('p'):
-                    p = Paragraph(el, doc)
-                    text_lower = (p.text or '').strip().lower()
-                    if criteria_idx is None and 'criteria for the publication search' in text_lower:
-                        criteria_idx = i
-                        self.log(f"  - Found CRITERIA heading at index {criteria_idx} -> '{(p.text or '').strip()}'")
-                    if mappings_idx is None and 'mappings based on selected references' in text_lower:
-                        mappings_idx = i
-                        self.log(f"  - Found MAPPINGS heading at index {mappings_idx} -> '{(p.text or '').strip()}'")
-                    if criteria_idx is not None and mappings_idx is not None:
-                        break
+            criteria_el = index.first('criteria for the publication search')
+            mappings_el = index.first('mappings based on selected references')
+            criteria_idx = None if criteria_el is None else index.position(criteria_el)
+            mappings_idx = None if mappings_el is None else index.position(mappings_el)
+            for i, label, el in sorted((index.position(el), label, el) for label, el in
+                                       (('CRITERIA', criteria_el), ('MAPPINGS', mappings_el)) if el is not None):
+                self.log(f"  - Found {label} heading at index {i} -> '{index.text(el)}'")
 
             if criteria_idx is None or mappings_idx is None:
                 self.log(f"DEBUG: Section indices not found (criteria_idx={criteria_idx}, mappings_idx={mappings_idx}) - skipping break insert")
@@ -4442,15 +6905,12 @@ class PatentReportGenerator:
 
             # If mappings header is not on a fresh page after criteria, insert a break
             # Check if the element right before mappings is a page break paragraph
-            prev_el = elems[mappings_idx - 1] if mappings_idx - 1 >= 0 else None
+            prev_el = index.element_at(mappings_idx - 1)
             is_prev_break_p = False
-            if prev_el is not None and prev_el.tag.endswith('p'):
+            if prev_el is not None and prev_el.tag == W_P:
                 # Detect w:br inside the previous paragraph
                 try:
-                    for br in prev_el.xpath('.//w:br'):
-                        if br.get(qn('w:type')) == 'page':
-                            is_prev_break_p = True
-                            break
+                    is_prev_break_p = has_page_break(prev_el)
                 except Exception:
                     pass
 
@@ -4464,17 +6924,16 @@ class PatentReportGenerator:
                 break_para = OxmlElement('w:p')
                 break_para.append(run_element)
                 # Insert into body before mappings header element
-                elems_m = list(body)
-                body.insert(mappings_idx, break_para)
+                index.insert_before(mappings_el, [break_para])
                 self.log(f"DEBUG: Inserted page-break paragraph before mappings at index {mappings_idx}")
             else:
                 self.log("DEBUG: Page break already present before mappings - no insertion needed")
 
             # Additionally enforce page break via pageBreakBefore on the mappings header itself
             try:
-                elems_now = list(body)
-                if mappings_idx < len(elems_now) and elems_now[mappings_idx].tag.endswith('p'):
-                    p_m = Paragraph(elems_now[mappings_idx], doc)
+                el_now = index.element_at(mappings_idx)
+                if el_now is not None and el_now.tag == W_P:
+                    p_m = Paragraph(el_now, doc)
                     pPr_m = p_m._p.get_or_add_pPr()
                     # Remove existing pageBreakBefore if any, then set to true
                     for el in list(pPr_m):
@@ -4523,23 +6982,13 @@ class PatentReportGenerator:
             from docx.table import Table
             from docx.oxml.ns import qn
 
-            body = doc.element.body
-            elems = list(body)
-
-            def find_idx(substr_list):
-                for i, el in enumerate(elems):
-                    if el.tag.endswith('p'):
-                        p = Paragraph(el, doc)
-                        t = (p.text or '').strip().lower()
-                        for s in substr_list:
-                            if s in t:
-                                return i
-                return None
+            index = self.section_index(doc)
+            elems = index.elements()
 
-            criteria_idx = find_idx(['criteria for the publication search'])
-            mappings_idx = find_idx(['mappings based on selected references'])
-            disclaimer_idx = find_idx(['disclaimer'])
-            about_idx = find_idx(['about us'])
+            criteria_idx = index.index_of('criteria for the publication search')
+            mappings_idx = index.index_of('mappings based on selected references')
+            disclaimer_idx = index.index_of('disclaimer')
+            about_idx = index.index_of('about us')
 
             self.log("DEBUG: debug_mappings_placement → indices:")
             self.log(f"  criteria_idx={criteria_idx}, mappings_idx={mappings_idx}, disclaimer_idx={disclaimer_idx}, about_idx={about_idx}")
@@ -4554,7 +7003,7 @@ class PatentReportGenerator:
                         self.log(f"  {label}: element at {idx} is not a paragraph ({el.tag})")
                         return
                     p = Paragraph(el, doc)
-                    t = (p.text or '').strip()
+                    t = index.text(el) or ''
                     pPr = p._p.get_or_add_pPr()
                     # pageBreakBefore
                     pbb = None
@@ -4600,11 +7049,7 @@ class PatentReportGenerator:
                     kind = 'tbl' if el.tag.endswith('tbl') else ('p' if el.tag.endswith('p') else el.tag)
                     text = ''
                     if kind == 'p':
-                        try:
-                            p = Paragraph(el, doc)
-                            text = (p.text or '').strip()
-                        except Exception:
-                            text = ''
+                        text = index.text(el) or ''
                     if text:
                         self.log(f"  {i}: {kind} '{text[:80]}'")
                     else:
@@ -4655,23 +7100,16 @@ class PatentReportGenerator:
             from docx.oxml import OxmlElement
             from docx.oxml.ns import qn
 
-            body = doc.element.body
-            elems = list(body)
+            index = self.section_index(doc)
 
             # Find Patent-at-Issue heading paragraph
-            pat_p = None
-            pat_idx = None
-            for i, el in enumerate(elems):
-                if el.tag.endswith('p'):
-                    p = Paragraph(el, doc)
-                    if (p.text or '').strip().lower() == 'patent-at-issue':
-                        pat_p = p
-                        pat_idx = i
-                        break
+            pat_el = index.first('patent-at-issue', exact=True)
 
-            if pat_p is not None and pat_idx is not None:
+            if pat_el is not None:
+                pat_p = Paragraph(pat_el, doc)
+                prev_el = index.previous(pat_el)
                 # Insert a page break at start if previous element is a table
-                if pat_idx - 1 >= 0 and elems[pat_idx - 1].tag.endswith('tbl'):
+                if prev_el is not None and prev_el.tag == W_TBL:
                     br = OxmlElement('w:br')
                     br.set(qn('w:type'), 'page')
                     run_element = OxmlElement('w:r')
@@ -4700,14 +7138,16 @@ class PatentReportGenerator:
                         r.font.color.rgb = RGBColor(0x40, 0x40, 0x40)
                     except Exception:
                         pass
+                self.touch(pat_el)
         except Exception as e:
             self.log(f"Error ensuring Patent-at-Issue heading format: {str(e)}")
 
     def fix_document_structure(self, doc):
         """Fix common XML structure issues that cause Word warnings"""
         try:
+            view = self.document_view(doc)
             # Ensure all paragraphs have proper structure
-            for paragraph in doc.paragraphs:
+            for paragraph in view.paragraphs():
                 # Ensure paragraph has proper properties
                 pPr = paragraph._p.get_or_add_pPr()
 
@@ -4736,7 +7176,7 @@ class PatentReportGenerator:
                         rPr.append(szCs)
 
             # Ensure all table cells have proper structure
-            for table in doc.tables:
+            for table in view.tables():
                 for row in table.rows:
                     for cell in row.cells:
                         for paragraph in cell.paragraphs:
@@ -4786,8 +7226,9 @@ class PatentReportGenerator:
             }
 
             # Search through all paragraphs to find headers
-            for paragraph in doc.paragraphs:
-                text = paragraph.text.strip().upper()
+            view = self.document_view(doc)
+            for paragraph in view.paragraphs():
+                text = view.read(paragraph).strip().upper()
 
                 # Check if this paragraph contains any of our target headers
                 for header_text, font_size in headers.items():
@@ -4934,7 +7375,7 @@ class MainWindow(QMainWindow):
     def __init__(self):
         """Initialize the main window and set up the user interface."""
         super().__init__()
-        self.setWindowTitle("Report Generation Tool v.1.4")
+        self.setWindowTitle(f"Report Generation Tool v.{APP_VERSION}")
         self.resize(800, 600)
 
         central_widget = QWidget()
@@ -5203,6 +7644,7 @@ class MainWindow(QMainWindow):
             self.thread.generator.process_search_strings()
             # Merge sections in update mode
             self.thread.generator.merge_generated_sections()
+            self.thread.generator.log_patent_cache_stats()
             self.progress_bar.setValue(100)
             self.log_queue.put("Document processing complete in main thread")
             self.thread.request_save_dialog_signal.emit()  # Trigger save dialog after document processing
@@ -5255,7 +7697,134 @@ class MainWindow(QMainWindow):
             self.log_text.setEnabled(True)
             self.progress_bar.setValue(0)
 
+WARM_CACHE_WORKERS = 4
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm", ".xls")
+
+
+def patent_numbers_from_workbooks(folder, log=print):
+    """
+    Read the patent-at-issue number from every project workbook in folder, taken from
+    cell A2 the same way extract_patent_at_issue_and_claims does.
+    """
+    generator = PatentReportGenerator(log, lambda value, message="": None, "Invalidity")
+    numbers = []
+    for name in sorted(os.listdir(folder)):
+        if name.startswith("~$") or not name.lower().endswith(WORKBOOK_EXTENSIONS):
+            continue
+        try:
+            df = pd.read_excel(os.path.join(folder, name), header=None, nrows=2)
+            number = generator.extract_patent_number(df.iloc[1, 0])
+        except Exception as e:
+            log(f"⚠ Skipping {name}: {str(e)}")
+            continue
+        if number:
+            numbers.append(number)
+    return numbers
+
+
+def warm_patent_cache(numbers, workers=WARM_CACHE_WORKERS, rate=None, log=print):
+    """
+    Load each publication number through the configured patent sources, as report
+    generation does, so pages missing from the offline corpora, the USPTO index and the
+    page cache are downloaded into the cache ahead of time. Parsed documents are kept in
+    the in-memory memo. `rate` overrides the shared limiter's requests per second.
+    Returns {"fetched": n, "cached": n, "failed": n}; "cached" counts patents a local
+    source already had.
+    """
+    numbers = list(dict.fromkeys(n for n in numbers if n))
+    counts = {"fetched": 0, "cached": 0, "failed": 0}
+    counts_lock = threading.Lock()
+    # Batch runs are not bounded by the per-report budget, only by consecutive failures
+    breaker = ScraperCircuitBreaker(budget=float("inf"))
+    sources = configured_patent_sources()
+    limiter = PATENT_SCRAPER.rate_limiter
+    if rate is not None:
+        PATENT_SCRAPER.rate_limiter = TokenBucketLimiter(rate, 1, limiter.state_path if limiter else None)
+
+    def warm(number):
+        try:
+            document = _PATENT_DOCUMENTS.get(normalize_publication_number(number))
+            source = None
+            if document is None:
+                document, source = load_patent_document(number, sources, breaker=breaker)
+            if document is None:
+                outcome, detail = "failed", f"not found in patent sources ({', '.join(s.name for s in sources)})"
+            elif document.status_code != 200:
+                outcome, detail = "failed", f"HTTP {document.status_code}"
+            elif source is not None and source.name == "network":
+                outcome, detail = "fetched", f"{document.claim_count} claims"
+            else:
+                outcome, detail = "cached", f"already in {source.name if source else 'memory'}"
+        except Exception as e:
+            outcome, detail = "failed", str(e)
+        with counts_lock:
+            counts[outcome] += 1
+        log(f"{'✓' if outcome != 'failed' else '✗'} {number}: {detail}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="warm-cache") as pool:
+            list(pool.map(warm, numbers))
+    finally:
+        PATENT_SCRAPER.rate_limiter = limiter
+    return counts
+
+
+# Subcommands handled by run_command_line; any other arguments start the GUI
+CLI_COMMANDS = ("index-uspto", "warm-cache", "forget-pages")
+
+
+def run_command_line(argv):
+    """Headless maintenance commands; returns an exit code."""
+    parser = argparse.ArgumentParser(prog="ParolaReportGenerator")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index_parser = commands.add_parser(
+        "index-uspto", help="Index USPTO full-text grant/application files for offline claim lookups"
+    )
+    index_parser.add_argument("archives", nargs="+", help="Weekly .zip archives or extracted .xml files")
+    index_parser.add_argument(
+        "--index", default=PAROLA_USPTO_INDEX or os.path.join(PAROLA_CACHE_DIR, "uspto_index.sqlite3"),
+        help="Index file to create or extend (default: PAROLA_USPTO_INDEX or the cache folder)"
+    )
+    warm_parser = commands.add_parser(
+        "warm-cache", help="Download upcoming patents-at-issue into the patent page cache"
+    )
+    warm_parser.add_argument("numbers", nargs="*", help="Publication numbers, e.g. US10123456B2")
+    warm_parser.add_argument("--workbooks", help="Folder of project workbooks to read patent numbers from")
+    warm_parser.add_argument("--workers", type=int, default=WARM_CACHE_WORKERS, help="Concurrent downloads")
+    warm_parser.add_argument("--rate", type=float, help="Maximum requests per second (default: PAROLA_SCRAPER_RATE)")
+    forget_parser = commands.add_parser(
+        "forget-pages", help="Drop cached Google Patents pages so they are downloaded again"
+    )
+    forget_parser.add_argument("numbers", nargs="*", help="Publication numbers, e.g. US10123456B2")
+    forget_parser.add_argument("--all", action="store_true", help="Drop every cached page")
+    args = parser.parse_args(argv)
+    if args.command == "warm-cache":
+        numbers = list(args.numbers)
+        if args.workbooks:
+            numbers += patent_numbers_from_workbooks(args.workbooks)
+        if not numbers:
+            parser.error("warm-cache needs publication numbers or --workbooks")
+        counts = warm_patent_cache(numbers, workers=args.workers, rate=args.rate)
+        print(f"Warm-up finished: {counts['fetched']} fetched, {counts['cached']} cached, {counts['failed']} failed")
+        return 1 if counts["failed"] else 0
+    if args.command == "forget-pages":
+        if args.all == bool(args.numbers):
+            parser.error("forget-pages needs publication numbers or --all, not both")
+        if args.all:
+            dropped = PATENT_PAGE_CACHE.invalidate()
+        else:
+            dropped = sum(PATENT_PAGE_CACHE.invalidate(GOOGLE_PATENTS_URL.format(n)) for n in args.numbers)
+        print(f"✓ {dropped} cached pages dropped")
+        return 0
+    if args.command == "index-uspto":
+        added = index_uspto_archives(args.index, args.archives)
+        print(f"✓ {added} records indexed in {args.index}; set PAROLA_USPTO_INDEX to use it")
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(run_command_line(sys.argv[1:]))
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,119 @@
+"""
+Benchmark reference-date formatting: the previous per-cell format_date (ws.cell lookup and
+number_format branching on every call) against the batched format_dates with formatters
+compiled once per number format.
+
+Usage:
+    python scratch/bench_date_format.py [cells]
+
+A synthetic worksheet is filled with dates, Excel serials, text dates and blanks under a mix
+of number formats. Every position must format to the same string on both paths.
+"""
+import os
+import re
+import sys
+import time
+import random
+import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pandas as pd  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+from openpyxl.utils.datetime import from_excel  # noqa: E402
+
+import main  # noqa: E402
+
+FORMATS = ("d mmmm yyyy", "dd mmmm yyyy", "mmmm yyyy", "mmm yyyy", "MMM YYYY", "yyyy",
+           "yyyy-mm-dd", "mm/dd/yyyy", "General", "@", "[$-409]d mmmm yyyy;@")
+TEXT = ("13 June 2008", "03 June 2008", "June 2008", "2008", "nan", " 2008-06-13 ", "unknown")
+
+
+def legacy_format_date(ws, row, col):
+    """Primary (openpyxl) branch of format_date before batching; returns None where it fell back."""
+    try:
+        cell = ws.cell(row=row + 1, column=col + 1)
+        v = cell.value
+        fmt = (cell.number_format or "").lower()
+        if v in (None, ""):
+            return ""
+        if isinstance(v, (int, float)):
+            try:
+                v = from_excel(v)
+            except Exception:
+                return str(v)
+        if isinstance(v, datetime.datetime):
+            if ("mmmm" in fmt or "mmm" in fmt) and "yyyy" in fmt and "d" not in fmt:
+                return v.strftime("%B %Y") if "mmmm" in fmt else v.strftime("%b %Y")
+            if "yyyy" in fmt and "m" not in fmt and "d" not in fmt:
+                return v.strftime("%Y")
+            out = v.strftime("%d %B %Y")
+            return out[1:] if out.startswith("0") else out
+        s = str(v).strip()
+        if s.lower() == "nan":
+            return ""
+        if re.match(r"^0\d\s", s):
+            return s[1:]
+        return s
+    except Exception:
+        return None
+
+
+def synthetic_sheet(cells, seed=0):
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    columns = 60
+    rows = cells // columns + 1
+    for r in range(1, rows + 1):
+        for c in range(1, columns + 1):
+            kind = rng.random()
+            if kind < 0.1:
+                continue
+            if kind < 0.6:
+                value = datetime.datetime(rng.randint(1950, 2030), rng.randint(1, 12), rng.randint(1, 28))
+            elif kind < 0.75:
+                value = rng.randint(1, 60000)
+            elif kind < 0.8:
+                value = -rng.random() * 10
+            else:
+                value = rng.choice(TEXT)
+            cell = ws.cell(row=r, column=c, value=value)
+            cell.number_format = rng.choice(FORMATS)
+    return ws, rows, columns
+
+
+def main_():
+    cells = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ws, rows, columns = synthetic_sheet(cells)
+    positions = [(r, c) for r in range(rows) for c in range(columns)]
+    generator = main.PatentReportGenerator.__new__(main.PatentReportGenerator)
+    generator.ws = ws
+    generator.df = pd.DataFrame()
+    generator.log = lambda *args, **kwargs: None
+    print(f"{len(positions)} cells, {len(FORMATS)} number formats")
+
+    start = time.perf_counter()
+    before = [legacy_format_date(ws, r, c) for r, c in positions]
+    legacy_time = time.perf_counter() - start
+    main.compile_date_format.cache_clear()
+    start = time.perf_counter()
+    after = generator.format_dates(positions)
+    batch_time = time.perf_counter() - start
+
+    mismatches = 0
+    for (r, c), old, new in zip(positions, before, after):
+        if old is not None and old != new:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"  ({r}, {c}): {old!r} != {new!r}")
+    print(f"Per-cell format_date: {legacy_time * 1000:8.1f} ms")
+    print(f"Batched format_dates: {batch_time * 1000:8.1f} ms")
+    print(f"Speedup: {legacy_time / max(batch_time, 1e-9):.1f}x, "
+          f"{main.compile_date_format.cache_info().currsize} compiled formats, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_())
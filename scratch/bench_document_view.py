@@ -0,0 +1,118 @@
+"""
+Benchmark paragraph and table lookups: the previous scans over doc.paragraphs/doc.tables
+(new proxies and a fresh p.text for every paragraph on every lookup) against DocumentView,
+which keeps the proxies and the text of each paragraph until the paragraph changes.
+
+Usage:
+    python scratch/bench_document_view.py [paragraphs]
+
+A synthetic report body is generated with section headings, placeholders and tables. Each
+round does the lookups of one generation pass (ORR and Mappings headings, a placeholder,
+the header font scan, the table scan), then rewrites the text of one paragraph in place and
+inserts a new paragraph, the way the processing steps change a report between lookups.
+Both paths must find the same paragraphs every round.
+"""
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from docx import Document  # noqa: E402
+
+import main  # noqa: E402
+
+SECTIONS = ("OBJECTIVE", "OTHER RELATED REFERENCES FOUND", "PATENT-AT-ISSUE", "CRITERIA FOR THE PUBLICATION SEARCH",
+            "MAPPINGS BASED ON SELECTED REFERENCES", "APPENDIX B: SEARCH STRATEGIES", "DISCLAIMER", "ABOUT US")
+HEADERS = ("OBJECTIVE", "PATENT-AT-ISSUE", "CRITERIA FOR THE PUBLICATION SEARCH",
+           "MAPPINGS BASED ON SELECTED REFERENCES", "DISCLAIMER", "APPENDIX A", "APPENDIX B", "SEARCH STRATEGIES")
+WORDS = "widget substrate layer controller signal wherein plurality configured coupled".split()
+
+
+def synthetic_report(paragraphs, seed=0):
+    rng = random.Random(seed)
+    doc = Document()
+    per_section = paragraphs // len(SECTIONS)
+    for heading in SECTIONS:
+        doc.add_paragraph(heading)
+        for i in range(per_section):
+            if i % 40 == 39:
+                table = doc.add_table(rows=3, cols=3)
+                table.rows[0].cells[0].text = "Claim element"
+            else:
+                paragraph = doc.add_paragraph()
+                for _ in range(3):
+                    paragraph.add_run(" ".join(rng.choice(WORDS) for _ in range(7)))
+    doc.paragraphs[-1].add_run(" [MAPPINGS_PARAGRAPH]")
+    return doc
+
+
+def legacy_find(doc, key, case_sensitive=False):
+    key = key if case_sensitive else key.lower()
+    for p in doc.paragraphs:
+        if key in (p.text if case_sensitive else p.text.lower()):
+            return p
+    return None
+
+
+def legacy_round(doc, n):
+    found = [legacy_find(doc, "other related references"), legacy_find(doc, "mappings based on selected references"),
+             legacy_find(doc, "[MAPPINGS_PARAGRAPH]", case_sensitive=True)]
+    headers = sum(any(h in p.text.strip().upper() for h in HEADERS) for p in doc.paragraphs)
+    tables = len(doc.tables)
+    paragraphs = doc.paragraphs
+    paragraphs[n * 7 % len(paragraphs)].text = f"rewritten {n}"
+    paragraphs[n * 11 % len(paragraphs)].insert_paragraph_before(f"inserted {n}")
+    return [p._element for p in found], headers, tables
+
+
+def view_round(generator, doc, n):
+    view = generator.document_view(doc)
+    found = [view.find("other related references"), view.find("mappings based on selected references"),
+             view.find("[MAPPINGS_PARAGRAPH]", case_sensitive=True)]
+    paragraphs = view.paragraphs()
+    headers = sum(any(h in view.text(p).strip().upper() for h in HEADERS) for p in paragraphs)
+    tables = len(view.tables())
+    paragraph = paragraphs[n * 7 % len(paragraphs)]
+    paragraph.text = f"rewritten {n}"
+    generator.touch(paragraph)
+    paragraphs[n * 11 % len(paragraphs)].insert_paragraph_before(f"inserted {n}")
+    return [p._element for p in found], headers, tables
+
+
+def main_():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = 20
+    legacy_doc = synthetic_report(paragraphs)
+    view_doc = synthetic_report(paragraphs)
+    generator = main.PatentReportGenerator.__new__(main.PatentReportGenerator)
+    generator._document_views = {}
+    generator._section_indexes = {}
+    print(f"{len(legacy_doc.element.body)} body elements, {rounds} rounds")
+
+    start = time.perf_counter()
+    before = [legacy_round(legacy_doc, n) for n in range(rounds)]
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    after = [view_round(generator, view_doc, n) for n in range(rounds)]
+    view_time = time.perf_counter() - start
+
+    # Found paragraphs are compared by their final position in each body
+    legacy_body = {el: i for i, el in enumerate(legacy_doc.element.body)}
+    view_body = {el: i for i, el in enumerate(view_doc.element.body)}
+    mismatches = sum(
+        [legacy_body.get(el) for el in old[0]] != [view_body.get(el) for el in new[0]] or old[1:] != new[1:]
+        for old, new in zip(before, after)
+    )
+    if legacy_doc.element.body.xml != view_doc.element.body.xml:
+        mismatches += 1
+    print(f"doc.paragraphs scans: {legacy_time / rounds * 1000:8.2f} ms per round")
+    print(f"DocumentView:         {view_time / rounds * 1000:8.2f} ms per round (first round reads every paragraph)")
+    print(f"Speedup: {legacy_time / max(view_time, 1e-9):.1f}x, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_())
@@ -0,0 +1,122 @@
+"""
+Benchmark the targeted patent page extraction against the full BeautifulSoup parse.
+
+Usage:
+    python scratch/bench_patent_extraction.py [page.html | pages_dir | patent_pages.sqlite3] ...
+
+With no arguments, synthetic Google Patents pages are generated, and pages stored in the
+local page cache are used if it exists. Every page must produce an identical PatentDocument
+on both paths. Only the BeautifulSoup path counts tracemalloc peaks; lxml allocates outside
+the Python heap, so the fast path's figure covers only the Python objects it creates.
+"""
+import os
+import sys
+import glob
+import random
+import sqlite3
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import main  # noqa: E402
+
+WORDS = ("widget substrate layer controller signal wherein plurality configured coupled "
+         "first second processor memory module housing sensor &amp; data &lt;value&gt;").split()
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def synthetic_page(seed, claims=30, description_paragraphs=1200):
+    rng = random.Random(seed)
+    head = ['<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">',
+            '<title>US10123456B2 - Widget thing - Google Patents</title>']
+    for i in range(40):
+        head.append(f'<meta name="citation_reference" content="{sentence(rng, 6)} {i}">')
+    head.append(f'<meta name="DC.description" content="{sentence(rng, 60)} &quot;quoted&quot; a &gt; b">')
+    head.append('<script>var x = "<meta name=\\"DC.description\\" content=\\"fake\\">";</script>')
+    head.append('<!-- <section itemprop="claims">commented out</section> --></head><body>')
+    body = ['<article><section itemprop="abstract"><div class="abstract">' + sentence(rng, 80) + '</div></section>',
+            '<section itemprop="description"><div class="description">']
+    for i in range(description_paragraphs):
+        body.append(f'<div class="description-paragraph" num="{i:04d}">{sentence(rng, 40)}</div>')
+    body.append('</div></section>')
+    body.append(f'<section itemprop="claims" lang="EN">\n  <h2>Claims ({claims})</h2>\n  '
+                '<section class="inner"><span>nested section</span></section>\n  <div class="claims">')
+    for n in range(1, claims + 1):
+        ref = f' of <claim-ref idref="CLM-{n - 1:05d}">claim {n - 1}</claim-ref>' if n > 1 and rng.random() < 0.6 else ""
+        parts = "".join(f'\n      <div class="claim-text">{sentence(rng, 15)};</div>' for _ in range(rng.randint(1, 5)))
+        body.append(f'\n    <div id="CLM-{n:05d}" num="{n:05d}" class="claim">'
+                    f'<div class="claim-text">{n}. The widget{ref}, comprising US {rng.randint(10**6, 10**7)} '
+                    f'and {sentence(rng, 10)}:{parts}\n      <!-- note -->\n    </div></div>')
+    body.append('\n  </div>\n</section>')
+    body.append('<section itemprop="family"><div>' + sentence(rng, 200) + '</div></section></article></body></html>')
+    return ("".join(head) + "".join(body)).encode("utf-8")
+
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(glob.glob(os.path.join(path, "*.htm*"))):
+                with open(name, "rb") as f:
+                    pages.append((os.path.basename(name), f.read()))
+        elif path.endswith(".sqlite3"):
+            with sqlite3.connect(path) as conn:
+                for url, body in conn.execute("SELECT url, body FROM pages"):
+                    pages.append((url, bytes(body)))
+        else:
+            with open(path, "rb") as f:
+                pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def measure(parse, pages, rounds):
+    tracemalloc.start()
+    start = time.process_time()
+    for _ in range(rounds):
+        results = [parse(name, content) for name, content in pages]
+    elapsed = time.process_time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return results, elapsed, peak
+
+
+def same_document(a, b):
+    return (a is not None and b is not None and a.abstract == b.abstract and a.claims == b.claims)
+
+
+def main_():
+    paths = sys.argv[1:]
+    default_cache = os.path.join(main.PAROLA_CACHE_DIR, "patent_pages.sqlite3")
+    if not paths and os.path.exists(default_cache):
+        paths = [default_cache]
+    pages = load_pages(paths)
+    pages += [(f"synthetic-{seed}", synthetic_page(seed)) for seed in range(5)]
+    size = sum(len(content) for _, content in pages)
+    print(f"{len(pages)} pages, {size / 1024:.0f} KB total")
+
+    rounds = 3
+    soup_docs, soup_time, soup_peak = measure(main.parse_patent_document_soup, pages, rounds)
+    fast_docs, fast_time, fast_peak = measure(main.extract_patent_document, pages, rounds)
+
+    mismatches = 0
+    fallbacks = 0
+    for (name, _), soup_doc, fast_doc in zip(pages, soup_docs, fast_docs):
+        if fast_doc is None:
+            fallbacks += 1
+            print(f"  {name}: fast path declined, BeautifulSoup fallback")
+        elif not same_document(soup_doc, fast_doc):
+            mismatches += 1
+            print(f"  {name}: MISMATCH")
+    print(f"BeautifulSoup: {soup_time / rounds * 1000:8.1f} ms CPU per pass, peak {soup_peak / 1024 / 1024:6.1f} MB")
+    print(f"Targeted:      {fast_time / rounds * 1000:8.1f} ms CPU per pass, peak {fast_peak / 1024 / 1024:6.1f} MB")
+    print(f"Speedup: {soup_time / max(fast_time, 1e-9):.1f}x, {fallbacks} fallbacks, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_())
@@ -0,0 +1,169 @@
+"""
+Benchmark placeholder replacement: the previous replace_in_paragraphs_and_tables +
+replace_in_textboxes pair (one p.text scan per key per paragraph, body and top-level tables
+only, then a second walk for textboxes) against replace_placeholders (one walk over the w:t
+nodes of every part, all keys matched at once).
+
+Usage:
+    python scratch/bench_placeholder_replace.py [paragraphs]
+
+A synthetic report is generated with body paragraphs, tables, a textbox and a header, a
+share of them holding placeholders and some placeholders split across runs. The replacement
+calls of one report (title page, patent at issue, criteria, mappings, hits) run on separate
+copies for each path, and the visible text of every paragraph must come out the same.
+"""
+import os
+import sys
+import time
+import random
+from io import BytesIO
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from docx import Document  # noqa: E402
+from docx.oxml import parse_xml  # noqa: E402
+from docx.oxml.ns import nsdecls  # noqa: E402
+
+import main  # noqa: E402
+
+WORDS = "widget substrate layer controller signal wherein plurality configured coupled".split()
+REPLACEMENT_CALLS = (
+    {"[DATE]": "16 OCTOBER 2026", "[CLIENT]": "ACME CORP", "[PUBLICATION_NUMBER]": "US 10,123,456 B2",
+     "[ASSIGNEE]": "Widget Holdings", "[PATENT_TITLE]": "Widget thing", "[SHORT_PATENT_NAME]": "'456 Patent",
+     "[SHORT_PATENT_NAME_V2]": "'456 patent", "[SHORT_PATENT_NAME_LOWER]": "the '456 patent"},
+    {"[PATENT_NUMBER]": "US10123456B2", "[PATENT_ABSTRACT]": "A widget comprising a substrate."},
+    {"[CRITERIA_TEXT]": "Priority date of June 13, 2008."},
+    {"[MAPPINGS_OVERVIEW]": "Mappings for 5 references."},
+    {"[HITS_TOTAL]": "12,345"},
+)
+KEYS = [key for call in REPLACEMENT_CALLS for key in call]
+
+TEXTBOX = (
+    '<w:r %s><w:pict><v:shape><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>[CLIENT]</w:t></w:r></w:p><w:p><w:r><w:t>[DATE]</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></w:r>'
+    % (nsdecls("w") + ' xmlns:v="urn:schemas-microsoft-com:vml"')
+)
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def add_text(rng, paragraph):
+    """Fill a paragraph with a few runs, one in three holding a placeholder, sometimes split."""
+    if rng.random() < 0.33:
+        key = rng.choice(KEYS)
+        if rng.random() < 0.3:
+            cut = rng.randint(1, len(key) - 1)
+            pieces = [sentence(rng, 5) + " ", key[:cut], key[cut:] + " " + sentence(rng, 5)]
+        else:
+            pieces = [sentence(rng, 5) + " ", key, " " + sentence(rng, 5)]
+    else:
+        pieces = [sentence(rng, 8), " " + sentence(rng, 8)]
+    for piece in pieces:
+        run = paragraph.add_run(piece)
+        run.bold = rng.random() < 0.2
+
+
+def synthetic_report(paragraphs, seed=0):
+    rng = random.Random(seed)
+    doc = Document()
+    # The legacy pair only reached header text inside textboxes
+    doc.sections[0].header.paragraphs[0]._p.append(parse_xml(TEXTBOX))
+    doc.add_paragraph()._p.append(parse_xml(TEXTBOX))
+    for i in range(paragraphs):
+        add_text(rng, doc.add_paragraph())
+        if i % 50 == 49:
+            table = doc.add_table(rows=6, cols=4)
+            for row in table.rows:
+                for cell in row.cells:
+                    add_text(rng, cell.paragraphs[0])
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_replace_in_paragraphs_and_tables(doc, replacements):
+    paragraphs = list(doc.paragraphs) + [
+        p for table in doc.tables for row in table.rows for cell in row.cells for p in cell.paragraphs
+    ]
+    for p in paragraphs:
+        for key, val in replacements.items():
+            if key in p.text:
+                inline = p.runs
+                text = "".join(run.text for run in inline)
+                text = text.replace(key, val)
+                for i in range(len(inline) - 1, -1, -1):
+                    p.runs[i].text = ""
+                if not inline:
+                    p.add_run(text)
+                else:
+                    p.runs[0].text = text
+
+
+def legacy_replace_in_textboxes(doc, replacements):
+    parts = [doc.part]
+    for section in doc.sections:
+        parts.append(section.header.part)
+        parts.append(section.footer.part)
+    for part in parts:
+        for t in part.element.xpath(".//*[local-name()='txbxContent']//*[local-name()='t']"):
+            if t.text:
+                for key, val in replacements.items():
+                    if key in t.text:
+                        t.text = t.text.replace(key, val)
+
+
+def legacy(doc):
+    for replacements in REPLACEMENT_CALLS:
+        legacy_replace_in_textboxes(doc, replacements)
+        legacy_replace_in_paragraphs_and_tables(doc, replacements)
+
+
+def engine(generator, doc):
+    for replacements in REPLACEMENT_CALLS:
+        generator.replace_placeholders(doc, replacements)
+
+
+def visible_text(doc):
+    """Text of every paragraph of the document and header parts, textboxes and nested tables included."""
+    return [
+        "".join(t.text or "" for t in nodes)
+        for part in main.document_text_parts(doc)
+        for nodes in main.paragraph_text_nodes(part.element).values()
+    ]
+
+
+def timed(run, docs):
+    start = time.perf_counter()
+    for doc in docs:
+        run(doc)
+    return (time.perf_counter() - start) / len(docs)
+
+
+def main_():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    content = synthetic_report(paragraphs)
+    rounds = 3
+    generator = main.PatentReportGenerator.__new__(main.PatentReportGenerator)
+    generator.log = print
+    print(f"{paragraphs} paragraphs, {paragraphs // 50} tables, {len(KEYS)} keys in {len(REPLACEMENT_CALLS)} calls")
+
+    legacy_docs = [Document(BytesIO(content)) for _ in range(rounds)]
+    walk_docs = [Document(BytesIO(content)) for _ in range(rounds)]
+    legacy_time = timed(legacy, legacy_docs)
+    walk_time = timed(lambda doc: engine(generator, doc), walk_docs)
+
+    expected = visible_text(legacy_docs[0])
+    mismatches = sum(old != new for old, new in zip(expected, visible_text(walk_docs[0])))
+    leftover = sum(key in text for text in visible_text(walk_docs[0]) for key in KEYS)
+    print(f"Legacy per-paragraph replace: {legacy_time * 1000:8.1f} ms per report")
+    print(f"replace_placeholders:         {walk_time * 1000:8.1f} ms per report")
+    print(f"Speedup: {legacy_time / max(walk_time, 1e-9):.1f}x, {mismatches} mismatches, {leftover} placeholders left")
+    return 1 if mismatches or leftover else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_())
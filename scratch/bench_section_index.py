@@ -0,0 +1,115 @@
+"""
+Benchmark section heading lookups: the previous per-routine scans (list(body), a Paragraph
+for every element and its lowercased text, once per heading) against SectionIndex, which
+reads each paragraph's text once and is kept current as elements are inserted or removed.
+
+Usage:
+    python scratch/bench_section_index.py [paragraphs]
+
+A synthetic report body is generated with the section headings the merge routines look
+for. Each round looks up the four headings, inserts a page-break paragraph before the
+Mappings heading and removes it again, the way the merge and normalisation routines move
+through a report. Both paths must report the same heading positions every round.
+"""
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from docx import Document  # noqa: E402
+from docx.oxml import OxmlElement  # noqa: E402
+from docx.text.paragraph import Paragraph  # noqa: E402
+
+import main  # noqa: E402
+
+HEADINGS = ("criteria for the publication search", "mappings based on selected references", "about us", "disclaimer")
+SECTIONS = ("OBJECTIVE", "OTHER RELATED REFERENCES FOUND", "PATENT-AT-ISSUE", "CRITERIA FOR THE PUBLICATION SEARCH",
+            "MAPPINGS BASED ON SELECTED REFERENCES", "APPENDIX B: SEARCH STRATEGIES", "DISCLAIMER", "ABOUT US")
+WORDS = "widget substrate layer controller signal wherein plurality configured coupled".split()
+
+
+def synthetic_report(paragraphs, seed=0):
+    rng = random.Random(seed)
+    doc = Document()
+    per_section = paragraphs // len(SECTIONS)
+    for heading in SECTIONS:
+        doc.add_paragraph(heading)
+        for i in range(per_section):
+            if i % 40 == 39:
+                table = doc.add_table(rows=3, cols=3)
+                table.rows[0].cells[0].text = "Claim element"
+            else:
+                doc.add_paragraph(" ".join(rng.choice(WORDS) for _ in range(20)))
+    return doc
+
+
+def legacy_idx_of(doc, text):
+    body = doc.element.body
+    for i, el in enumerate(list(body)):
+        if el.tag.endswith('p'):
+            p = Paragraph(el, doc)
+            if text.lower() in (p.text or '').lower():
+                return i
+    return None
+
+
+def page_break_paragraph():
+    p = OxmlElement('w:p')
+    r = OxmlElement('w:r')
+    br = OxmlElement('w:br')
+    br.set(main.qn('w:type'), 'page')
+    r.append(br)
+    p.append(r)
+    return p
+
+
+def legacy_round(doc):
+    found = [legacy_idx_of(doc, heading) for heading in HEADINGS]
+    body = doc.element.body
+    mappings = list(body)[found[1]]
+    mappings.addprevious(page_break_paragraph())
+    found.append(legacy_idx_of(doc, HEADINGS[1]))
+    body.remove(mappings.getprevious())
+    return found
+
+
+def index_round(generator, doc):
+    index = generator.section_index(doc)
+    found = [index.index_of(heading) for heading in HEADINGS]
+    mappings = index.first(HEADINGS[1])
+    index.insert_before(mappings, [page_break_paragraph()])
+    found.append(index.index_of(HEADINGS[1]))
+    index.remove([index.previous(mappings)])
+    return found
+
+
+def main_():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = 20
+    legacy_doc = synthetic_report(paragraphs)
+    index_doc = synthetic_report(paragraphs)
+    generator = main.PatentReportGenerator.__new__(main.PatentReportGenerator)
+    generator._section_indexes = {}
+    print(f"{len(legacy_doc.element.body)} body elements, {rounds} rounds")
+
+    start = time.perf_counter()
+    before = [legacy_round(legacy_doc) for _ in range(rounds)]
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    after = [index_round(generator, index_doc) for _ in range(rounds)]
+    index_time = time.perf_counter() - start
+
+    mismatches = sum(old != new for old, new in zip(before, after))
+    if legacy_doc.element.body.xml != index_doc.element.body.xml:
+        mismatches += 1
+    print(f"Per-routine scans: {legacy_time / rounds * 1000:8.2f} ms per round")
+    print(f"SectionIndex:      {index_time / rounds * 1000:8.2f} ms per round (first round builds the index)")
+    print(f"Speedup: {legacy_time / max(index_time, 1e-9):.1f}x, {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_())
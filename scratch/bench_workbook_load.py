@@ -0,0 +1,156 @@
+"""
+Benchmark workbook loading: pd.read_excel + a second openpyxl load (old load_excel)
+against the single-pass read_workbook: every sheet with rich text decoded up front
+("all-sheets"), the report sheets with rich text decoded up front ("rich-text"), and
+the report sheets with plain values and rich text resolved on demand ("after").
+
+Usage:
+    python scratch/bench_workbook_load.py [workbook.xlsx ...]
+
+Without arguments a large synthetic project workbook with auxiliary tabs is generated,
+with its strings moved to the shared string table the way Excel saves them (openpyxl
+writes rich text inline). Each variant runs in a fresh subprocess so peak RSS is measured
+independently; the DataFrames of all variants are also compared for equality (values
+and dtypes).
+"""
+import os
+import sys
+import json
+import time
+import datetime
+import resource
+import subprocess
+import zipfile
+import tempfile
+from io import BytesIO
+from xml.etree import ElementTree
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+VARIANTS = ("before", "all-sheets", "rich-text", "after")
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_workbook(path, rows=4000, references=40, auxiliary_sheets=3):
+    from openpyxl import Workbook
+    from openpyxl.cell.rich_text import CellRichText, TextBlock
+    from openpyxl.cell.text import InlineFont
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws["A1"] = "Project"
+    ws["A2"] = "US10123456B2"
+    for r in range(3, rows):
+        ws.cell(row=r, column=1, value=f"{r}. claim element text number {r}" * 2)
+        for c in range(2, references + 2):
+            if (r + c) % 3 == 0:
+                ws.cell(row=r, column=c, value=CellRichText([f"Ref {c} ", TextBlock(InlineFont(b=True), f"cite {r}")]))
+            elif (r + c) % 3 == 1:
+                ws.cell(row=r, column=c, value=datetime.datetime(2000 + c % 20, 1 + r % 12, 1)).number_format = "d mmmm yyyy"
+            else:
+                ws.cell(row=r, column=c, value=r * c / 7)
+    wb.create_sheet("Matrix")["A1"] = "Matrix"
+    for n in range(auxiliary_sheets):
+        aux = wb.create_sheet(f"Notes {n + 1}")
+        for r in range(1, rows):
+            for c in range(1, references // 2):
+                aux.cell(row=r, column=c, value=f"note {n}-{r}-{c}" if c % 2 else r * c)
+    wb.save(path)
+    excel_style_strings(path)
+
+
+def excel_style_strings(path):
+    """Move inline string cells into a shared string table, as Excel stores them."""
+    ElementTree.register_namespace("", MAIN_NS)
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    table = "xl/sharedStrings.xml"
+    sst = ElementTree.Element(f"{{{MAIN_NS}}}sst")
+    for name in [n for n in parts if n.startswith("xl/worksheets/sheet")]:
+        root = ElementTree.fromstring(parts[name])
+        for cell in root.iter(f"{{{MAIN_NS}}}c"):
+            inline = cell.find(f"{{{MAIN_NS}}}is")
+            if cell.get("t") != "inlineStr" or inline is None:
+                continue
+            si = ElementTree.SubElement(sst, f"{{{MAIN_NS}}}si")
+            si.extend(list(inline))
+            cell.remove(inline)
+            cell.set("t", "s")
+            ElementTree.SubElement(cell, f"{{{MAIN_NS}}}v").text = str(len(sst) - 1)
+        parts[name] = ElementTree.tostring(root, xml_declaration=True, encoding="UTF-8")
+    sst.set("uniqueCount", str(len(sst)))
+    parts[table] = ElementTree.tostring(sst, xml_declaration=True, encoding="UTF-8")
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(b"</Types>", (
+        b'<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+        b'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>'))
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(b"</Relationships>", (
+        b'<Relationship Id="rIdStrings" Target="sharedStrings.xml" Type="http://schemas.'
+        b'openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/></Relationships>'))
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in parts.items():
+            archive.writestr(name, content)
+
+
+def run_variant(variant, path):
+    import main
+    import pandas as pd
+    base = peak_rss_mb()
+    start = time.perf_counter()
+    if variant == "before":
+        df = pd.read_excel(path, header=None)
+        with open(path, "rb") as f:
+            wb = main.load_workbook(BytesIO(f.read()), data_only=True, rich_text=True)
+    else:
+        df, wb, rich_text = main.read_workbook(path, all_sheets=variant == "all-sheets",
+                                               rich_text=variant != "after")
+    elapsed = time.perf_counter() - start
+    df.to_pickle(path + f".{variant}.pkl")
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_rss_mb(), "import_rss_mb": base}))
+
+
+def main_():
+    paths = sys.argv[1:]
+    if not paths:
+        path = os.path.join(tempfile.mkdtemp(), "synthetic_project.xlsx")
+        print("Generating synthetic workbook...")
+        # In a subprocess too: a child process starts from its parent's peak RSS
+        subprocess.run([sys.executable, __file__, "--generate", path], check=True)
+        paths = [path]
+    import pandas as pd
+    failed = False
+    for path in paths:
+        results = {}
+        for variant in VARIANTS:
+            out = subprocess.run([sys.executable, __file__, "--variant", variant, path],
+                                 capture_output=True, text=True, check=True)
+            results[variant] = json.loads(out.stdout.strip().splitlines()[-1])
+        before = pd.read_pickle(path + ".before.pkl")
+        same = True
+        for variant in VARIANTS[1:]:
+            after = pd.read_pickle(path + f".{variant}.pkl")
+            same &= bool(before.equals(after) and (before.dtypes == after.dtypes).all())
+        failed |= not same
+        print(f"{os.path.basename(path)} ({os.path.getsize(path) / 1024 / 1024:.1f} MB, {before.shape[0]}x{before.shape[1]})")
+        for variant in VARIANTS:
+            r = results[variant]
+            print(f"  {variant:10s}: {r['seconds']:6.2f} s, peak RSS {r['peak_rss_mb']:7.1f} MB "
+                  f"(+{r['peak_rss_mb'] - r['import_rss_mb']:.1f} MB over imports)")
+        print(f"  identical DataFrame: {same}")
+        for variant in VARIANTS:
+            os.remove(path + f".{variant}.pkl")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--variant":
+        run_variant(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) > 2 and sys.argv[1] == "--generate":
+        synthetic_workbook(sys.argv[2])
+    else:
+        sys.exit(main_())
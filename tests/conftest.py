@@ -0,0 +1,225 @@
+"""
+Shared fixtures: a small project workbook, an Invalidity template and a patent page, plus a
+network stub, so a whole report can be generated offline. The cache directory is pointed at
+a temporary directory before main is imported, as main reads it at import time.
+"""
+import os
+import re
+import sys
+import datetime
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["PAROLA_CACHE_DIR"] = tempfile.mkdtemp(prefix="parola-tests-")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pytest  # noqa: E402
+import requests  # noqa: E402
+from requests.models import Response  # noqa: E402
+from docx import Document  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+from openpyxl.styles import PatternFill  # noqa: E402
+from openpyxl.styles.colors import Color  # noqa: E402
+from openpyxl.cell.rich_text import CellRichText, TextBlock  # noqa: E402
+from openpyxl.cell.text import InlineFont  # noqa: E402
+
+import main  # noqa: E402
+
+WORKBOOK_NAME = "Proj-123 Acme Corp US10123456B2.xlsx"
+
+
+def make_workbook(path, nrefs=6, nclaims=3):
+    """A project workbook laid out like the ones the generator reads, with a Matrix sheet."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    ws.cell(1, 1, "Patent Number")
+    ws.cell(2, 1, "US10123456B2 (target)")
+    ws.cell(2, 2, datetime.datetime(2014, 1, 5)).number_format = "d mmmm yyyy"
+    ws.cell(2, 4, "ACME Corp")
+    ws.cell(2, 5, "Widget thing")
+    ws.cell(3, 1, "Required Claims")
+    ws.cell(3, 2, f"1-{nclaims}")
+    rank_row = 14
+    for c in range(2, 2 + nrefs):
+        i = c - 2
+        ws.cell(rank_row - 9, c, f"US{9000000 + i}B2" if i % 3 else f"US2019{i:07d}A1")
+        ws.cell(rank_row - 8, c, datetime.datetime(2010, 1 + i % 12, 3)).number_format = \
+            ["d mmmm yyyy", "mmmm yyyy", "yyyy", "mmm yyyy"][i % 4]
+        ws.cell(rank_row - 7, c, datetime.datetime(2011, 2, 14)).number_format = "dd/mm/yyyy"
+        ws.cell(rank_row - 6, c, "03 March 2012" if i % 2 else datetime.datetime(2012, 3, 3))
+        ws.cell(rank_row - 5, c, f"Current {i}")
+        ws.cell(rank_row - 4, c, f"Original {i}")
+        ws.cell(rank_row - 3, c, f"Title {i} ")
+        ws.cell(rank_row - 2, c, "https://patents.google.com/patent/X" if i != 2 else "https://example.com/paper")
+        ws.cell(rank_row, c, chr(65 + i) if i < nrefs - 2 else ("RR" if i == nrefs - 2 else "RR NPL"))
+    ws.cell(rank_row, 1, "Rank")
+    comments_row = rank_row + 4
+    ws.cell(comments_row, 1, "Expert Comments")
+    r = comments_row + 1
+    for n in range(1, nclaims + 1):
+        for fragment in (f"{n}. A method comprising:", "a first step;", "a second step"):
+            ws.cell(r, 1, fragment)
+            for c in range(2, 2 + nrefs - 2):
+                if (r + c) % 2:
+                    ws.cell(r, c, CellRichText([TextBlock(InlineFont(b=True, sz=11), "Bold bit "), "plain tail"]))
+                elif (r + c) % 3:
+                    ws.cell(r, c, f"plain {r}-{c}")
+            r += 1
+    r += 2
+    for c, header in enumerate(("Database", "Scope", "Hits", "Query"), start=1):
+        ws.cell(r, c, header)
+    for i, db in enumerate(("Orbit", "Google Patents", "PQAI", "Espacenet")):
+        ws.cell(r + 1 + i, 1, db)
+        ws.cell(r + 1 + i, 2, "Full text")
+        ws.cell(r + 1 + i, 3, f"{(i + 1) * 1234:,}")
+        ws.cell(r + 1 + i, 4, "widget AND gadget NEAR/3 thing" if i != 2 else "a natural language query")
+    matrix = wb.create_sheet("Matrix")
+    matrix.cell(1, 1, "x")
+    for j, rank in enumerate("ABCD"):
+        matrix.cell(2, 6 + j, rank)
+    matrix.cell(3, 4, "Key Concept")
+    for k in range(5):
+        matrix.cell(4 + k, 4, CellRichText([TextBlock(InlineFont(i=True), f"Concept {k} "), "more"])
+                    if k % 2 else f"Concept {k}")
+        for j in range(4):
+            if (k + j) % 3 == 0:
+                matrix.cell(4 + k, 6 + j).fill = PatternFill(
+                    "solid", fgColor=Color(theme=4 + j, tint=0.4 if j % 2 else -0.25))
+            elif (k + j) % 3 == 1:
+                matrix.cell(4 + k, 6 + j).fill = PatternFill("solid", fgColor="FFFF0000")
+    wb.active = 0
+    wb.save(path)
+
+
+def make_template(path):
+    """An Invalidity template holding the placeholders and section headings the generator fills in."""
+    d = Document()
+    for text in ("[DATE]", "[CLIENT]", "[PUBLICATION_NUMBER]", "[ASSIGNEE]", "[PATENT_TITLE]",
+                 "Report on [SHORT_PATENT_NAME] / [SHORT_PATENT_NAME_V2] / [SHORT_PATENT_NAME_LOWER]"):
+        d.add_paragraph(text)
+    p = d.add_paragraph("Split ")
+    p.add_run("[CLI")
+    p.add_run("ENT] here")
+    d.add_paragraph("OBJECTIVE")
+    d.add_paragraph("[OBJECTIVE_TEXT]")
+    d.add_paragraph("[REFERENCE_LIST]")
+    d.add_paragraph("")
+    d.add_paragraph("OTHER RELATED REFERENCES FOUND")
+    t = d.add_table(rows=2, cols=3)
+    for cell, text in zip(t.rows[0].cells, ("#", "References Found", "Assignee")):
+        cell.text = text
+    for cell, text in zip(t.rows[1].cells, ("[REF_INDEX]", "[REF_ENTRY]", "[REF_OWNER]")):
+        cell.text = text
+    d.add_paragraph("PATENT-AT-ISSUE")
+    for text in ("[PATENT_AT_ISSUE_NUMBER]", "[PATENT_AT_ISSUE_ASSIGNEE]", "[PATENT_AT_ISSUE_PRIORITY_DATE]",
+                 "[PATENT_AT_ISSUE_ABSTRACT]"):
+        d.add_paragraph(text)
+    d.add_paragraph("CRITERIA FOR THE PUBLICATION SEARCH")
+    d.add_paragraph("[CRITERIA_TEXT]")
+    d.add_paragraph("MAPPINGS OVERVIEW")
+    d.add_paragraph("The mappings of [MAPPINGS_OVERVIEW] are below.")
+    k = d.add_table(rows=2, cols=2)
+    k.rows[0].cells[0].text = "Key Concepts"
+    k.rows[0].cells[1].text = "A"
+    d.add_paragraph("MAPPINGS BASED ON SELECTED REFERENCES")
+    d.add_paragraph("[MAPPINGS_PARAGRAPH]")
+    mt = d.add_table(rows=2, cols=2)
+    mt.rows[0].cells[0].text = "[CLAIM_HEADER1]"
+    mt.rows[0].cells[1].text = "[REFERENCE_HEADER1]"
+    mt.rows[1].cells[0].text = "[CLAIM_ELEMENT]"
+    mt.rows[1].cells[1].text = "[REFERENCE_DISCLOSURE/S]"
+    d.add_paragraph("APPENDIX B: SEARCH STRATEGIES")
+    d.add_paragraph("The search strategy below resulted in [HITS_TOTAL] hits.")
+    st = d.add_table(rows=2, cols=5)
+    for cell, text in zip(st.rows[0].cells, ("#", "Database", "Scope", "Query", "Hits")):
+        cell.text = text
+    for cell, text in zip(st.rows[1].cells, ("[ROW_INDEX]", "[DB]", "[SCOPE]", "[QUERY]", "[HITS]")):
+        cell.text = text
+    d.add_paragraph("DISCLAIMER")
+    d.add_paragraph("Some disclaimer text.")
+    d.add_paragraph("ABOUT US")
+    d.save(path)
+
+
+def make_page(nclaims=5):
+    """A Google Patents page with an abstract and nclaims claims."""
+    claims = "".join(
+        f'<div class="claim" num="{n:05d}"><div class="claim-text">{n}. A method of US1234567 comprising:</div>'
+        f'<div class="claim-text">a step &amp; another; <claim-ref idref="CLM-1">claim 1</claim-ref></div>\n'
+        f'<div class="claim-text">wherein x.</div></div>\n'
+        for n in range(1, nclaims + 1))
+    return ('<html><head><meta name="DC.description" content="  An abstract &amp; more &quot;text&quot;.">'
+            '<title>x</title></head><body><p>filler</p>'
+            f'<section itemprop="claims" itemscope><h2>Claims ({nclaims})</h2><div class="claims">{claims}'
+            '</div></section><section itemprop="description"><p>desc</p></section></body></html>').encode()
+
+
+@pytest.fixture(autouse=True)
+def network(monkeypatch):
+    """Every HTTP request is answered with the fixture patent page; the requested URLs are recorded."""
+    calls = []
+    page = make_page()
+
+    def send(self, request, **kwargs):
+        calls.append(request.url)
+        response = Response()
+        response.status_code = 200
+        response._content = page
+        response.url = request.url
+        response.request = request
+        return response
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    return calls
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Paths of a project workbook and an Invalidity template."""
+    workbook = tmp_path / WORKBOOK_NAME
+    template = tmp_path / "Invalidity_Template.docx"
+    make_workbook(str(workbook))
+    make_template(str(template))
+    return {"workbook": str(workbook), "template": str(template), "dir": tmp_path}
+
+
+def generate_report(workbook, template, out, update=None):
+    """Run every step of an Invalidity report (or an update of the report at update) and save it to out."""
+    logs = []
+    generator = main.PatentReportGenerator(logs.append, lambda *args: None, "Invalidity",
+                                           update_mode=bool(update), edited_report_path=update)
+    generator.load_excel(workbook)
+    if update:
+        generator.load_edited_report()
+    generator.extract_patent_at_issue_and_claims()
+    generator.process_references()
+    generator.extract_search_results()
+    generator.load_template(template)
+    generator.setup_update_mode_documents()
+    generator.process_title_page()
+    generator.process_objectives()
+    generator.process_other_related_references()
+    generator.process_patent_at_issue()
+    generator.process_criteria()
+    generator.process_mappings()
+    generator.process_search_strings()
+    generator.merge_generated_sections()
+    generator.save_report(out)
+    generator.logs = logs
+    return generator
+
+
+def document_xml(path):
+    """word/document.xml of a saved report, with relationship ids normalised."""
+    import zipfile
+    with zipfile.ZipFile(path) as z:
+        xml = z.read("word/document.xml").decode()
+    return re.sub(r'r:id="rId\d+"', 'r:id="X"', xml)
+
+
+def visible_text(doc):
+    """Text of every paragraph of the document, headers, footers and textboxes included."""
+    return ["".join(t.text or "" for t in nodes)
+            for part in main.document_text_parts(doc)
+            for nodes in main.paragraph_text_nodes(part.element).values()]
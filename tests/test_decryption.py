@@ -0,0 +1,89 @@
+import hashlib
+import io
+import os
+import stat
+
+import msoffcrypto
+import pytest
+from docx import Document
+
+import main
+
+PASSWORD = "parolatools"
+
+
+def encrypted(content, password=PASSWORD):
+    out = io.BytesIO()
+    msoffcrypto.OfficeFile(io.BytesIO(content)).encrypt(password, out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def template_bytes(project):
+    with open(project["template"], "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def decrypted_cache(monkeypatch):
+    cache = main.DecryptedDocumentCache()
+    monkeypatch.setattr(main, "DECRYPTED_DOCUMENT_CACHE", cache)
+    return cache
+
+
+def test_files_are_sniffed_from_their_first_bytes(template_bytes):
+    assert main.office_file_format(template_bytes) == "zip"
+    assert main.office_file_format(encrypted(template_bytes)) == "cfb"
+    assert main.office_file_format(b"<html>") is None
+    assert main.unlock_password_protected_docx(template_bytes, PASSWORD).getvalue() == template_bytes
+
+
+def test_encrypted_template_is_decrypted_once_per_process(project, template_bytes, decrypted_cache, monkeypatch):
+    path = project["dir"] / "Encrypted_Template.docx"
+    path.write_bytes(encrypted(template_bytes))
+    generator = main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity")
+    generator.load_template(str(path))
+    assert generator.template_bytes == template_bytes
+    assert "[OBJECTIVE_TEXT]" in [p.text for p in generator.doc.paragraphs]
+
+    def no_decryption(*args, **kwargs):
+        raise AssertionError("decrypted again")
+    monkeypatch.setattr(msoffcrypto, "OfficeFile", no_decryption)
+    again = main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity")
+    again.load_template(str(path))
+    assert again.template_bytes == template_bytes
+
+
+def test_cached_copy_is_not_returned_for_another_password(project, template_bytes, decrypted_cache):
+    path = project["dir"] / "Encrypted_Template.docx"
+    path.write_bytes(encrypted(template_bytes))
+    main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity").load_template(str(path))
+
+    wrong = main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity",
+                                       template_password="guess")
+    with pytest.raises(Exception, match="password"):
+        wrong.load_template(str(path))
+
+
+def test_disk_entries_are_keyed_by_ciphertext_and_private(tmp_path, template_bytes):
+    data = encrypted(template_bytes)
+    directory = tmp_path / "decrypted_templates"
+    cache = main.DecryptedDocumentCache(str(directory))
+    key = cache.key(data)
+    assert key == hashlib.sha256(data).hexdigest()
+    cache.put(key, PASSWORD, template_bytes)
+
+    assert sorted(os.listdir(directory)) == [key + ".sealed", "secret.key"]
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    for name in os.listdir(directory):
+        assert stat.S_IMODE(os.stat(directory / name).st_mode) == 0o600
+    # The stored tag is keyed by the local secret, not derivable from the password alone
+    with open(directory / (key + ".sealed"), "rb") as f:
+        stored = f.read()
+    assert hashlib.sha256(PASSWORD.encode() + b"\0" + data).digest() not in stored
+
+    # A new process reads the entry back with the right password only
+    fresh = main.DecryptedDocumentCache(str(directory))
+    assert fresh.get(key, "guess") is None
+    assert fresh.get(key, PASSWORD) == template_bytes
+    assert Document(io.BytesIO(fresh.get(key, PASSWORD))).paragraphs[0].text == "[DATE]"
@@ -0,0 +1,90 @@
+import pytest
+from docx import Document
+
+import main
+from conftest import generate_report
+
+HEADINGS = ("OBJECTIVE", "OTHER RELATED REFERENCES FOUND", "PATENT-AT-ISSUE", "CRITERIA FOR THE PUBLICATION SEARCH",
+            "MAPPINGS OVERVIEW", "MAPPINGS BASED ON SELECTED REFERENCES", "APPENDIX B: SEARCH STRATEGIES",
+            "DISCLAIMER", "ABOUT US")
+STEPS = ("process_title_page", "process_objectives", "process_other_related_references", "process_patent_at_issue",
+         "process_criteria", "process_mappings", "process_search_strings", "merge_generated_sections")
+
+
+def stale_entries(generator):
+    """Cached paragraph texts of the generator's views and section indexes that no longer match the document."""
+    stale = []
+    for view in generator._document_views.values():
+        for el, text in view._text.items():
+            if text != (el.text or ""):
+                stale.append(("view", text, el.text))
+        for el, lower in view._lower.items():
+            if lower != (el.text or "").lower():
+                stale.append(("view lower", lower, el.text))
+    for index in generator._section_indexes.values():
+        for el, text in index._text.items():
+            if text != (el.text or "").strip():
+                stale.append(("index", text, el.text))
+    return stale
+
+
+def new_generator(report_type="Invalidity"):
+    return main.PatentReportGenerator(lambda *args: None, lambda *args: None, report_type)
+
+
+@pytest.mark.parametrize("heading", HEADINGS)
+def test_headings_edited_in_place_are_found_under_their_new_text(heading):
+    doc = Document()
+    for text in HEADINGS:
+        doc.add_paragraph(text)
+        doc.add_paragraph("Body text.")
+    generator = new_generator()
+    view = generator.document_view(doc)
+    index = generator.section_index(doc)
+    assert view.find(heading).text == heading
+    assert index.first(heading.lower()) is not None
+
+    paragraph = next(p for p in view.paragraphs() if view.text(p) == heading)
+    paragraph.text = f"Renamed {heading}"
+    generator.touch(paragraph)
+
+    view = generator.document_view(doc)
+    index = generator.section_index(doc)
+    assert view.find(f"renamed {heading}")._p is paragraph._p
+    assert view.text(paragraph) == f"Renamed {heading}"
+    assert index.first(f"renamed {heading.lower()}") is paragraph._p
+    assert index.first(heading.lower(), exact=True) is None
+    assert not stale_entries(generator)
+
+
+def test_paragraphs_rewritten_without_touch_are_never_returned_for_their_old_text():
+    doc = Document()
+    doc.add_paragraph("DISCLAIMER")
+    later = doc.add_paragraph("Also a disclaimer")
+    generator = new_generator()
+    view = generator.document_view(doc)
+    assert view.find("disclaimer")._p is doc.paragraphs[0]._p
+    doc.paragraphs[0].text = "Notice"
+
+    assert view.find("disclaimer")._p is later._p
+
+
+@pytest.mark.parametrize("report_type, update", [("Invalidity", False), ("Invalidity", True), ("FTO", False)])
+def test_no_cached_paragraph_text_goes_stale_during_generation(project, report_type, update):
+    edited = None
+    if update:
+        edited = str(project["dir"] / "first.docx")
+        generate_report(project["workbook"], project["template"], edited)
+    generator = main.PatentReportGenerator(lambda *args: None, lambda *args: None, report_type,
+                                           update_mode=update, edited_report_path=edited)
+    generator.load_excel(project["workbook"])
+    if update:
+        generator.load_edited_report()
+    generator.extract_patent_at_issue_and_claims()
+    generator.process_references()
+    generator.extract_search_results()
+    generator.load_template(project["template"])
+    generator.setup_update_mode_documents()
+    for step in STEPS:
+        getattr(generator, step)()
+        assert stale_entries(generator) == [], step
@@ -0,0 +1,65 @@
+"""
+PatentPageCache keeps one SQLite connection per thread, and cached pages can be dropped
+from the command line.
+"""
+import threading
+
+import pytest
+
+import main
+
+URL = main.GOOGLE_PATENTS_URL.format("US10123456B2")
+OTHER_URL = main.GOOGLE_PATENTS_URL.format("US9000001B2")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = main.PatentPageCache(str(tmp_path / "pages.sqlite3"))
+    monkeypatch.setattr(main, "PATENT_PAGE_CACHE", cache)
+    yield cache
+    cache.close()
+
+
+def test_lookups_reuse_one_connection_per_thread(cache):
+    cache.put(URL, b"<html>page</html>")
+    conn = cache._connect()
+    for _ in range(5):
+        assert cache.get(URL) == b"<html>page</html>"
+        assert cache._connect() is conn
+
+    others = []
+    thread = threading.Thread(target=lambda: others.append((cache.get(URL), cache._connect())))
+    thread.start()
+    thread.join()
+    assert others[0][0] == b"<html>page</html>"
+    assert others[0][1] is not conn
+
+
+def test_close_releases_the_connection_and_the_next_lookup_reopens(cache):
+    cache.put(URL, b"<html>page</html>")
+    conn = cache._connect()
+    cache.close()
+    with pytest.raises(main.sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert cache.get(URL) == b"<html>page</html>"
+    assert cache._connect() is not conn
+
+
+def test_forget_pages_drops_only_the_named_pages(cache, capsys):
+    cache.put(URL, b"one")
+    cache.put(OTHER_URL, b"two")
+
+    assert main.run_command_line(["forget-pages", "US10123456B2"]) == 0
+    assert "1 cached pages dropped" in capsys.readouterr().out
+    assert cache.get(URL) is None
+    assert cache.get(OTHER_URL) == b"two"
+
+    assert main.run_command_line(["forget-pages", "--all"]) == 0
+    assert cache.get(OTHER_URL) is None
+
+
+def test_forget_pages_needs_numbers_or_all(cache):
+    with pytest.raises(SystemExit):
+        main.run_command_line(["forget-pages"])
+    with pytest.raises(SystemExit):
+        main.run_command_line(["forget-pages", "US10123456B2", "--all"])
@@ -0,0 +1,68 @@
+from io import BytesIO
+
+from docx import Document
+
+import main
+from conftest import visible_text
+
+
+def new_generator():
+    return main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity")
+
+
+def saved(doc):
+    buffer = BytesIO()
+    doc.save(buffer)
+    return Document(BytesIO(buffer.getvalue()))
+
+
+def test_replaces_tokens_in_rows_and_tables_cloned_from_the_template(project):
+    generator = new_generator()
+    generator.load_template(project["template"])
+    doc = generator.doc
+    table = generator.find_table_with_placeholder(doc, "[REF_INDEX]")
+    template_row = generator.find_row_with_placeholder(table, "[REF_INDEX]")
+    generator.clone_row_after(table, template_row)
+    generator.clone_row_after(table, template_row)
+    doc.element.body.append(main.deepcopy(table._tbl))
+
+    generator.replace_placeholders(doc, {"[REF_INDEX]": "7", "[REF_OWNER]": "Widget Holdings"})
+
+    texts = visible_text(doc)
+    assert not any("[REF_INDEX]" in text or "[REF_OWNER]" in text for text in texts)
+    assert texts.count("7") == 6
+    assert texts.count("Widget Holdings") == 6
+
+
+def test_headers_footers_and_split_runs_are_rewritten_in_the_saved_document():
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Prepared for [CLIENT]"
+    footer = doc.sections[0].footer.paragraphs[0]
+    footer.add_run("Dated [DA")
+    footer.add_run("TE]").bold = True
+    body = doc.add_paragraph("Report on ")
+    body.add_run("[SHORT_").italic = True
+    body.add_run("PATENT_NAME] for [CLI")
+    body.add_run("ENT].")
+    before = saved(doc)
+    assert before.sections[0].header.paragraphs[0].text == "Prepared for [CLIENT]"
+    assert before.sections[0].footer.paragraphs[0].text == "Dated [DATE]"
+
+    new_generator().replace_placeholders(before, {"[CLIENT]": "ACME Corp", "[DATE]": "16 OCTOBER 2026",
+                                                  "[SHORT_PATENT_NAME]": "'456 Patent"})
+    after = saved(before)
+
+    assert after.sections[0].header.paragraphs[0].text == "Prepared for ACME Corp"
+    assert after.sections[0].footer.paragraphs[0].text == "Dated 16 OCTOBER 2026"
+    paragraph = after.paragraphs[-1]
+    assert paragraph.text == "Report on '456 Patent for ACME Corp."
+    # Each value goes into the run where its placeholder started, keeping that run's formatting
+    assert [(run.text, run.italic) for run in paragraph.runs] == [
+        ("Report on ", None), ("'456 Patent", True), (" for ACME Corp", None), (".", None)]
+
+
+def test_values_are_not_searched_again():
+    doc = Document()
+    doc.add_paragraph("[A] and [B]")
+    new_generator().replace_placeholders(doc, {"[A]": "[B]", "[B]": "x"})
+    assert doc.paragraphs[0].text == "[B] and x"
@@ -0,0 +1,94 @@
+import io
+import re
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.reader.strings import read_string_table
+
+import main
+
+# <si> / <is> bodies with Excel's _xHHHH_ escapes, escaped escapes, whitespace, empty and
+# phonetic entries, and plain text ahead of formatted runs
+STRINGS = [
+    '<t>plain</t>',
+    '<t>carriage_x000D_return</t>',
+    '<t>escaped _x005F_x000D_ literal</t>',
+    '<t xml:space="preserve">  padded  </t>',
+    '<t/>',
+    '',
+    '<r><rPr><b/></rPr><t>Bold_x005F_x0009_ </t></r><r><t>tail x005F_</t></r>',
+    '<t>base</t><rPh sb="0" eb="1"><t>phonetic</t></rPh><phoneticPr fontId="1"/>',
+    '<t>lead</t><r><rPr><i/></rPr><t>run</t></r>',
+    '<r><t xml:space="preserve"> </t></r><r><rPr><sz val="9"/></rPr><t>x005F_x005F_</t></r>',
+    '<r><rPr><b/><sz val="11"/></rPr><t>Claim _x005F_x0031_</t></r><r><t xml:space="preserve"> &amp; more</t></r>',
+]
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def workbook_with_strings():
+    """An .xlsx whose column A holds STRINGS as shared strings and column B as inline strings."""
+    wb = Workbook()
+    wb.active["A1"] = "x"
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    rows = "".join(f'<row r="{i}"><c r="A{i}" t="s"><v>{i - 1}</v></c>'
+                   f'<c r="B{i}" t="inlineStr"><is>{body}</is></c></row>'
+                   for i, body in enumerate(STRINGS, start=1))
+    out = io.BytesIO()
+    with zipfile.ZipFile(buffer) as src, zipfile.ZipFile(out, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename).decode()
+            if item.filename == "xl/worksheets/sheet1.xml":
+                data = re.sub(r"<sheetData>.*</sheetData>", f"<sheetData>{rows}</sheetData>", data)
+                data = re.sub(r'<dimension ref="[^"]*"/>', f'<dimension ref="A1:B{len(STRINGS)}"/>', data)
+            elif item.filename == "xl/_rels/workbook.xml.rels":
+                data = data.replace("</Relationships>", (
+                    '<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+                    'sharedStrings" Target="sharedStrings.xml" Id="rId99"/></Relationships>'))
+            elif item.filename == "[Content_Types].xml":
+                data = data.replace("</Types>", (
+                    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>'))
+            dst.writestr(item, data)
+        dst.writestr("xl/sharedStrings.xml", (
+            f'<?xml version="1.0" encoding="UTF-8"?><sst xmlns="{MAIN_NS}" count="{len(STRINGS)}" '
+            f'uniqueCount="{len(STRINGS)}">' + "".join(f"<si>{body}</si>" for body in STRINGS) + "</sst>"))
+    return out.getvalue()
+
+
+@pytest.fixture(scope="module")
+def content():
+    return workbook_with_strings()
+
+
+def test_plain_string_table_matches_openpyxl(content):
+    with zipfile.ZipFile(io.BytesIO(content)) as z:
+        expected = read_string_table(z.open("xl/sharedStrings.xml"))
+        strings, formatted = main.read_plain_string_table(z.open("xl/sharedStrings.xml"))
+    assert strings == expected
+    assert formatted == {6, 8, 9, 10}
+
+
+def test_cell_values_match_openpyxl_plain_and_rich_text_loads(content):
+    plain = load_workbook(io.BytesIO(content)).active
+    rich = load_workbook(io.BytesIO(content), rich_text=True).active
+    df, wb, resolver = main.read_workbook(None, content=content)
+    ws = wb.active
+    for row in range(1, len(STRINGS) + 1):
+        for col in (1, 2):
+            cell = ws.cell(row, col)
+            assert cell.value == plain.cell(row, col).value, (row, col)
+            expected = rich.cell(row, col).value
+            value = resolver.value(cell)
+            assert type(value) is type(expected), (row, col)
+            assert main.rich_text_runs(value) == main.rich_text_runs(expected), (row, col)
+    assert df.iloc[2, 0] == "escaped _x000D_ literal"
+
+
+def test_shared_strings_cut_from_the_xml_match_a_full_parse(content):
+    _, wb, resolver = main.read_workbook(None, content=content)
+    with zipfile.ZipFile(io.BytesIO(content)) as z:
+        expected = read_string_table(z.open("xl/sharedStrings.xml"))
+    for index in sorted(resolver.formatted_strings):
+        assert main.shared_string_text(resolver.shared_string_element(index)) == expected[index]
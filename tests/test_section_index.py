@@ -0,0 +1,104 @@
+"""
+SectionIndex keeps its heading lookups in step with the body while sections are moved,
+removed and carried over from an edited report.
+"""
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+import main
+from conftest import generate_report
+
+KEYS = ("objective", "criteria for the publication search", "mappings based on selected references",
+        "about us", "disclaimer", "appendix")
+
+
+def body_text(doc):
+    return [el.xpath("string(.)") for el in doc.element.body if el.tag != main.qn("w:sectPr")]
+
+
+def assert_index_current(index, doc):
+    fresh = main.SectionIndex(doc.element.body)
+    assert index.elements() == fresh.elements()
+    for key in KEYS:
+        assert index.index_of(key) == fresh.index_of(key)
+        assert index.matches(key) == fresh.matches(key)
+
+
+def misplaced_mappings_report():
+    doc = Document()
+    doc.add_paragraph("OBJECTIVE")
+    doc.add_paragraph("Objective text.")
+    doc.add_paragraph("CRITERIA FOR THE PUBLICATION SEARCH")
+    doc.add_paragraph("Criteria text.")
+    doc.add_paragraph("ABOUT US")
+    doc.add_paragraph("About text.")
+    doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    doc.add_paragraph("MAPPINGS BASED ON SELECTED REFERENCES").paragraph_format.page_break_before = True
+    doc.add_paragraph("Mappings text.")
+    doc.add_table(rows=1, cols=2).rows[0].cells[0].text = "Claim 1 Elements"
+    doc.add_paragraph("DISCLAIMER")
+    doc.add_paragraph("Disclaimer text.")
+    return doc
+
+
+def test_mappings_placed_after_about_us_move_behind_the_criteria():
+    doc = misplaced_mappings_report()
+    generator = main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity")
+    index = generator.section_index(doc)
+    assert index.index_of("about us") < index.index_of("mappings based on selected references")
+
+    generator.relocate_mappings_after_criteria_if_needed(doc)
+
+    assert body_text(doc) == [
+        "OBJECTIVE", "Objective text.", "CRITERIA FOR THE PUBLICATION SEARCH", "Criteria text.",
+        "MAPPINGS BASED ON SELECTED REFERENCES", "Mappings text.", "Claim 1 Elements",
+        "ABOUT US", "About text.", "DISCLAIMER", "Disclaimer text.",
+    ]
+    header = index.first("mappings based on selected references")
+    assert not header.xpath("./w:pPr/w:pageBreakBefore")
+    assert not any(main.has_page_break(el) for el in doc.element.body if el.tag == main.W_P)
+    assert generator.section_index(doc) is index
+    assert_index_current(index, doc)
+
+
+def test_removed_and_extracted_sections_leave_the_index_current():
+    doc = misplaced_mappings_report()
+    index = main.SectionIndex(doc.element.body)
+
+    mapping = main.extract_mapping_section(doc, index)
+    assert [el.xpath("string(.)") for el in mapping] == [
+        "MAPPINGS BASED ON SELECTED REFERENCES", "Mappings text.", "Claim 1 Elements",
+    ]
+
+    main.remove_section(doc, "about us", "mappings based on selected references", index)
+    assert "ABOUT US" not in body_text(doc)
+    assert_index_current(index, doc)
+
+    # Elements added behind the index's back are picked up by sync()
+    doc.add_paragraph("APPENDIX A")
+    index.sync()
+    assert_index_current(index, doc)
+
+
+def test_update_keeps_edits_made_inside_the_mappings_section(project):
+    out = project["dir"]
+    first = str(out / "first.docx")
+    edited = str(out / "edited.docx")
+    updated = str(out / "updated.docx")
+    generate_report(project["workbook"], project["template"], first)
+
+    doc = Document(first)
+    doc.tables[3].rows[-1].cells[1].add_paragraph("Reviewer note on claim 2.")
+    doc.tables[4].rows[-1].cells[1].paragraphs[0].insert_paragraph_before("Reviewer note on claim 3.")
+    doc.save(edited)
+    generate_report(project["workbook"], project["template"], updated, update=edited)
+
+    text = body_text(Document(updated))
+    assert text.count("MAPPINGS BASED ON SELECTED REFERENCES") == 1
+    headings = [t for t in text if t in ("CRITERIA FOR THE PUBLICATION SEARCH", "MAPPINGS BASED ON SELECTED REFERENCES",
+                                         "APPENDIX B: SEARCH STRATEGIES", "DISCLAIMER", "ABOUT US")]
+    assert headings == ["CRITERIA FOR THE PUBLICATION SEARCH", "MAPPINGS BASED ON SELECTED REFERENCES",
+                        "APPENDIX B: SEARCH STRATEGIES", "DISCLAIMER", "ABOUT US"]
+    mappings = text[text.index("MAPPINGS BASED ON SELECTED REFERENCES"):text.index("APPENDIX B: SEARCH STRATEGIES")]
+    assert any("Reviewer note on claim 2." in t for t in mappings)
+    assert any("Reviewer note on claim 3." in t for t in mappings)
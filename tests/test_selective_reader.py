@@ -0,0 +1,66 @@
+from openpyxl import Workbook, load_workbook
+from openpyxl.workbook.defined_name import DefinedName
+
+import main
+
+
+def make_workbook(path):
+    wb = Workbook()
+    wb.active.title = "Data"
+    wb["Data"]["A1"] = "Patent Number"
+    for title in ("Aux1", "Matrix", "Aux2", "Notes"):
+        wb.create_sheet(title)["A1"] = title
+    wb.defined_names["Total"] = DefinedName("Total", attr_text="Data!$A$1")
+    for title in ("Aux1", "Matrix", "Notes"):
+        wb[title].defined_names[f"{title}_local"] = DefinedName(f"{title}_local", attr_text=f"{title}!$A$1")
+    wb["Notes"].print_area = "A1:B2"
+    wb.active = wb.sheetnames.index("Notes")
+    wb.save(path)
+
+
+def names(ws):
+    return {name: defn.attr_text for name, defn in ws.defined_names.items()}
+
+
+def test_skipped_sheets_keep_active_sheet_and_defined_names_on_the_right_sheets(tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    make_workbook(path)
+    full = load_workbook(path, data_only=True)
+
+    df, wb, _ = main.read_workbook(path)
+
+    assert wb.sheetnames == ["Data", "Matrix", "Notes"]
+    assert wb.active.title == "Notes" == full.active.title
+    assert dict(wb.defined_names).keys() == dict(full.defined_names).keys()
+    assert wb.defined_names["Total"].attr_text == full.defined_names["Total"].attr_text
+    for title in wb.sheetnames:
+        assert names(wb[title]) == names(full[title])
+    assert wb["Notes"].print_area == full["Notes"].print_area
+    assert df.iloc[0, 0] == "Patent Number"
+
+
+def test_active_sheet_that_is_skipped_by_position_is_still_read(tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    make_workbook(path)
+    book = load_workbook(path)
+    book.active = book.sheetnames.index("Aux2")
+    book.save(path)
+
+    _, wb, _ = main.read_workbook(path)
+
+    assert wb.sheetnames == ["Data", "Matrix", "Aux2"]
+    assert wb.active.title == "Aux2"
+
+
+def test_other_openpyxl_releases_read_every_sheet(tmp_path, monkeypatch):
+    path = str(tmp_path / "book.xlsx")
+    make_workbook(path)
+    monkeypatch.setattr(main, "OPENPYXL_VERSION", "3.2.0")
+
+    _, wb, _ = main.read_workbook(path)
+
+    full = load_workbook(path, data_only=True)
+    assert wb.sheetnames == full.sheetnames
+    assert wb.active.title == "Notes"
+    for title in wb.sheetnames:
+        assert names(wb[title]) == names(full[title])
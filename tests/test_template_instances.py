@@ -0,0 +1,55 @@
+import struct
+import zlib
+from io import BytesIO
+
+from docx import Document
+from docx.shared import Inches
+
+import main
+
+
+def png_pixel():
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(b"\x00\xff\x00\x00")) + chunk(b"IEND", b""))
+
+
+def reopened(doc):
+    buffer = BytesIO()
+    doc.save(buffer)
+    return Document(BytesIO(buffer.getvalue()))
+
+
+def numbered(paragraph):
+    return paragraph._p.pPr is not None and paragraph._p.pPr.numPr is not None
+
+
+def test_instances_keep_header_images_and_numbered_lists_and_do_not_share_parts(tmp_path):
+    template = Document()
+    template.sections[0].header.paragraphs[0].add_run().add_picture(BytesIO(png_pixel()), width=Inches(0.5))
+    template.add_paragraph("First finding [OBJECTIVE_TEXT]", style="List Number")
+    template.add_paragraph("Second finding", style="List Number")
+    path = tmp_path / "Invalidity_Template.docx"
+    template.save(str(path))
+
+    generator = main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity")
+    generator.load_template(str(path))
+    first = generator.doc
+    second = generator.instantiate_template()
+    generator.replace_placeholders(first, {"[OBJECTIVE_TEXT]": "filled in"})
+    first.sections[0].header.paragraphs[0].add_run(" first report")
+
+    first, second = reopened(first), reopened(second)
+    for doc in (first, second):
+        header = doc.sections[0].header
+        blips = header._element.xpath(".//a:blip/@r:embed")
+        assert len(blips) == 1
+        assert header.part.related_parts[blips[0]].blob == png_pixel()
+        assert [p.style.name for p in doc.paragraphs] == ["List Number", "List Number"]
+        assert all(numbered(p) or p.style.element.pPr.numPr is not None for p in doc.paragraphs)
+        assert doc.part.numbering_part.element.num_lst
+    assert first.paragraphs[0].text == "First finding filled in"
+    assert second.paragraphs[0].text == "First finding [OBJECTIVE_TEXT]"
+    assert first.sections[0].header.paragraphs[0].text == " first report"
+    assert second.sections[0].header.paragraphs[0].text == ""
@@ -0,0 +1,55 @@
+from copy import deepcopy
+
+import main
+
+
+def loaded_generator(template):
+    generator = main.PatentReportGenerator(lambda *args: None, lambda *args: None, "Invalidity")
+    generator.load_template(template)
+    return generator
+
+
+def test_first_row_in_document_order_is_returned_after_a_row_is_cloned_above_it(project):
+    generator = loaded_generator(project["template"])
+    table = generator.find_table_with_placeholder(generator.doc, "[REF_INDEX]")
+    template_row = generator.find_row_with_placeholder(table, "[REF_INDEX]")
+    clone = deepcopy(template_row._tr)
+    template_row._tr.addprevious(clone)
+
+    assert generator.find_row_with_placeholder(table, "[REF_INDEX]")._tr is clone
+
+
+def test_first_table_in_document_order_is_returned_after_a_table_is_cloned_above_it(project):
+    generator = loaded_generator(project["template"])
+    doc = generator.doc
+    table = generator.find_table_with_placeholder(doc, "[ROW_INDEX]")
+    assert generator.find_mapping_tables(doc)[0][1]._tbl is not table._tbl
+    clone = deepcopy(table._tbl)
+    doc.paragraphs[0]._p.addprevious(clone)
+
+    assert generator.find_table_with_placeholder(doc, "[ROW_INDEX]")._tbl is clone
+    assert generator.find_paragraph_with_placeholder(doc, "[ROW_INDEX]")._p.getparent().getparent().getparent() is clone
+
+
+def test_cloned_mapping_tables_are_found_in_claim_order(project):
+    generator = loaded_generator(project["template"])
+    doc = generator.doc
+    (n, table), = generator.find_mapping_tables(doc)
+    assert n == 1
+    clone = deepcopy(table._tbl)
+    table._tbl.addnext(clone)
+    header = main.Table(clone, doc._body).rows[0].cells[0].paragraphs[0]
+    header.text = "[CLAIM_HEADER2]"
+
+    found = generator.find_mapping_tables(doc)
+    assert [(n, t._tbl) for n, t in found] == [(1, table._tbl), (2, clone)]
+
+
+def test_paragraph_lookup_prefers_an_earlier_copy_of_the_placeholder(project):
+    generator = loaded_generator(project["template"])
+    doc = generator.doc
+    original = generator.find_paragraph_with_placeholder(doc, "[OBJECTIVE_TEXT]")
+    earlier = doc.paragraphs[0].insert_paragraph_before("Moved up: [OBJECTIVE_TEXT]")
+
+    assert generator.find_paragraph_with_placeholder(doc, "[OBJECTIVE_TEXT]")._p is earlier._p
+    assert original._p is not earlier._p
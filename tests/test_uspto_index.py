@@ -0,0 +1,98 @@
+"""
+Indexing USPTO weekly full-text files from the command line and reading single records
+back through UsptoBulkSource, from extracted .xml files and from stored or deflated ZIPs.
+"""
+import zipfile
+
+import pytest
+
+import main
+
+
+def grant(doc_number, kind, abstract, claims):
+    claim_xml = "".join(
+        f'<claim id="CLM-{n:05d}" num="{n:05d}"><claim-text>{n}. {text}</claim-text></claim>'
+        for n, text in enumerate(claims, start=1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<!DOCTYPE us-patent-grant SYSTEM "us-patent-grant-v45.dtd" [ ]>\n'
+        f'<us-patent-grant><us-bibliographic-data-grant><publication-reference><document-id>'
+        f'<country>US</country><doc-number>{doc_number}</doc-number><kind>{kind}</kind>'
+        f'</document-id></publication-reference></us-bibliographic-data-grant>'
+        f'<abstract><p>{abstract}</p></abstract>'
+        f'<description><p>Long description.</p></description>'
+        f'<claims>{claim_xml}</claims></us-patent-grant>\n'
+    ).encode("utf-8")
+
+
+WEEK = (
+    grant("09876543", "B2", "A widget with a substrate.", ["A widget comprising a substrate.", "The widget of claim 1."])
+    + grant("10123456", "B1", "A controller &amp; a signal.", ["A controller coupled to a signal line."])
+)
+
+
+@pytest.fixture(params=["xml", "stored", "deflated"])
+def weekly_file(request, tmp_path):
+    if request.param == "xml":
+        path = tmp_path / "ipg240102.xml"
+        path.write_bytes(WEEK)
+        return str(path)
+    path = tmp_path / "ipg240102.zip"
+    compression = zipfile.ZIP_STORED if request.param == "stored" else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(path, "w", compression) as archive:
+        archive.writestr("ipg240102.xml", WEEK)
+    return str(path)
+
+
+def test_indexed_records_are_read_back_one_at_a_time(weekly_file, tmp_path, capsys):
+    index = str(tmp_path / "index" / "uspto.sqlite3")
+
+    assert main.run_command_line(["index-uspto", weekly_file, "--index", index]) == 0
+    assert "2 records indexed" in capsys.readouterr().out
+    source = main.UsptoBulkSource(index)
+    assert len(source) == 2
+
+    document = source.get("US9876543B2")
+    assert document.abstract == "A widget with a substrate."
+    assert document.claim_numbers() == ["1", "2"]
+    assert document.claim_text(2) == "2. The widget of claim 1."
+    # A number without its kind code finds the record
+    assert source.get("US10123456").abstract == "A controller & a signal."
+    assert source.get("US10123456B1").claim_count == 1
+    assert source.get("US11111111B2") is None
+
+
+def test_unchanged_files_are_not_indexed_again(tmp_path):
+    path = tmp_path / "ipg240102.xml"
+    path.write_bytes(WEEK)
+    index = str(tmp_path / "uspto.sqlite3")
+    logs = []
+
+    assert main.index_uspto_archives(index, [str(path)], log=logs.append) == 2
+    assert main.index_uspto_archives(index, [str(path)], log=logs.append) == 0
+    assert logs[-1].startswith("Already indexed")
+    assert len(main.UsptoBulkSource(index)) == 2
+
+
+def test_records_split_across_read_chunks_are_all_indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "USPTO_INDEX_CHUNK", 64)
+    path = tmp_path / "ipg240102.xml"
+    path.write_bytes(WEEK * 3)
+
+    with open(path, "rb") as stream:
+        records = list(main._uspto_member_records(stream))
+
+    assert [number for number, _, _ in records] == ["US9876543B2", "US10123456B1"] * 3
+    data = path.read_bytes()
+    for _, offset, length in records:
+        assert data[offset:offset + length].startswith(b"<?xml")
+
+
+def test_only_known_subcommands_are_run_headless(capsys):
+    with pytest.raises(SystemExit):
+        main.run_command_line(["Proj-123 Acme Corp US10123456B2.xlsx"])
+    usage = capsys.readouterr().err
+    for command in main.CLI_COMMANDS:
+        assert repr(command) in usage
+    assert "Proj-123 Acme Corp US10123456B2.xlsx" not in main.CLI_COMMANDS
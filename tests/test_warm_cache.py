@@ -0,0 +1,71 @@
+"""
+warm-cache loads patents through the same sources as report generation: patents held by
+an offline corpus are not downloaded, and every parsed document lands in the memo.
+"""
+import json
+
+import pytest
+
+import main
+
+OFFLINE = "US1111111B2"
+ONLINE = "US2222222B2"
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / f"{OFFLINE}.json").write_text(json.dumps({
+        "abstract": "An offline widget.",
+        "claims": {"1": "1. A widget.", "2": "2. The widget of claim 1."},
+    }))
+    cache = main.PatentPageCache(str(tmp_path / "pages.sqlite3"))
+    monkeypatch.setattr(main, "PAROLA_PATENT_SOURCES", "offline,uspto,cache,network")
+    monkeypatch.setattr(main, "PAROLA_OFFLINE_CORPUS", str(corpus))
+    monkeypatch.setattr(main, "PATENT_PAGE_CACHE", cache)
+    monkeypatch.setattr(main.PATENT_SCRAPER, "cache", cache)
+    monkeypatch.setattr(main, "_PATENT_DOCUMENTS", main.PatentDocumentMemo())
+    yield cache
+    cache.close()
+
+
+def warm(numbers):
+    logs = []
+    counts = main.warm_patent_cache(numbers, workers=2, rate=1000, log=logs.append)
+    return counts, logs
+
+
+def test_only_patents_missing_from_local_sources_are_downloaded(sources, network):
+    counts, logs = warm([OFFLINE, ONLINE, ONLINE])
+
+    assert counts == {"fetched": 1, "cached": 1, "failed": 0}
+    assert network == [main.GOOGLE_PATENTS_URL.format(ONLINE)]
+    assert f"✓ {OFFLINE}: already in offline" in logs
+    assert sources.get(main.GOOGLE_PATENTS_URL.format(ONLINE)) is not None
+    assert sources.get(main.GOOGLE_PATENTS_URL.format(OFFLINE)) is None
+    assert main._PATENT_DOCUMENTS.get(OFFLINE).abstract == "An offline widget."
+    assert main._PATENT_DOCUMENTS.get(ONLINE).claim_count == 5
+
+
+def test_generation_after_a_warm_up_makes_no_requests(sources, network):
+    warm([OFFLINE, ONLINE])
+    network.clear()
+    generator = main.PatentReportGenerator(print, lambda value, message="": None, "Invalidity")
+
+    assert generator.get_patent_document(ONLINE).claim_count == 5
+    assert generator.get_patent_document(OFFLINE).claim_text(2) == "2. The widget of claim 1."
+    assert network == []
+
+
+def test_a_later_run_reads_downloaded_pages_from_the_page_cache(sources, network, monkeypatch):
+    warm([ONLINE])
+    network.clear()
+    # A new process starts with an empty memo
+    monkeypatch.setattr(main, "_PATENT_DOCUMENTS", main.PatentDocumentMemo())
+
+    counts, logs = warm([ONLINE])
+
+    assert counts == {"fetched": 0, "cached": 1, "failed": 0}
+    assert logs == [f"✓ {ONLINE}: already in cache"]
+    assert network == []
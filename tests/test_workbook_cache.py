@@ -0,0 +1,76 @@
+import json
+import os
+from datetime import datetime, date, timedelta, time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from conftest import document_xml, generate_report
+
+
+@pytest.fixture
+def workbook_cache(tmp_path, monkeypatch):
+    cache = main.ExtractedWorkbookCache(str(tmp_path / "workbooks"), enabled=True)
+    monkeypatch.setattr(main, "EXTRACTED_WORKBOOK_CACHE", cache)
+    return cache
+
+
+def test_cache_hit_and_miss_produce_the_same_report(project, workbook_cache):
+    out = project["dir"]
+    missed = generate_report(project["workbook"], project["template"], str(out / "miss.docx"))
+    assert workbook_cache.stats() == {"hits": 0, "misses": 1}
+    assert missed.wb is not None
+
+    hit = generate_report(project["workbook"], project["template"], str(out / "hit.docx"))
+    assert workbook_cache.stats() == {"hits": 1, "misses": 1}
+    assert hit.wb is None and hit.ws is None and hit.fill_colors is None
+
+    assert document_xml(str(out / "hit.docx")) == document_xml(str(out / "miss.docx"))
+    assert hit.PatentAtIssue_PriorityDate == missed.PatentAtIssue_PriorityDate
+    assert [vars(ref) for ref in hit.top_references] == [vars(ref) for ref in missed.top_references]
+
+    updated_miss = str(out / "update_miss.docx")
+    updated_hit = str(out / "update_hit.docx")
+    workbook_cache.enabled = False
+    generate_report(project["workbook"], project["template"], updated_miss, update=str(out / "miss.docx"))
+    workbook_cache.enabled = True
+    generate_report(project["workbook"], project["template"], updated_hit, update=str(out / "miss.docx"))
+    assert document_xml(updated_hit) == document_xml(updated_miss)
+
+
+def test_entries_are_plain_json_keyed_by_code_version(project, workbook_cache):
+    generate_report(project["workbook"], project["template"], str(project["dir"] / "report.docx"))
+    names = os.listdir(workbook_cache.directory)
+    assert len(names) == 1 and names[0].endswith(".json")
+    assert f"-{main.APP_CODE_VERSION}-" in names[0]
+    with open(os.path.join(workbook_cache.directory, names[0]), encoding="utf-8") as f:
+        entry = json.load(f)
+    assert entry["patent_at_issue"] == "US10123456B2"
+    assert entry["top_references"][0]["Rank"] == "A"
+
+
+def test_dataframes_round_trip_with_their_dtypes():
+    df = pd.DataFrame({
+        0: pd.Series(["Patent Number", np.nan, "Rank"], dtype="str"),
+        1: pd.Series([datetime(2014, 1, 5, 10, 30), 3.5, None], dtype=object),
+        2: pd.Series([date(2012, 3, 3), time(9, 15), timedelta(hours=36)], dtype=object),
+        3: pd.Series([1.0, np.nan, 2.5]),
+        4: pd.Series([1, 2, 3]),
+        5: pd.Series([True, False, "x"], dtype=object),
+        6: pd.Series(pd.to_datetime(["2010-01-03", None, "2011-02-14"])),
+    })
+    data = json.loads(json.dumps(main.dataframe_to_data(df)))
+    pd.testing.assert_frame_equal(main.dataframe_from_data(data), df)
+
+    search = pd.DataFrame([{"S/No": 1, "Database": "Orbit", "Hits": "1,234"}])
+    pd.testing.assert_frame_equal(main.dataframe_from_data(json.loads(json.dumps(main.dataframe_to_data(search)))),
+                                  search)
+    empty = main.dataframe_from_data(main.dataframe_to_data(pd.DataFrame()))
+    assert empty.empty and empty.shape == (0, 0)
+
+
+def test_values_that_are_not_plain_data_are_not_cached():
+    with pytest.raises(TypeError):
+        main.cell_value_to_data(object())
@@ -0,0 +1,32 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+import main
+from conftest import document_xml, generate_report
+
+
+def test_tested_openpyxl_reads_the_cell_store_without_creating_cells(project):
+    ws = load_workbook(project["workbook"]).active
+    before = len(ws._cells)
+    cells = main.worksheet_cells(ws)
+    assert cells is ws._cells
+    assert cells.get((500, 50)) is None
+    assert len(ws._cells) == before
+
+
+def test_public_api_fallback_gives_the_same_data_and_report(project, monkeypatch):
+    monkeypatch.setattr(main, "EXTRACTED_WORKBOOK_CACHE",
+                        main.ExtractedWorkbookCache(str(project["dir"] / "workbooks"), enabled=False))
+    df, wb, _ = main.read_workbook(project["workbook"])
+    matrix = main.MatrixSnapshot(wb).to_data()
+    generate_report(project["workbook"], project["template"], str(project["dir"] / "internal.docx"))
+
+    monkeypatch.setattr(main, "OPENPYXL_VERSION", "9.0.0")
+    assert not main.openpyxl_internals_supported()
+    fallback_df, fallback_wb, _ = main.read_workbook(project["workbook"])
+    assert main.worksheet_cells(fallback_wb.active) is not fallback_wb.active._cells
+    pd.testing.assert_frame_equal(fallback_df, df)
+    assert main.MatrixSnapshot(fallback_wb).to_data() == matrix
+    generate_report(project["workbook"], project["template"], str(project["dir"] / "public.docx"))
+
+    assert document_xml(str(project["dir"] / "public.docx")) == document_xml(str(project["dir"] / "internal.docx"))